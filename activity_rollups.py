@@ -0,0 +1,196 @@
+# activity_rollups.py - daily/weekly activity counts per company x news_type x impact
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import pandas as pd
+
+from impact_rules import impact_level
+from simple_db import SimpleSupabase
+from talent_resolution import canonical_company
+
+ROLLUP_STATE_PATH = Path(os.getenv("NATILUS_ROLLUP_STATE", Path("data") / "rollup_state.json"))
+
+# grain -> rollup table; both share (period, company, news_type, impact, count)
+ROLLUP_TABLES = {"day": "activity_daily", "week": "activity_weekly"}
+KEY_COLUMNS = ["period", "company", "news_type", "impact"]
+
+HIRE = "Hire"
+
+# source table -> columns pulled for new rows
+SOURCES = {
+    "competitor_news": "id,company,news_type,impact_on_natilus,date_detected,created_at",
+    "competitor_moves": "id,company,news_type,impact_on_natilus,date_detected,created_at",
+    # a profile that moved from one company to another is a hire by the new one
+    "aerospace_talent": "id,current_company,previous_company,is_open_to_work,created_at",
+}
+
+
+def _day(value: Any) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date()
+    except ValueError:
+        return None
+
+
+def activity_events(table: str, rows: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """Rows of one source -> (day, company, news_type, impact) events."""
+    events = []
+    for row in rows:
+        if table == "aerospace_talent":
+            company = canonical_company(row.get("current_company"))
+            previous = canonical_company(row.get("previous_company"))
+            if row.get("is_open_to_work") or not company or not previous or company == previous:
+                continue
+            events.append((_day(row.get("created_at")), company, HIRE, "NONE"))
+        else:
+            day = _day(row.get("date_detected")) or _day(row.get("created_at"))
+            events.append((
+                day,
+                canonical_company(row.get("company")) or "Unknown",
+                row.get("news_type") or "Other",
+                impact_level(row),
+            ))
+    df = pd.DataFrame(events, columns=["day", "company", "news_type", "impact"])
+    return df.dropna(subset=["day"])
+
+
+def rollup(events: pd.DataFrame, grain: str) -> pd.DataFrame:
+    """Count events per period (day, or the Monday starting the ISO week)."""
+    if events.empty:
+        return pd.DataFrame(columns=KEY_COLUMNS + ["count"])
+    days = pd.to_datetime(events["day"])
+    period = days if grain == "day" else days - pd.to_timedelta(days.dt.weekday, unit="D")
+    out = events.assign(period=period.dt.strftime("%Y-%m-%d"))
+    return out.groupby(KEY_COLUMNS, as_index=False).size().rename(columns={"size": "count"})
+
+
+def merge_counts(db: SimpleSupabase, table: str, delta: pd.DataFrame, chunk: int = 100) -> int:
+    """Add delta counts onto the stored rows for the same keys and upsert them."""
+    if delta.empty:
+        return 0
+    periods = sorted(delta["period"].unique())
+    existing = []
+    for start in range(0, len(periods), chunk):
+        in_list = ",".join(periods[start:start + chunk])
+        existing.extend(db.fetch_all(
+            table, select=",".join(KEY_COLUMNS + ["count"]), params={"period": f"in.({in_list})"}
+        ))
+    merged = delta
+    if existing:
+        merged = (
+            pd.concat([delta, pd.DataFrame(existing)], ignore_index=True)
+            .groupby(KEY_COLUMNS, as_index=False)["count"].sum()
+        )
+        # only rewrite keys the delta touched
+        merged = merged.merge(delta[KEY_COLUMNS], on=KEY_COLUMNS)
+    rows = [{**r, "count": int(r["count"])} for r in merged.to_dict("records")]
+    for start in range(0, len(rows), 500):
+        db.upsert_rows(table, rows[start:start + 500], on_conflict=",".join(KEY_COLUMNS))
+    return len(rows)
+
+
+def _load_cursors(path: Path) -> Dict[str, int]:
+    if path.exists():
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+    return {}
+
+
+def _save_cursors(path: Path, cursors: Dict[str, int]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cursors), encoding="utf-8")
+    tmp.replace(path)
+
+
+def update_rollups(db: SimpleSupabase, path: Path = ROLLUP_STATE_PATH) -> Dict[str, int]:
+    """Fold rows past each source's id cursor into both rollup tables.
+
+    merge_counts adds deltas, so each (source, grain) keeps its own cursor,
+    advanced right after that grain's counts are written: a failed weekly
+    merge re-reads its rows next time without adding them to the daily
+    table a second time.
+    """
+    cursors = _load_cursors(path)
+    stats = {}
+    for table, columns in SOURCES.items():
+        # state written before per-grain cursors kept one per source
+        grain_cursors = {
+            grain: cursors.get(f"{table}:{grain}", cursors.get(table)) for grain in ROLLUP_TABLES
+        }
+        if table in cursors:
+            cursors.pop(table)
+            cursors.update({f"{table}:{grain}": c for grain, c in grain_cursors.items()})
+        params = {"order": "id.asc"}
+        if None not in grain_cursors.values():
+            params["id"] = f"gt.{min(grain_cursors.values())}"
+        rows = db.fetch_all(table, select=columns, params=params)
+        if not rows:
+            stats[table] = 0
+            continue
+        top = max(r["id"] for r in rows)
+        for grain, rollup_table in ROLLUP_TABLES.items():
+            after = grain_cursors[grain]
+            pending = [r for r in rows if after is None or r["id"] > after]
+            if pending:
+                merge_counts(db, rollup_table, rollup(activity_events(table, pending), grain))
+            cursors[f"{table}:{grain}"] = top
+            _save_cursors(path, cursors)
+        stats[table] = len(rows)
+    return stats
+
+
+# ---------- query API ----------
+
+def query_rollups(
+    db: SimpleSupabase,
+    grain: str = "day",
+    since: Optional[date] = None,
+    companies: Sequence[str] = (),
+    news_types: Sequence[str] = (),
+    impacts: Sequence[str] = (),
+) -> pd.DataFrame:
+    """Pre-aggregated counts as a frame (period parsed to datetime)."""
+    params = {"order": "period.asc"}
+    if since:
+        params["period"] = f"gte.{since.isoformat()}"
+    for column, values in (("company", companies), ("news_type", news_types), ("impact", impacts)):
+        if values:
+            quoted = ",".join(f'"{v}"' for v in values)
+            params[column] = f"in.({quoted})"
+    rows = db.fetch_all(ROLLUP_TABLES[grain], select=",".join(KEY_COLUMNS + ["count"]), params=params)
+    df = pd.DataFrame(rows, columns=KEY_COLUMNS + ["count"])
+    df["period"] = pd.to_datetime(df["period"])
+    return df
+
+
+def totals(
+    db: SimpleSupabase,
+    by: str = "company",
+    days: int = 30,
+    grain: str = "day",
+    **filters: Sequence[str],
+) -> pd.Series:
+    """Counts over the last `days`, summed per `by` column."""
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    df = query_rollups(db, grain=grain, since=since, **filters)
+    return df.groupby(by)["count"].sum().sort_values(ascending=False)
+
+
+def hiring_velocity(db: SimpleSupabase, companies: Sequence[str], days: int = 30) -> pd.Series:
+    """Hires per company over the last `days` (0 for companies with none)."""
+    hires = totals(db, days=days, news_types=[HIRE])
+    return hires.reindex(list(companies), fill_value=0).astype(int)
+
+
+if __name__ == "__main__":
+    db = SimpleSupabase()
+    print(f"📈 Rollups updated: {update_rollups(db)}")
+    print(totals(db, days=7).head(10).to_string())
@@ -0,0 +1,227 @@
+# alerts.py - incremental alert rules over newly ingested intelligence
+import hashlib
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from impact_rules import impact_level
+from simple_db import SimpleSupabase
+
+ALERT_STATE_PATH = Path(os.getenv("NATILUS_ALERT_STATE", Path("data") / "alert_state.json"))
+ALERTS_TABLE = "alerts"
+KNOWN_RETENTION_DAYS = 365  # a record unseen this long counts as new again
+
+# Fields that change between runs without the underlying record changing
+VOLATILE_FIELDS = {"id", "created_at", "impact", "priority_score", "source_count", "source", "description", "source_tag"}
+
+
+def record_key(record: Dict[str, Any]) -> str:
+    """Stable fingerprint of one ingested record."""
+    # unset record fields are skipped so records and the dicts they replaced hash alike
+    stable = {k: v for k, v in record.items() if k not in VOLATILE_FIELDS and v is not None}
+    return hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """Fires when `threshold` matching records land within `window_days`.
+
+    `title` and `details` are format strings over {count} (records in the
+    window) and {new} (records added by this run).
+    """
+
+    id: str
+    source: str
+    severity: str  # "urgent" | "threat" | "competition" | "opportunity"
+    title: str
+    details: str
+    action: str
+    window_days: int = 7
+    threshold: int = 1
+    match: Callable[[Dict[str, Any]], bool] = lambda record: True
+
+
+RULES: List[AlertRule] = [
+    AlertRule(
+        id="layoff_pool",
+        source="layoffs",
+        severity="urgent",
+        title="🚨 URGENT: {count} aerospace professionals available from layoffs",
+        details="{new} new WARN entries this run",
+        action="Schedule recruiting trip to Seattle/Wichita THIS WEEK",
+        window_days=7,
+        threshold=11,
+    ),
+    AlertRule(
+        id="jetzero_patents",
+        source="patents",
+        severity="threat",
+        title="⚠️ THREAT: JetZero filed {count} new patents",
+        details="{new} first seen this run",
+        action="Review for IP conflicts immediately",
+        window_days=30,
+        match=lambda p: "JetZero" in str(p.get("company", "")),
+    ),
+    AlertRule(
+        id="competitor_contracts",
+        source="contracts",
+        severity="competition",
+        title="💰 COMPETITION: {count} major contracts to competitors",
+        details="{new} awarded since the last run",
+        action="Accelerate Series A to maintain momentum",
+        window_days=30,
+        match=lambda c: impact_level(c) == "HIGH",
+    ),
+    AlertRule(
+        id="github_talent",
+        source="github_talent",
+        severity="opportunity",
+        title="💎 OPPORTUNITY: {count} engineers found on GitHub",
+        details="{new} new profiles this run",
+        action="Reach out before competitors do",
+        window_days=7,
+    ),
+]
+
+
+class AlertState:
+    """Per-rule windowed counters and the record keys already counted.
+
+    Stored as JSON: {rule_id: {"seen": {key: day}, "known": {key: day},
+    "fired": [fingerprint]}}. A record counts toward a rule once, on the
+    day it was first seen, and drops out when it leaves the rule's window.
+    "known" is the dedupe memory: it keeps each key's last sighting for
+    KNOWN_RETENTION_DAYS, so records re-scraped every run (WARN pools, the
+    same GitHub users) are not new again once the window has passed.
+    """
+
+    def __init__(self, path: Path = ALERT_STATE_PATH) -> None:
+        self.path = path
+        self.rules: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, path: Path = ALERT_STATE_PATH) -> "AlertState":
+        state = cls(path)
+        if path.exists():
+            try:
+                state.rules = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pass
+        return state
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.rules), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def for_rule(self, rule: AlertRule, today: str) -> Dict[str, Any]:
+        entry = self.rules.setdefault(rule.id, {"seen": {}, "fired": []})
+        day = datetime.fromisoformat(today)
+        cutoff = (day - timedelta(days=rule.window_days - 1)).date().isoformat()
+        known_cutoff = (day - timedelta(days=KNOWN_RETENTION_DAYS)).date().isoformat()
+        known = {**entry["seen"], **entry.get("known", {})}  # state written before "known" existed
+        entry["known"] = {k: d for k, d in known.items() if d >= known_cutoff}
+        entry["seen"] = {k: day for k, day in entry["seen"].items() if day >= cutoff}
+        entry["fired"] = entry["fired"][-200:]
+        return entry
+
+
+class AlertRun:
+    """One run's evaluation, fed record by record as trackers stream.
+
+    Records are not kept: observe() only adds their keys to the rule
+    windows, so the pipeline never has to hold a tracker's full output.
+    """
+
+    def __init__(
+        self,
+        state: AlertState,
+        rules: Iterable[AlertRule] = RULES,
+        now: Optional[datetime] = None,
+    ) -> None:
+        self.state = state
+        self.rules = list(rules)
+        self.now = now or datetime.now(timezone.utc)
+        self.today = self.now.date().isoformat()
+        self.entries = {rule.id: state.for_rule(rule, self.today) for rule in self.rules}
+        self.new = {rule.id: 0 for rule in self.rules}
+        self.by_source: Dict[str, List[AlertRule]] = defaultdict(list)
+        for rule in self.rules:
+            self.by_source[rule.source].append(rule)
+
+    def observe(self, source: str, record: Dict[str, Any]) -> None:
+        for rule in self.by_source.get(source, ()):
+            if not rule.match(record):
+                continue
+            key = record_key(record)
+            entry = self.entries[rule.id]
+            if key not in entry["known"]:
+                entry["seen"][key] = self.today
+                self.new[rule.id] += 1
+            entry["known"][key] = self.today
+
+    def fired(self) -> List[Dict[str, Any]]:
+        """Alerts raised by the records observed so far."""
+        fired = []
+        for rule in self.rules:
+            entry = self.entries[rule.id]
+            seen = entry["seen"]
+            new = self.new[rule.id]
+            count = len(seen)
+            if not new or count < rule.threshold:
+                continue
+
+            fingerprint = hashlib.sha1(
+                f"{rule.id}:{','.join(sorted(k for k, d in seen.items() if d == self.today))}".encode()
+            ).hexdigest()[:20]
+            if fingerprint in entry["fired"]:
+                continue
+            entry["fired"].append(fingerprint)
+            fired.append({
+                "fingerprint": fingerprint,
+                "rule": rule.id,
+                "severity": rule.severity,
+                "title": rule.title.format(count=count, new=new),
+                "details": rule.details.format(count=count, new=new),
+                "action": rule.action,
+                "record_count": count,
+                "created_at": self.now.isoformat(),
+            })
+        return fired
+
+
+def evaluate(
+    results: Dict[str, Iterable[Dict[str, Any]]],
+    state: AlertState,
+    rules: Iterable[AlertRule] = RULES,
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Alerts raised by the records in `results` not seen on earlier runs."""
+    run = AlertRun(state, rules, now)
+    for source, records in results.items():
+        for record in records or []:
+            run.observe(source, record)
+    return run.fired()
+
+
+def save_alerts(db: SimpleSupabase, alerts: List[Dict[str, Any]]) -> None:
+    """Upsert on fingerprint so a replayed evaluation never duplicates a row."""
+    if alerts:
+        db.upsert_rows(ALERTS_TABLE, alerts, on_conflict="fingerprint")
+
+
+def recent_alerts(db: SimpleSupabase, limit: int = 4) -> List[Dict[str, Any]]:
+    rows, _ = db.select_rows(
+        ALERTS_TABLE,
+        {
+            "select": "rule,severity,title,details,action,created_at",
+            "order": "created_at.desc",
+            "limit": str(limit),
+        },
+    )
+    return rows
@@ -0,0 +1,137 @@
+# batch_writer.py - one background writer fed by tracker streams through a bounded queue
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+QUEUE_SIZE = 500  # records in flight; producers block past this (backpressure)
+BATCH_SIZE = 200  # rows per insert
+FLUSH_SECONDS = 2.0  # longest a partial batch waits, so first rows land early
+SAMPLE_SIZE = 5
+
+TALENT_TABLE = "aerospace_talent"
+
+Sink = Callable[[str, List[Any]], None]
+
+_STOP = object()
+
+
+def table_sink(db: Any) -> Sink:
+    """Write one batch to its table: talent through the duplicate check, intel rows as one bulk insert."""
+    from records import IntelBatch
+
+    def write(table: str, records: List[Any]) -> None:
+        if table == TALENT_TABLE:
+            db.insert_talent(records)
+        else:
+            db.insert_rows(table, IntelBatch.from_records(records).to_payload(), returning=False)
+
+    return write
+
+
+class BatchWriter:
+    """Single consumer that groups queued records into per-table inserts.
+
+    Trackers' stream() generators are drained into put(); when the queue is
+    full put() blocks, so a slow database slows the fetchers down instead of
+    letting records pile up in memory. A batch is written when it reaches
+    batch_size or when its oldest row has waited flush_seconds.
+
+    Each results key keeps a tally {"count", "saved", "failed", "sample"};
+    the records themselves are dropped once written.
+    """
+
+    def __init__(
+        self,
+        sink: Sink,
+        queue_size: int = QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_seconds: float = FLUSH_SECONDS,
+    ) -> None:
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self.tallies: Dict[str, Dict[str, Any]] = {}
+        self.errors: List[str] = []
+        self.started = time.perf_counter()
+        self.first_write: Optional[float] = None  # seconds from start to the first successful insert
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="batch-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def tally(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            return self.tallies.setdefault(key, {"count": 0, "saved": 0, "failed": 0, "sample": []})
+
+    def put(self, key: str, table: Optional[str], record: Any) -> None:
+        """Queue one record for `table`; table=None only counts it (the tracker saved it itself)."""
+        tally = self.tally(key)
+        with self._lock:
+            tally["count"] += 1
+            if len(tally["sample"]) < SAMPLE_SIZE:
+                tally["sample"].append(record)
+        if table is not None:
+            self.queue.put((key, table, record))
+
+    def feed(self, key: str, table: Optional[str], records: Iterable[Any]) -> int:
+        count = 0
+        for record in records:
+            self.put(key, table, record)
+            count += 1
+        return count
+
+    def close(self) -> Dict[str, Dict[str, Any]]:
+        """Flush what is left and stop the writer thread."""
+        if self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join()
+        return self.tallies
+
+    def _run(self) -> None:
+        pending: Dict[str, List[Tuple[str, Any]]] = defaultdict(list)
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                for table in list(pending):
+                    self._flush(table, pending.pop(table))
+                return
+            if item is not None:
+                key, table, record = item
+                pending[table].append((key, record))
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_seconds
+                if len(pending[table]) >= self.batch_size:
+                    self._flush(table, pending.pop(table))
+            if deadline is not None and time.monotonic() >= deadline:
+                for table in list(pending):
+                    self._flush(table, pending.pop(table))
+            if not pending:
+                deadline = None
+
+    def _flush(self, table: str, rows: List[Tuple[str, Any]]) -> None:
+        try:
+            self.sink(table, [record for _, record in rows])
+        except Exception as e:
+            outcome = "failed"
+            self.errors.append(f"{table}: {e}")
+            print(f"❌ Writing {len(rows)} rows to {table} failed: {e}")
+        else:
+            outcome = "saved"
+            if self.first_write is None:
+                self.first_write = time.perf_counter() - self.started
+        with self._lock:
+            for key, _ in rows:
+                self.tallies[key][outcome] += 1
@@ -0,0 +1,103 @@
+# chart_scaling.py - keep chart payloads bounded as the tables grow
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+# Above this many rows scatter traces switch from SVG to WebGL (scattergl)
+WEBGL_THRESHOLD = 2000
+# Upper bound on points sent to the browser per time-series trace
+MAX_SERIES_POINTS = 1500
+
+
+def render_mode(df: pd.DataFrame, threshold: int = WEBGL_THRESHOLD) -> str:
+    return "webgl" if len(df) > threshold else "svg"
+
+
+def scatter(df: pd.DataFrame, threshold: int = WEBGL_THRESHOLD, **kwargs):
+    """px.scatter that becomes a scattergl trace once df is large."""
+    kwargs.setdefault("render_mode", render_mode(df, threshold))
+    return px.scatter(df, **kwargs)
+
+
+def line(df: pd.DataFrame, threshold: int = WEBGL_THRESHOLD, **kwargs):
+    """px.line with the same SVG/WebGL switch."""
+    kwargs.setdefault("render_mode", render_mode(df, threshold))
+    return px.line(df, **kwargs)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of the n_out points that best preserve the visual
+    shape of (x, y). x must be sorted ascending and numeric.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+
+    bucket = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, n)
+
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def downsample_series(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    max_points: int = MAX_SERIES_POINTS,
+    by: Optional[str] = None,
+) -> pd.DataFrame:
+    """LTTB-downsample a time series (per group when `by` is given)."""
+    if by is not None:
+        per_group = max(3, max_points // max(df[by].nunique(), 1))
+        parts = [downsample_series(g, x, y, per_group) for _, g in df.groupby(by, sort=False)]
+        return pd.concat(parts, ignore_index=True) if parts else df
+
+    if len(df) <= max_points:
+        return df
+    df = df.sort_values(x, kind="stable")
+    xs = df[x]
+    if pd.api.types.is_datetime64_any_dtype(xs):
+        xs = xs.astype("int64")
+    idx = lttb_indices(xs.to_numpy(), df[y].to_numpy(), max_points)
+    return df.iloc[idx].reset_index(drop=True)
+
+
+def daily_counts(
+    df: pd.DataFrame,
+    date_col: str,
+    by: Sequence[str] = (),
+    value_col: Optional[str] = None,
+) -> pd.DataFrame:
+    """Aggregate raw rows into per-day buckets (count, or sum of value_col)."""
+    if df.empty:
+        return pd.DataFrame(columns=["day", *by, "count"])
+    day = pd.to_datetime(df[date_col], errors="coerce", utc=True).dt.floor("D")
+    keys = [day.rename("day"), *[df[c] for c in by]]
+    grouped = df.groupby(keys, dropna=True, observed=True)
+    if value_col:
+        out = grouped[value_col].sum()
+    else:
+        out = grouped.size()
+    return out.rename("count").reset_index()
@@ -3,6 +3,7 @@ import json
 import random
 from datetime import datetime, timedelta
 from supabase import create_client, Client
+from talent_scoring import score_rows
 import time
 
 # Load your Supabase credentials
@@ -42,13 +43,12 @@ def generate_mock_talent():
             "years_experience": random.randint(5, 20),
             "skills": random.choice(skills_list),
             "is_open_to_work": random.choice([True, True, False]),  # 66% open
-            "priority_score": random.randint(70, 95),
             "risk_of_poaching": random.choice(["HIGH", "MEDIUM", "LOW"]),
             "linkedin_url": f"linkedin.com/in/{name.lower().replace(' ', '-')}",
             "layoff_date": (datetime.now() - timedelta(days=random.randint(0, 30))).strftime('%Y-%m-%d')
         })
     
-    return talent
+    return score_rows(talent)
 
 def add_talent_to_database():
     """Add talent to Supabase"""
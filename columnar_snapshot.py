@@ -0,0 +1,150 @@
+# columnar_snapshot.py - Arrow IPC copies of the core tables for in-process dashboard slicing
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from simple_db import SimpleSupabase
+
+SNAPSHOT_DIR = Path(os.getenv("NATILUS_SNAPSHOT_DIR", Path("data") / "snapshot"))
+MANIFEST_PATH = SNAPSHOT_DIR / "manifest.json"
+
+# table -> column types; unlisted text columns become categorical when
+# their values repeat (most rows share a value), plain strings otherwise
+SNAPSHOT_TABLES: Dict[str, Dict[str, Sequence[str]]] = {
+    "aerospace_talent": {
+        "category": ("current_company", "previous_company", "title", "location", "risk_of_poaching"),
+        "int": ("id", "years_experience", "priority_score"),
+        "bool": ("is_open_to_work",),
+        "time": ("created_at",),
+    },
+    "competitor_news": {
+        "category": ("company", "news_type"),
+        "int": ("id",),
+        "time": ("date_detected", "created_at"),
+    },
+    "competitor_moves": {
+        "category": ("company", "news_type"),
+        "int": ("id",),
+        "time": ("date_detected", "created_at"),
+    },
+    "supply_chain_opportunities": {
+        "int": ("id",),
+        "time": ("created_at",),
+    },
+    "alerts": {
+        "category": ("rule", "severity"),
+        "int": ("record_count",),
+        "time": ("created_at",),
+    },
+    "activity_daily": {
+        "category": ("company", "news_type", "impact"),
+        "int": ("count",),
+    },
+    "activity_weekly": {
+        "category": ("company", "news_type", "impact"),
+        "int": ("count",),
+    },
+}
+
+# Export order for tables without an id column (default "id.asc")
+SNAPSHOT_ORDER = {
+    "alerts": "created_at.desc",
+    "activity_daily": "period.asc",
+    "activity_weekly": "period.asc",
+}
+
+
+def typed_frame(rows: List[Dict[str, Any]], spec: Dict[str, Sequence[str]]):
+    """DataFrame with nullable ints/bools, UTC timestamps and categorical labels."""
+    import pandas as pd
+
+    df = pd.DataFrame(rows)
+    for col in spec.get("int", ()):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    for col in spec.get("bool", ()):
+        if col in df.columns:
+            df[col] = df[col].astype("boolean")
+    for col in spec.get("time", ()):
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce", utc=True, format="mixed")
+    declared = {c for cols in spec.values() for c in cols}
+    for col in df.columns:
+        if col in spec.get("category", ()):
+            df[col] = df[col].astype("category")
+        elif col not in declared and df[col].dtype == object:
+            values = df[col].dropna()
+            if values.map(type).eq(str).all() and values.nunique() * 2 < len(values):
+                df[col] = df[col].astype("category")
+    return df
+
+
+def export_table(db: SimpleSupabase, table: str, root: Path = SNAPSHOT_DIR) -> Dict[str, Any]:
+    """Write one table as an uncompressed Arrow IPC file (memory-mappable) and describe it."""
+    import pyarrow as pa
+
+    rows = db.fetch_all(table, params={"order": SNAPSHOT_ORDER.get(table, "id.asc")})
+    df = typed_frame(rows, SNAPSHOT_TABLES.get(table, {}))
+    arrow = pa.Table.from_pandas(df, preserve_index=False)
+
+    root.mkdir(parents=True, exist_ok=True)
+    path = root / f"{table}.arrow"
+    tmp = path.with_suffix(".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, arrow.schema) as writer:
+        writer.write_table(arrow)
+    tmp.replace(path)
+
+    max_id = int(df["id"].max()) if "id" in df.columns and len(df) else 0
+    return {"rows": len(df), "max_id": max_id, "bytes": path.stat().st_size}
+
+
+def export_snapshot(
+    db: SimpleSupabase,
+    tables: Sequence[str] = tuple(SNAPSHOT_TABLES),
+    root: Path = SNAPSHOT_DIR,
+) -> Dict[str, Any]:
+    """Export every table, then the manifest the dashboard keys its cache on."""
+    exported_at = datetime.now(timezone.utc).isoformat()
+    manifest: Dict[str, Any] = {}
+    for table in tables:
+        try:
+            manifest[table] = {**export_table(db, table, root), "exported_at": exported_at}
+        except Exception as e:
+            print(f"⚠️ Snapshot of {table} skipped: {e}")
+    tmp = root / "manifest.tmp"
+    root.mkdir(parents=True, exist_ok=True)
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    tmp.replace(root / "manifest.json")
+    return manifest
+
+
+def load_manifest(root: Path = SNAPSHOT_DIR) -> Dict[str, Any]:
+    path = root / "manifest.json"
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def open_table(table: str, root: Path = SNAPSHOT_DIR):
+    """The snapshot as a pyarrow.Table over a memory map; None when there is none.
+
+    Column buffers point into the mapped file, so opening costs no copy and
+    pages are read only for the columns and rows a query touches.
+    """
+    path = root / f"{table}.arrow"
+    if not path.exists():
+        return None
+    import pyarrow as pa
+
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+if __name__ == "__main__":
+    manifest = export_snapshot(SimpleSupabase())
+    for table, entry in manifest.items():
+        print(f"🗂️ {table}: {entry['rows']} rows, {entry['bytes'] / 1e6:.1f} MB, max id {entry['max_id']}")
@@ -1,22 +1,34 @@
 # contract_tracker.py
-import requests
 import json
+import resilient_http
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
-from supabase import create_client
+
+from impact_rules import classifier, impact_text
+from records import IntelBatch, IntelItem
 
 load_dotenv()
 
 class ContractTracker:
-    def __init__(self):
+    table = 'competitor_moves'
+    
+    def __init__(self, max_pages=None):
+        from supabase import create_client
+        
         self.supabase = create_client(
             os.getenv('SUPABASE_URL'),
             os.getenv('SUPABASE_KEY')
         )
+        # Backfills raise this to walk further back than the first 50 awards
+        self.max_pages = max_pages or int(os.getenv('CONTRACT_MAX_PAGES', '1'))
     
     def get_federal_contracts(self):
         """Track aerospace contracts from USASpending.gov"""
+        return [insight for page in self.iter_federal_contracts() for insight in page]
+    
+    def iter_federal_contracts(self):
+        """Yield each page of competitor contracts as USASpending returns it"""
         print("💰 Fetching federal contracts...")
         
         url = "https://api.usaspending.gov/api/v2/search/spending_by_award/"
@@ -39,47 +51,66 @@ class ContractTracker:
             "page": 1
         }
         
-        try:
-            response = requests.post(url, json=payload)
-            
-            if response.status_code == 200:
+        for page in range(1, self.max_pages + 1):
+            payload["page"] = page
+            try:
+                response = resilient_http.post(url, json=payload, idempotent=True)  # a search, safe to resend
+                
+                if response.status_code != 200:
+                    print(f"❌ USASpending API error: {response.status_code}")
+                    return
                 data = response.json()
                 contracts = data.get('results', [])
                 
                 contract_insights = []
+                amounts = []
                 
                 for contract in contracts:
                     recipient = contract.get('recipient_name', '')
                     
                     # Check if it's a competitor
                     if any(company in recipient for company in ['JetZero', 'Boeing', 'Lockheed', 'Northrop']):
-                        contract_insights.append({
-                            'company': recipient,
-                            'news_type': 'Federal Contract',
-                            'details': f"${contract.get('award_amount', 0):,.0f} - {contract.get('description', 'Classified')[:100]}",
-                            'impact_on_natilus': 'HIGH - Competitor funding',
-                            'date_detected': contract.get('action_date', '')
-                        })
+                        amounts.append(contract.get('award_amount') or 0)
+                        contract_insights.append(IntelItem(
+                            company=recipient,
+                            news_type='Federal Contract',
+                            details=f"${contract.get('award_amount', 0):,.0f} - {contract.get('description', 'Classified')[:100]}",
+                            date_detected=contract.get('action_date')
+                        ))
                 
-                print(f"✅ Found {len(contract_insights)} relevant contracts")
-                return contract_insights
-            else:
-                print(f"❌ USASpending API error: {response.status_code}")
-                return []
+                impacts = classifier().classify_batch([
+                    {'text': c.details, 'entity': c.company, 'news_type': c.news_type, 'amount': amount}
+                    for c, amount in zip(contract_insights, amounts)
+                ])
+                for insight, impact in zip(contract_insights, impacts):
+                    insight.impact = impact
+                    insight.impact_on_natilus = impact_text(impact, 'Competitor funding')
                 
-        except Exception as e:
-            print(f"❌ Error fetching contracts: {e}")
-            return []
+                print(f"✅ Found {len(contract_insights)} relevant contracts (page {page})")
+                yield contract_insights
+                
+                if not data.get('page_metadata', {}).get('hasNext'):
+                    return
+                    
+            except Exception as e:
+                print(f"❌ Error fetching contracts: {e}")
+                return
     
     def save_to_database(self, contracts):
-        """Save contract intelligence to database"""
+        """Save contract intelligence to database in one insert"""
         if contracts:
             try:
-                for contract in contracts:
-                    self.supabase.table('competitor_moves').insert(contract).execute()
+                self.supabase.table('competitor_moves').insert(IntelBatch.from_records(contracts).to_payload()).execute()
                 print(f"💾 Saved {len(contracts)} contract insights")
             except Exception as e:
                 print(f"❌ Database error: {e}")
+                return False
+        return True
+    
+    def stream(self):
+        """Yield contracts page by page, for the pipeline's batching writer"""
+        for page in self.iter_federal_contracts():
+            yield from page
     
     def run(self):
         """Run contract tracking"""
@@ -2,6 +2,7 @@
 import csv
 from pathlib import Path
 from simple_db import SimpleSupabase
+from talent_scoring import score_rows
 
 CSV_PATH = Path("data") / "aerospace_talent_manual.csv"
 
@@ -46,6 +47,10 @@ def load_manual_talent():
                 "source_tag": raw.get("source_tag") or "manual_linkedin",
             }
             rows.append(row)
+
+    # Fill in priority_score where the sheet left it blank
+    unscored = [r for r in rows if r["priority_score"] is None]
+    score_rows(unscored)
     return rows
 
 
@@ -1,4 +1,5 @@
 # At the top of dashboard.py
+import html
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -6,6 +7,30 @@ import plotly.graph_objects as go
 from supabase import create_client
 from datetime import datetime, timedelta
 
+from activity_rollups import hiring_velocity, query_rollups
+from alerts import recent_alerts
+from chart_scaling import daily_counts, downsample_series, scatter
+from columnar_snapshot import load_manifest, open_table
+from delta_feed import DeltaFeed
+from figure_cache import cached_figure
+from impact_rules import impact_level
+import profiling
+from profiling import Laps, profiled
+from search_index import SearchIndex
+from simple_db import SimpleSupabase
+from summary_snapshot import headline_delta, load_summary
+from talent_flow import FLOW_PATH, TalentFlowIndex, link_style, node_color
+from talent_matching import INDEX_PATH as MATCH_INDEX_PATH, TalentMatcher, fetch_matches
+from talent_query import (
+    DEFAULT_PAGE_SIZE,
+    TALENT_TABLE,
+    fetch_newer_talent,
+    fetch_talent_page,
+    snapshot_talent_page,
+    status_label,
+)
+from talent_resolution import collapse
+
 
 st.set_page_config(
     page_title="Natilus Intelligence Center",
@@ -13,6 +38,10 @@ st.set_page_config(
     layout="wide"
 )
 
+# NATILUS_PROFILE=1 times every section into a debug panel at the bottom
+profiling.reset()
+laps = Laps()
+
 # This reads from your .streamlit/secrets.toml file
 @st.cache_resource
 def init_supabase():
@@ -53,6 +82,118 @@ def init_supabase():
 
 supabase = init_supabase()
 
+@st.cache_resource
+def init_db():
+    return SimpleSupabase()
+
+db = init_db()
+
+@st.cache_resource(max_entries=8)
+def open_snapshot(table, exported_at):
+    """Memory-mapped Arrow snapshot; a new export (new exported_at) maps the new file"""
+    return open_table(table)
+
+def load_snapshot(table):
+    """(Arrow table, max id in it) from the pipeline's last export, or None"""
+    entry = load_manifest().get(table)
+    if not entry or not entry.get("rows"):
+        # an empty export has no columns to filter on; Supabase answers instead
+        return None
+    snapshot = open_snapshot(table, entry["exported_at"])
+    return (snapshot, entry["max_id"]) if snapshot is not None else None
+
+@st.cache_data(ttl=300)
+def load_talent_page(roles, locations, urgency, page, page_size=DEFAULT_PAGE_SIZE):
+    """One filtered page of aerospace_talent + total match count.
+    
+    Filtered in-process on the local snapshot when there is one - only rows
+    added since the export come from Supabase - else filtered server-side.
+    """
+    snapshot = load_snapshot(TALENT_TABLE)
+    if snapshot is None:
+        return fetch_talent_page(db, roles, locations, urgency, page=page, page_size=page_size)
+    table, max_id = snapshot
+    newer = fetch_newer_talent(db, max_id, roles, locations, urgency)
+    return snapshot_talent_page(table, roles, locations, urgency, page=page, page_size=page_size, newer=newer)
+
+# Live sections re-run on their own timer when this Streamlit has fragments;
+# otherwise they refresh on the next interaction / Refresh click.
+REFRESH_SECONDS = 300
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+def live_section(func):
+    if _fragment is None:
+        return func
+    return _fragment(run_every=REFRESH_SECONDS)(func)
+
+def get_feed(table, **kwargs):
+    """Session-held DeltaFeed - polling only pulls rows newer than the last seen id"""
+    feeds = st.session_state.setdefault("delta_feeds", {})
+    if table not in feeds:
+        feeds[table] = DeltaFeed(table, **kwargs)
+    return feeds[table]
+
+@st.cache_resource(max_entries=2)
+def load_talent_flow(saved_at):
+    """Flow edges as the pipeline last saved them; a new save (new mtime) reloads"""
+    return TalentFlowIndex.load()
+
+@st.cache_resource(max_entries=2)
+def load_talent_matcher(saved_at):
+    """TF-IDF index as the pipeline last saved it; new profiles are folded in before each query"""
+    return TalentMatcher.load()
+
+def _saved_at(path):
+    return path.stat().st_mtime_ns if path.exists() else 0
+
+@st.cache_data(ttl=300)
+def match_requisition(query, k=10):
+    # the pipeline owns rebuilds and the file; here only ids past the index are added
+    matcher = load_talent_matcher(_saved_at(MATCH_INDEX_PATH))
+    matcher.update(db)
+    return fetch_matches(db, matcher.query(query, k))
+
+@st.cache_resource
+def load_search_index():
+    return SearchIndex()
+
+@st.cache_data(ttl=60)
+def sync_search_index():
+    """Pull rows past the local FTS cursors - at most once a minute"""
+    return load_search_index().sync(db)
+
+@st.cache_data(ttl=60)
+def load_alerts(limit=4):
+    """Newest rows the pipeline's alert rules wrote"""
+    try:
+        return recent_alerts(db, limit)
+    except Exception:
+        return []
+
+@st.cache_data(ttl=300)
+def load_hiring_velocity(companies):
+    """Hires per company over the last 30 days, from the activity_daily rollup"""
+    try:
+        return hiring_velocity(db, companies).to_dict()
+    except Exception:
+        return {}
+
+@st.cache_data(ttl=300)
+def load_activity_trend(weeks=12):
+    """Weekly competitor activity per company - a few hundred rollup rows at most"""
+    since = (datetime.now() - timedelta(weeks=weeks)).date()
+    try:
+        trend = query_rollups(db, grain="week", since=since)
+    except Exception:
+        return pd.DataFrame(columns=['period', 'company', 'count'])
+    trend = trend[trend['news_type'] != 'Hire']
+    return trend.groupby(['period', 'company'], as_index=False)['count'].sum()
+
+@st.cache_data(ttl=60)
+def load_header_summary():
+    """Snapshot written by NatilusMasterPipeline at the end of each run"""
+    return load_summary(db) or {}
+
 # Header
 st.title("🚀 Natilus Intelligence Center")
 st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')} PST")
@@ -60,13 +201,16 @@ st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')} PST")
 # Top-level metrics
 col1, col2, col3, col4 = st.columns(4)
 
+summary = load_header_summary()
+headline = summary.get("headline", {})
+
 with col1:
-    # Real-time talent available
-    talent_count = supabase.table('aerospace_talent').select("*", count='exact').execute()
+    # Available talent from the last pipeline snapshot
+    talent_delta = headline_delta(summary, "available_talent")
     st.metric(
         "🎯 Available Talent",
-        talent_count.count,
-        "+12 since yesterday",
+        headline.get("available_talent", "—"),
+        f"{talent_delta:+d} since last run" if talent_delta is not None else None,
         help="Boeing/Spirit engineers actively looking"
     )
 
@@ -84,96 +228,101 @@ with col2:
 
 with col3:
     # Competitor activity
+    top_mover = headline.get("top_mover_this_week")
     st.metric(
         "⚠️ Competitor Moves",
-        "3 this week",
-        "JetZero hiring surge",
+        f"{headline.get('competitor_moves_this_week', 0)} this week",
+        f"{top_mover} most active" if top_mover else None,
         delta_color="inverse"
     )
 
 with col4:
     # Supply chain risks
+    top_risk = headline.get("top_supply_chain_risk")
     st.metric(
         "🏭 Supply Chain Risks",
-        "2 Critical",
-        "Spirit bankruptcy risk",
+        f"{headline.get('supply_chain_critical', 0)} Critical",
+        f"{top_risk} at risk" if top_risk else None,
         delta_color="inverse"
     )
 
+if summary.get("generated_at"):
+    st.caption(f"Header snapshot: {summary['generated_at'][:16].replace('T', ' ')} UTC")
+laps.lap("header")
+
+# Search across talent, news and competitor moves (local SQLite FTS5)
+SEARCH_KIND_LABELS = {"talent": "🎯 Talent", "news": "📰 News", "moves": "🏆 Move"}
+search_query = st.text_input(
+    "🔎 Search intelligence",
+    placeholder="e.g. composite Wichita, JetZero patent, FAA DER"
+)
+if search_query:
+    sync_search_index()
+    hits = load_search_index().search(search_query, limit=15)
+    if not hits:
+        st.caption("No matches.")
+    for hit in hits:
+        meta = html.escape(" · ".join(x for x in [hit['company'], (hit['date'] or '')[:10]] if x))
+        st.markdown(
+            f"{SEARCH_KIND_LABELS[hit['kind']]} **{hit['title']}** "
+            f"<span style='color:gray'>{meta}</span><br>{hit['snippet']}",
+            unsafe_allow_html=True
+        )
+laps.lap("search")
+
 # Alerts Section
 st.markdown("---")
 st.subheader("⚡ Immediate Actions Required")
 
-alerts_col1, alerts_col2 = st.columns(2)
-
-with alerts_col1:
-    st.markdown("""
-    <div class='alert-box'>
-    <b>🚨 URGENT: Top Boeing Composite Engineer Available</b><br>
-    - Name: [Redacted for Demo]<br>
-    - 15 years on 787 program<br>
-    - Blue Origin also pursuing<br>
-    - ACTION: Contact TODAY
-    </div>
-    """, unsafe_allow_html=True)
-
-with alerts_col2:
-    st.markdown("""
-    <div class='opportunity-box'>
-    <b>💎 OPPORTUNITY: Wichita Talent Pool</b><br>
-    - Spirit laying off 400 this week<br>
-    - 47 match Natilus needs<br>
-    - Lower salary expectations<br>
-    - ACTION: Schedule Wichita trip
-    </div>
-    """, unsafe_allow_html=True)
-
-# Main Dashboard Tabs
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "🎯 Talent Pipeline", 
-    "🏆 Competition Tracker", 
-    "🏭 Supply Chain", 
-    "📊 Series A Metrics",
-    "🧠 Strategic Insights"
-])
-
-with tab1:
-    st.subheader("High-Priority Talent Available Now")
-    
-    # Filters
-    filter_col1, filter_col2, filter_col3 = st.columns(3)
-    with filter_col1:
-        role_filter = st.multiselect(
-            "Role",
-            ["Composite Engineer", "Cert Specialist", "Manufacturing", "Flight Test"],
-            default=["Composite Engineer"]
-        )
-    with filter_col2:
-        location_filter = st.multiselect(
-            "Location",
-            ["Seattle", "Wichita", "Los Angeles", "Fort Worth"],
-            default=["Seattle"]
-        )
-    with filter_col3:
-        urgency = st.select_slider(
-            "Urgency",
-            ["Low", "Medium", "High", "Critical"],
-            value="High"
-        )
-    
-    # Talent table with scores
-    talent_data = {
-        'Name': ['John Smith', 'Sarah Chen', 'Mike Johnson', 'Lisa Wang', 'Tom Brown'],
-        'Current Co': ['Boeing', 'Spirit', 'Boeing', 'Textron', 'Boeing'],
-        'Role': ['Sr. Composite Eng', 'Cert Specialist', 'Mfg Engineer', 'Composite Lead', 'Flight Test Eng'],
-        'Years Exp': [15, 12, 8, 10, 7],
-        'Score': [95, 92, 88, 85, 82],
-        'Status': ['🔴 Urgent', '🔴 Urgent', '🟡 High', '🟡 High', '🟢 Medium'],
-        'Competition': ['Blue Origin, Joby', 'Archer', 'None yet', 'Reliable', 'Multiple'],
-        'LinkedIn': ['View', 'View', 'View', 'View', 'View']
-    }
-    
-    df = pd.DataFrame(talent_data)
+alerts = load_alerts()
+if alerts:
+    alert_cols = st.columns(2)
+    for i, alert in enumerate(alerts):
+        box = 'opportunity-box' if alert['severity'] == 'opportunity' else 'alert-box'
+        with alert_cols[i % 2]:
+            st.markdown(f"""
+            <div class='{box}'>
+            <b>{html.escape(alert['title'])}</b><br>
+            - {html.escape(alert.get('details') or '')}<br>
+            - Raised {str(alert.get('created_at') or '')[:10]}<br>
+            - ACTION: {html.escape(alert['action'])}
+            </div>
+            """, unsafe_allow_html=True)
+else:
+    st.caption("No open alerts - the pipeline raises them when new data crosses a rule.")
+laps.lap("alerts")
+
+@live_section
+def render_talent_table(role_filter, location_filter, urgency):
+    """Filtered talent page; only re-queried when new aerospace_talent rows land"""
+    talent_feed = get_feed("aerospace_talent", select="id", date_column=None, window=1)
+    first_poll = not talent_feed.loaded
+    new_profiles = talent_feed.poll(db)
+    if new_profiles and not first_poll:
+        load_talent_page.clear()
+        st.toast(f"🆕 {new_profiles} new talent profiles")
+    
+    page = st.session_state.get("talent_page", 1)
+    rows, total = load_talent_page(tuple(role_filter), tuple(location_filter), urgency, page)
+    total_pages = max(1, -(-total // DEFAULT_PAGE_SIZE))
+    if page > total_pages:
+        # Filters narrowed the result set - snap back to the last page
+        page = st.session_state["talent_page"] = total_pages
+        rows, total = load_talent_page(tuple(role_filter), tuple(location_filter), urgency, page)
+    
+    # One row per person even before the compaction job has merged duplicates
+    rows = collapse(rows)
+    
+    df = pd.DataFrame({
+        'Name': [r.get('name') for r in rows],
+        'Current Co': [r.get('current_company') for r in rows],
+        'Role': [r.get('title') for r in rows],
+        'Years Exp': [r.get('years_experience') for r in rows],
+        'Score': [r.get('priority_score') for r in rows],
+        'Status': [status_label(r.get('priority_score')) for r in rows],
+        'Poaching Risk': [r.get('risk_of_poaching') or '' for r in rows],
+        'LinkedIn': [r.get('linkedin_url') for r in rows]
+    })
     
     # Interactive table
     st.dataframe(
@@ -192,32 +341,216 @@ with tab1:
         }
     )
     
-    # Talent flow visualization
-    st.subheader("Talent Movement Patterns")
+    page_col1, page_col2 = st.columns([1, 3])
+    with page_col1:
+        st.number_input(
+            "Page",
+            min_value=1,
+            max_value=total_pages,
+            key="talent_page"
+        )
+    with page_col2:
+        st.caption(f"{total} matching profiles · page {page} of {total_pages}")
+
+@live_section
+def render_competitor_activity(limit=10):
+    """Newest competitor_news rows; each poll only fetches ids we haven't seen"""
+    feed = get_feed(
+        "competitor_news",
+        select="id,company,news_type,details,impact_on_natilus,date_detected",
+        window=100,
+    )
+    feed.poll(db)
+    if feed.df.empty:
+        st.caption("No competitor activity recorded yet.")
+        return
+    
+    daily = daily_counts(feed.df, 'date_detected', by=['company'])
+    if not daily.empty:
+        st.plotly_chart(cached_figure("activity_timeline", daily, build_activity_timeline), use_container_width=True)
+    
+    for _, row in feed.df.head(limit).iterrows():
+        date = row['date_detected'].strftime('%Y-%m-%d') if pd.notna(row['date_detected']) else '—'
+        impact = impact_level(row)
+        if impact == 'HIGH':
+            st.error(f"🔴 {date} - **{row['company']}**: {row['details']}")
+        else:
+            st.warning(f"🟡 {date} - {row['company']}: {row['details']}")
+
+# ---------- Figure builders (memoized on a hash of their input frame) ----------
+
+def build_talent_sankey(links):
+    nodes = list(dict.fromkeys(links['source'].tolist() + links['target'].tolist()))
+    position = {name: i for i, name in enumerate(nodes)}
+    styles = [link_style(src, tgt) for src, tgt in zip(links['source'], links['target'])]
     
     fig = go.Figure(data=[go.Sankey(
         node=dict(
             pad=15,
             thickness=20,
             line=dict(color="black", width=0.5),
-            label=["Boeing", "Spirit", "Textron", "Blue Origin", "Joby", "Archer", "AVAILABLE", "Natilus Target"],
-            color=["red", "red", "orange", "blue", "blue", "blue", "green", "gold"]
+            label=nodes,
+            color=[node_color(name) for name in nodes]
         ),
         link=dict(
-            source=[0, 1, 2, 0, 1, 6, 6, 6],
-            target=[6, 6, 6, 3, 4, 7, 3, 4],
-            value=[400, 300, 100, 50, 30, 20, 10, 5],
-            label=["Layoffs", "Layoffs", "Attrition", "Poached", "Poached", "Target", "Competition", "Competition"],
-            color=["rgba(255,0,0,0.4)", "rgba(255,0,0,0.4)", "rgba(255,165,0,0.4)", 
-                   "rgba(0,0,255,0.4)", "rgba(0,0,255,0.4)", "rgba(0,255,0,0.4)",
-                   "rgba(255,0,0,0.4)", "rgba(255,0,0,0.4)"]
+            source=links['source'].map(position).tolist(),
+            target=links['target'].map(position).tolist(),
+            value=links['value'].tolist(),
+            label=[label for label, _ in styles],
+            color=[color for _, color in styles]
         )
     )])
     
     fig.update_layout(title_text="Where Boeing/Spirit Talent is Going", font_size=12)
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+def build_hiring_velocity(competitors):
+    return px.bar(
+        competitors, 
+        x='Company', 
+        y='Hiring/Month',
+        title='Monthly Hiring Velocity',
+        color='Company',
+        color_discrete_map={'Natilus': 'gold', 'JetZero': 'red'}
+    )
+
+def build_weekly_activity(trend):
+    return px.bar(
+        trend,
+        x='period',
+        y='count',
+        color='company',
+        title='Weekly Competitor Activity',
+        labels={'period': 'Week of', 'count': 'Moves'}
+    )
+
+def build_funding_vs_team(competitors):
+    # +1 keeps companies with no recorded hires visible
+    competitors = competitors.assign(**{'Hiring/Month': competitors['Hiring/Month'] + 1})
+    return scatter(
+        competitors,
+        x='Funding',
+        y='Employees',
+        size='Hiring/Month',
+        color='Company',
+        title='Funding vs Team Size',
+        text='Company'
+    )
+
+def build_supplier_risk(suppliers):
+    return scatter(
+        suppliers,
+        x='Risk Level',
+        y='Component',
+        color='Financial Health',
+        size='Risk Level',
+        hover_data=['Alternative'],
+        title='Supplier Risk Assessment',
+        color_discrete_map={'Critical': 'red', 'Stable': 'green', 'Good': 'blue', 'Excellent': 'darkgreen'}
+    )
+
+def build_activity_timeline(daily):
+    # Per-day buckets, LTTB-trimmed per company, so point count stays bounded
+    daily = downsample_series(daily, 'day', 'count', by='company')
+    return px.bar(
+        daily,
+        x='day',
+        y='count',
+        color='company',
+        title='Competitor Activity per Day',
+        color_discrete_map={'JetZero': 'red'}
+    )
 
-with tab2:
+def build_investor_funnel(funnel):
+    fig = go.Figure(go.Funnel(
+        y=funnel['Stage'].tolist(),
+        x=funnel['Count'].tolist(),
+        textinfo="value+percent initial"
+    ))
+    
+    fig.update_layout(title="Investor Pipeline")
+    return fig
+
+def build_decision_matrix(decisions):
+    fig = scatter(
+        decisions,
+        x='Urgency',
+        y='Impact',
+        text='Decision',
+        size=[40] * len(decisions),
+        title='Strategic Priority Matrix'
+    )
+    
+    fig.add_hline(y=50, line_dash="dash", line_color="gray")
+    fig.add_vline(x=50, line_dash="dash", line_color="gray")
+    
+    fig.add_annotation(x=75, y=75, text="DO NOW", showarrow=False, font=dict(size=20, color="red"))
+    fig.add_annotation(x=25, y=75, text="IMPORTANT", showarrow=False, font=dict(size=15, color="orange"))
+    fig.add_annotation(x=75, y=25, text="DELEGATE", showarrow=False, font=dict(size=15, color="blue"))
+    fig.add_annotation(x=25, y=25, text="DELAY", showarrow=False, font=dict(size=15, color="gray"))
+    return fig
+
+# ---------- Sections (only the active one is built) ----------
+
+def render_talent_tab():
+    st.subheader("High-Priority Talent Available Now")
+    
+    # Filters
+    filter_col1, filter_col2, filter_col3 = st.columns(3)
+    with filter_col1:
+        role_filter = st.multiselect(
+            "Role",
+            ["Composite Engineer", "Cert Specialist", "Manufacturing", "Flight Test"],
+            default=["Composite Engineer"]
+        )
+    with filter_col2:
+        location_filter = st.multiselect(
+            "Location",
+            ["Seattle", "Wichita", "Los Angeles", "Fort Worth"],
+            default=["Seattle"]
+        )
+    with filter_col3:
+        urgency = st.select_slider(
+            "Urgency",
+            ["Low", "Medium", "High", "Critical"],
+            value="High"
+        )
+    
+    # Talent table with scores - filtered, ordered and paged by PostgREST
+    render_talent_table(role_filter, location_filter, urgency)
+    
+    # Requisition matching against title/skills/notes
+    with st.expander("🧲 Match candidates to an open role"):
+        requisition = st.text_input(
+            "Requisition",
+            placeholder="e.g. Senior Composite Engineer, FAA DER certification"
+        )
+        if requisition:
+            matches = match_requisition(requisition)
+            if matches:
+                st.dataframe(
+                    pd.DataFrame(matches)[['match_score', 'name', 'title', 'current_company', 'location', 'priority_score']],
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "match_score": st.column_config.ProgressColumn("Match", format="%.2f", min_value=0, max_value=1),
+                    }
+                )
+            else:
+                st.caption("No profiles match that requisition yet.")
+    
+    # Talent flow visualization
+    st.subheader("Talent Movement Patterns")
+    
+    # Edge counts are maintained by the pipeline; the tab only reads the saved index
+    links = load_talent_flow(_saved_at(FLOW_PATH)).links_frame()
+    if links.empty:
+        st.caption("No talent movement recorded yet.")
+        return
+    
+    st.plotly_chart(cached_figure("talent_sankey", links, build_talent_sankey), use_container_width=True)
+
+def render_competition_tab():
     st.subheader("Competitive Intelligence")
     
     # Competitor comparison
@@ -225,58 +558,31 @@ with tab2:
         'Company': ['Natilus', 'JetZero', 'Joby Aviation', 'Archer', 'Beta'],
         'Funding': [20, 235, 1800, 1100, 800],  # in millions
         'Employees': [30, 150, 1000, 700, 400],
-        'Hiring/Month': [5, 25, 40, 30, 20],
         'Market Focus': ['Cargo BWB', 'Military BWB', 'eVTOL', 'eVTOL', 'eCTOL']
     })
+    hires = load_hiring_velocity(tuple(competitors['Company']))
+    competitors['Hiring/Month'] = competitors['Company'].map(hires).fillna(0).astype(int)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        fig1 = px.bar(
-            competitors, 
-            x='Company', 
-            y='Hiring/Month',
-            title='Monthly Hiring Velocity',
-            color='Company',
-            color_discrete_map={'Natilus': 'gold', 'JetZero': 'red'}
-        )
+        fig1 = cached_figure("hiring_velocity", competitors, build_hiring_velocity)
         st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
-        fig2 = px.scatter(
-            competitors,
-            x='Funding',
-            y='Employees',
-            size='Hiring/Month',
-            color='Company',
-            title='Funding vs Team Size',
-            text='Company'
-        )
+        fig2 = cached_figure("funding_vs_team", competitors, build_funding_vs_team)
         st.plotly_chart(fig2, use_container_width=True)
     
+    trend = load_activity_trend()
+    if not trend.empty:
+        st.plotly_chart(cached_figure("weekly_activity", trend, build_weekly_activity), use_container_width=True)
+    
     # Recent competitor moves
     st.subheader("Recent Competitor Activity")
     
-    competitor_news = pd.DataFrame({
-        'Date': pd.date_range(start='2024-11-20', periods=5, freq='3D'),
-        'Company': ['JetZero', 'Joby', 'JetZero', 'Archer', 'Beta'],
-        'Action': [
-            'Hired ex-Boeing BWB lead',
-            'Announced 100 engineer hiring spree',
-            'Filed 3 new BWB patents',
-            'Opened Wichita facility',
-            'Raised $300M Series C'
-        ],
-        'Impact': ['HIGH', 'MEDIUM', 'HIGH', 'LOW', 'MEDIUM']
-    })
-    
-    for _, row in competitor_news.iterrows():
-        if row['Impact'] == 'HIGH':
-            st.error(f"🔴 {row['Date'].strftime('%Y-%m-%d')} - **{row['Company']}**: {row['Action']}")
-        else:
-            st.warning(f"🟡 {row['Date'].strftime('%Y-%m-%d')} - {row['Company']}: {row['Action']}")
+    render_competitor_activity()
 
-with tab3:
+def render_supply_chain_tab():
     st.subheader("Supply Chain Risk Monitor")
     
     # Risk matrix
@@ -288,18 +594,7 @@ with tab3:
         'Alternative': ['Triumph, FACC', 'Toray, SGL', 'Hexcel, Mitsubishi', 'Rolls-Royce', 'Rolls-Royce']
     })
     
-    fig = px.scatter(
-        suppliers,
-        x='Risk Level',
-        y='Component',
-        color='Financial Health',
-        size='Risk Level',
-        hover_data=['Alternative'],
-        title='Supplier Risk Assessment',
-        color_discrete_map={'Critical': 'red', 'Stable': 'green', 'Good': 'blue', 'Excellent': 'darkgreen'}
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(cached_figure("supplier_risk", suppliers, build_supplier_risk), use_container_width=True)
     
     # Critical alerts
     st.error("""
@@ -309,7 +604,7 @@ with tab3:
     - ACTION: Engage Triumph as backup immediately
     """)
 
-with tab4:
+def render_series_a_tab():
     st.subheader("Series A Fundraising Tracker")
     
     # Fundraising pipeline
@@ -322,17 +617,12 @@ with tab4:
     })
     
     # Funnel chart
-    stages = ['First Meeting', 'Deep Dive', 'Due Diligence', 'Term Sheet', 'Closed']
-    values = [8, 4, 2, 1, 0]
-    
-    fig = go.Figure(go.Funnel(
-        y=stages,
-        x=values,
-        textinfo="value+percent initial"
-    ))
+    funnel = pd.DataFrame({
+        'Stage': ['First Meeting', 'Deep Dive', 'Due Diligence', 'Term Sheet', 'Closed'],
+        'Count': [8, 4, 2, 1, 0]
+    })
     
-    fig.update_layout(title="Investor Pipeline")
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(cached_figure("investor_funnel", funnel, build_investor_funnel), use_container_width=True)
     
     # Key metrics for investors
     col1, col2, col3 = st.columns(3)
@@ -344,7 +634,7 @@ with tab4:
     with col3:
         st.metric("Customer LOIs", "$45M", "+$5M this week")
 
-with tab5:
+def render_insights_tab():
     st.subheader("Strategic Insights for Leadership")
     
     st.info("""
@@ -371,37 +661,38 @@ with tab5:
         'Risk if Delayed': ['Lose to competitors', 'No backup for Spirit', 'Lose incentives', 'Run out of runway']
     })
     
-    fig = px.scatter(
-        decisions,
-        x='Urgency',
-        y='Impact',
-        text='Decision',
-        size=[40, 40, 40, 40],
-        title='Strategic Priority Matrix'
-    )
-    
-    fig.add_hline(y=50, line_dash="dash", line_color="gray")
-    fig.add_vline(x=50, line_dash="dash", line_color="gray")
-    
-    fig.add_annotation(x=75, y=75, text="DO NOW", showarrow=False, font=dict(size=20, color="red"))
-    fig.add_annotation(x=25, y=75, text="IMPORTANT", showarrow=False, font=dict(size=15, color="orange"))
-    fig.add_annotation(x=75, y=25, text="DELEGATE", showarrow=False, font=dict(size=15, color="blue"))
-    fig.add_annotation(x=25, y=25, text="DELAY", showarrow=False, font=dict(size=15, color="gray"))
-    
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(cached_figure("decision_matrix", decisions, build_decision_matrix), use_container_width=True)
+
+# Main Dashboard Tabs - st.tabs runs every body on every rerun, so use a
+# horizontal radio and only execute the selected section.
+SECTIONS = {
+    "🎯 Talent Pipeline": render_talent_tab,
+    "🏆 Competition Tracker": render_competition_tab,
+    "🏭 Supply Chain": render_supply_chain_tab,
+    "📊 Series A Metrics": render_series_a_tab,
+    "🧠 Strategic Insights": render_insights_tab,
+}
+
+active_section = st.radio(
+    "Section",
+    list(SECTIONS),
+    horizontal=True,
+    key="active_section",
+    label_visibility="collapsed"
+)
+with profiled(f"section {active_section}", cpu=False, write=False, memory=False):
+    SECTIONS[active_section]()
 
 # Footer with refresh
 st.markdown("---")
 refresh_col1, refresh_col2, refresh_col3 = st.columns([1, 2, 1])
 with refresh_col2:
+    # Cached queries + delta feeds make a rerun cost only the new rows
     if st.button("🔄 Refresh Data", type="primary", use_container_width=True):
         st.rerun()
+    if _fragment is not None:
+        st.caption(f"Live sections poll for new rows every {REFRESH_SECONDS // 60} minutes")
 
-# Auto-refresh every 5 minutes
-st.markdown("""
-<script>
-    setTimeout(function(){
-        window.location.reload();
-    }, 300000);
-</script>
-""", unsafe_allow_html=True)
\ No newline at end of file
+if profiling.enabled():
+    with st.expander("🛠 Debug: section timings"):
+        st.dataframe(pd.DataFrame(profiling.timings()), hide_index=True, use_container_width=True)
@@ -0,0 +1,88 @@
+# delta_feed.py - session-held tables that only fetch rows newer than what we have
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from simple_db import SimpleSupabase
+
+
+class DeltaFeed:
+    """A DataFrame mirror of the newest rows of one table.
+
+    The first load pulls the latest `window` rows. After that, poll()
+    only asks PostgREST for rows past the highest id (or date_detected
+    when the table has no id) already held, so the cost of a refresh
+    follows the amount of new data instead of the table size.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        select: str = "*",
+        cursor: str = "id",
+        date_column: Optional[str] = "date_detected",
+        window: int = 200,
+        batch: int = 500,
+    ) -> None:
+        self.table = table
+        self.select = select
+        self.cursor = cursor
+        self.date_column = date_column
+        self.window = window
+        self.batch = batch
+        self.df = pd.DataFrame()
+        self.last_cursor: Any = None
+        self.loaded = False
+
+    def _advance(self, rows: List[Dict[str, Any]]) -> None:
+        values = [r.get(self.cursor) for r in rows if r.get(self.cursor) is not None]
+        if values:
+            newest = max(values)
+            if self.last_cursor is None or newest > self.last_cursor:
+                self.last_cursor = newest
+
+    def _append(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        new = pd.DataFrame(rows)
+        if self.date_column and self.date_column in new.columns:
+            new[self.date_column] = pd.to_datetime(new[self.date_column], errors="coerce", utc=True)
+        self.df = pd.concat([new, self.df], ignore_index=True) if not self.df.empty else new
+        if self.cursor in self.df.columns:
+            self.df = (
+                self.df.drop_duplicates(subset=[self.cursor], keep="first")
+                .sort_values(self.cursor, ascending=False, kind="stable")
+                .head(self.window)
+                .reset_index(drop=True)
+            )
+        self._advance(rows)
+
+    def load(self, db: SimpleSupabase) -> int:
+        """Initial fill with the newest `window` rows."""
+        rows, _ = db.select_rows(
+            self.table,
+            {
+                "select": self.select,
+                "order": f"{self.cursor}.desc.nullslast",
+                "limit": str(self.window),
+            },
+        )
+        self._append(rows)
+        self.loaded = True
+        return len(rows)
+
+    def poll(self, db: SimpleSupabase) -> int:
+        """Fetch and append only rows past the cursor. Returns how many arrived."""
+        if not self.loaded or self.last_cursor is None:
+            return self.load(db)
+        rows, _ = db.select_rows(
+            self.table,
+            {
+                "select": self.select,
+                self.cursor: f"gt.{self.last_cursor}",
+                "order": f"{self.cursor}.asc",
+                "limit": str(self.batch),
+            },
+        )
+        self._append(rows)
+        return len(rows)
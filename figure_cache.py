@@ -0,0 +1,52 @@
+# figure_cache.py - memoize Plotly figures on a hash of their input DataFrame
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+import pandas as pd
+
+MAX_FIGURES = 64
+
+_figures: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def frame_key(df: pd.DataFrame) -> str:
+    """Content hash of a DataFrame (values, index and column names)."""
+    digest = hashlib.sha1()
+    digest.update("|".join(map(str, df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def cached_figure(
+    name: str,
+    df: pd.DataFrame,
+    build: Callable[[pd.DataFrame], Any],
+    *extra: Hashable,
+) -> Any:
+    """Return build(df), reusing the figure built last time the same data was seen.
+
+    Figures are shared across sessions, so callers must not mutate the
+    returned object - put every layout tweak inside build().
+    """
+    key = (name, frame_key(df)) + extra
+    with _lock:
+        fig = _figures.get(key)
+        if fig is not None:
+            _figures.move_to_end(key)
+            return fig
+
+    fig = build(df)
+
+    with _lock:
+        _figures[key] = fig
+        while len(_figures) > MAX_FIGURES:
+            _figures.popitem(last=False)
+    return fig
+
+
+def clear() -> None:
+    with _lock:
+        _figures.clear()
@@ -1,17 +1,23 @@
 # github_scout.py
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import requests
 
+import resilient_http
+
+from records import TalentBatch, TalentRecord
 from simple_db import SimpleSupabase
+from talent_resolution import match_existing
 
 
 GITHUB_API_URL = "https://api.github.com"
 
 
 class GithubScout:
+    table = "aerospace_talent"
+
     def __init__(self) -> None:
         self.db = SimpleSupabase()
         self.token = os.getenv("GITHUB_TOKEN")
@@ -37,7 +43,7 @@ class GithubScout:
     def _search_users(self, query: str, per_page: int = 5) -> List[Dict[str, Any]]:
         print(f"🔍 Searching GitHub: {query}")
         params = {"q": query, "per_page": per_page}
-        resp = self.session.get(f"{GITHUB_API_URL}/search/users", params=params, timeout=20)
+        resp = resilient_http.get(f"{GITHUB_API_URL}/search/users", session=self.session, params=params)
 
         if resp.status_code == 403:
             print("⚠️ GitHub rate limit or auth issue. Set GITHUB_TOKEN to increase limits.")
@@ -51,7 +57,7 @@ class GithubScout:
         return data.get("items", [])
 
     def _fetch_user_details(self, login: str) -> Optional[Dict[str, Any]]:
-        resp = self.session.get(f"{GITHUB_API_URL}/users/{login}", timeout=20)
+        resp = resilient_http.get(f"{GITHUB_API_URL}/users/{login}", session=self.session)
         if not resp.ok:
             print(f"⚠️ Failed to fetch details for {login}: {resp.status_code}")
             return None
@@ -59,12 +65,14 @@ class GithubScout:
 
     def _build_talent_row(
         self, user: Dict[str, Any], details: Dict[str, Any], source_query: str
-    ) -> Dict[str, Any]:
+    ) -> TalentRecord:
         name = details.get("name") or user.get("login")
         location = details.get("location") or ""
         company = details.get("company") or ""
 
-        notes_parts = []
+        # aerospace_talent has no github column; the profile URL rides in
+        # notes, where TalentResolver reads the login back as a match key
+        notes_parts = [f"GitHub: {user['html_url']}"] if user.get("html_url") else []
         if source_query:
             notes_parts.append(f"Found via GitHub search: '{source_query}'")
         if details.get("bio"):
@@ -72,23 +80,24 @@ class GithubScout:
 
         notes = " | ".join(notes_parts)
 
-        return {
-            "name": name,
-            "current_company": company,
-            "location": location,
-            "github_login": user.get("login"),
-            "github_url": user.get("html_url"),
-            "notes": notes,
-            "priority_score": 85,  # default; you can tune this later
-            "is_open_to_work": True,  # you could infer from bio if you want
-        }
+        return TalentRecord(
+            name=name,
+            current_company=company,
+            location=location,
+            github_login=user.get("login"),
+            github_url=user.get("html_url"),
+            notes=notes,
+            is_open_to_work=True,  # you could infer from bio if you want
+            source_tag="github",
+        )
 
-    def run(self) -> List[Dict[str, Any]]:
-        all_talent: List[Dict[str, Any]] = []
+    def stream(self) -> Iterator[TalentRecord]:
+        """Scored profiles one search query at a time, for the pipeline's batching writer."""
+        from talent_scoring import score_rows
 
         for query in self.search_queries:
-            users = self._search_users(query)
-            for user in users:
+            page: List[TalentRecord] = []
+            for user in self._search_users(query):
                 login = user.get("login")
                 if not login:
                     continue
@@ -98,18 +107,23 @@ class GithubScout:
                     continue
 
                 row = self._build_talent_row(user, details, query)
-                print(f"✅ Found: {row['name']} at {row['current_company'] or 'Unknown'}")
-                all_talent.append(row)
+                print(f"✅ Found: {row.name} at {row.current_company or 'Unknown'}")
+                page.append(row)
 
                 # be gentle with the API
                 time.sleep(0.4)
+            yield from score_rows(page)
+
+    def run(self) -> List[TalentRecord]:
+        all_talent = list(self.stream())
 
-        # Save to Supabase
-        saved = 0
+        # Save to Supabase - skip people we already have (same login, or
+        # same name/company/location from another source)
         if all_talent:
             try:
-                saved = self.db.insert_rows("aerospace_talent", all_talent)
-                print(f"\n💾 Saved {saved} GitHub engineers to aerospace_talent")
+                fresh, matches = match_existing(self.db, all_talent)
+                saved = self.db.insert_rows("aerospace_talent", TalentBatch.from_records(fresh).to_payload()) if fresh else []
+                print(f"\n💾 Saved {len(saved)} GitHub engineers to aerospace_talent ({len(matches)} already known)")
             except Exception as e:
                 print(f"\n⚠️ Could not save to Supabase: {e}")
 
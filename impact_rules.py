@@ -0,0 +1,174 @@
+# impact_rules.py - one compiled rule set for impact classification across trackers
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+RULES_PATH = Path(os.getenv("NATILUS_IMPACT_RULES", Path(__file__).with_name("impact_rules.json")))
+
+
+def _trie_regex(phrases: Iterable[str]) -> str:
+    """One regex for many phrases, factored as a trie.
+
+    Shared prefixes are matched once ("patent|patents|partnership" becomes
+    "pa(?:tent(?:s)?|rtnership)"), so the regex engine does not backtrack
+    through every alternative and matching cost stays roughly flat as the
+    phrase list grows.
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if "" in node:
+            return "(?:" + "|".join(branches) + ")?"
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+class ImpactClassifier:
+    """Classify intelligence records into LOW / MEDIUM / HIGH impact.
+
+    Entities and keywords from the rule file are compiled into a single
+    word-bounded matcher; news types, dollar thresholds and per-source
+    adjustments are dict lookups. A record's level is the highest level
+    its content earns - keywords, and the dollar amount when there is one,
+    else the news type - or the default when nothing fires. Entities do
+    not set a level on their own: a HIGH entity lifts a keyword match one
+    level (a LOW one lowers it), so the company qualifies what was said
+    instead of deciding it. The result is then shifted by source weight.
+    """
+
+    def __init__(self, rules: Dict[str, Any]) -> None:
+        self.levels: List[str] = rules.get("levels", ["LOW", "MEDIUM", "HIGH"])
+        self.rank = {level: i for i, level in enumerate(self.levels)}
+        self.default = rules.get("default", self.levels[len(self.levels) // 2])
+
+        self.phrases: Dict[str, tuple] = {}
+        for section, kind in (("entities", "entity"), ("keywords", "keyword")):
+            for phrase, level in rules.get(section, {}).items():
+                self.phrases[phrase.lower()] = (kind, phrase, level)
+        pattern = _trie_regex(sorted(self.phrases, key=len, reverse=True))
+        self.matcher = re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE) if pattern else None
+
+        self.news_types = {k.lower(): v for k, v in rules.get("news_types", {}).items()}
+        self.amounts = sorted(
+            rules.get("amount_thresholds", []), key=lambda t: t["min"], reverse=True
+        )
+        self.source_weights = {k.lower(): v for k, v in rules.get("source_weights", {}).items()}
+
+    @classmethod
+    def from_file(cls, path: Path = RULES_PATH) -> "ImpactClassifier":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def classify(
+        self,
+        text: str = "",
+        entity: str = "",
+        news_type: str = "",
+        amount: Optional[float] = None,
+        source: str = "",
+    ) -> Dict[str, Any]:
+        """Structured impact: {"level", "reasons", "source"}."""
+        best = -1
+        reasons: List[str] = []
+
+        def hit(level: str, reason: str) -> None:
+            nonlocal best
+            rank = self.rank.get(level, -1)
+            if rank > best:
+                best, reasons[:] = rank, [reason]
+            elif rank == best and reason not in reasons:
+                reasons.append(reason)
+
+        keyword_hit = False
+        entity_shift = 0
+        if self.matcher is not None:
+            for match in self.matcher.finditer(f"{entity}\n{text}"):
+                kind, phrase, level = self.phrases[match.group(0).lower()]
+                if kind == "entity":
+                    shift = self.rank.get(level, 0) - self.rank[self.default]
+                    if abs(shift) > abs(entity_shift):
+                        entity_shift, entity_reason = shift, phrase
+                else:
+                    keyword_hit = True
+                    hit(level, f"{kind}:{phrase}")
+
+        if keyword_hit and entity_shift:
+            best = min(max(best + entity_shift, 0), len(self.levels) - 1)
+            reasons.append(f"entity:{entity_reason}{entity_shift:+d}")
+
+        # a known dollar amount says more about a contract than its type does
+        type_level = self.news_types.get((news_type or "").lower())
+        if type_level and amount is None:
+            hit(type_level, f"type:{news_type}")
+
+        if amount is not None:
+            for threshold in self.amounts:
+                if amount >= threshold["min"]:
+                    hit(threshold["level"], f"amount>=${threshold['min']:,.0f}")
+                    break
+
+        if best < 0:
+            best, reasons = self.rank[self.default], ["default"]
+
+        shift = self.source_weights.get((source or "").lower(), 0)
+        if shift:
+            best = min(max(best + shift, 0), len(self.levels) - 1)
+            reasons.append(f"source:{source}{shift:+d}")
+
+        return {"level": self.levels[best], "reasons": reasons, "source": source or None}
+
+    def classify_batch(self, items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """classify() over dicts with text/entity/news_type/amount/source keys."""
+        return [
+            self.classify(
+                text=item.get("text", ""),
+                entity=item.get("entity", ""),
+                news_type=item.get("news_type", ""),
+                amount=item.get("amount"),
+                source=item.get("source", ""),
+            )
+            for item in items
+        ]
+
+
+_default: Optional[ImpactClassifier] = None
+
+
+def classifier() -> ImpactClassifier:
+    """Process-wide classifier compiled once from impact_rules.json."""
+    global _default
+    if _default is None:
+        _default = ImpactClassifier.from_file()
+    return _default
+
+
+def impact_level(record: Dict[str, Any]) -> str:
+    """Level of a record: the structured field, or the 'HIGH - ...' prefix of the stored column.
+
+    The intel tables have no level or score columns, so impact_on_natilus
+    (written by impact_text) is what is stored, and this is the one place
+    it is parsed. A prefix that is not a rules level reads as UNKNOWN.
+    """
+    impact = record.get("impact")
+    if isinstance(impact, dict) and impact.get("level"):
+        return impact["level"]
+    text = str(record.get("impact_on_natilus") or "").strip()
+    level = text.split(" - ", 1)[0].strip().upper()
+    return level if level in classifier().levels else "UNKNOWN"
+
+
+def impact_text(impact: Dict[str, Any], detail: str = "") -> str:
+    """Human-readable impact_on_natilus value for the existing text column."""
+    detail = detail or impact.get("source") or ", ".join(r.split(":", 1)[-1] for r in impact["reasons"])
+    return f"{impact['level']} - {detail}" if detail else impact["level"]
+
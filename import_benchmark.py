@@ -0,0 +1,72 @@
+# import_benchmark.py - guard master_pipeline's import cost against regressions
+import argparse
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Importing the pipeline must not drag these in; they load when a tracker or
+# read-model step that needs them actually runs.
+HEAVY_MODULES = ("pandas", "numpy", "supabase", "plotly", "streamlit")
+BUDGET_MS = 150.0
+RUNS = 5
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(module: str) -> Tuple[float, List[str]]:
+    """(cumulative ms for `import module`, every module it loaded) in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    total_us = 0
+    loaded = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        loaded.append(match.group(4))
+        if match.group(4) == module:
+            total_us = int(match.group(2))
+    return total_us / 1000.0, loaded
+
+
+def benchmark(module: str, runs: int = RUNS) -> Dict[str, object]:
+    timings = []
+    loaded: List[str] = []
+    for _ in range(runs):
+        ms, loaded = import_profile(module)
+        timings.append(ms)
+    heavy = sorted({m.split(".")[0] for m in loaded} & set(HEAVY_MODULES))
+    return {"best_ms": min(timings), "median_ms": sorted(timings)[len(timings) // 2], "heavy": heavy}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time regression check")
+    parser.add_argument("--module", default="master_pipeline")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--trackers", action="store_true", help="also report each tracker module's cost")
+    args = parser.parse_args()
+
+    result = benchmark(args.module, args.runs)
+    print(f"⏱️ import {args.module}: best {result['best_ms']:.1f} ms, median {result['median_ms']:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    if args.trackers:
+        from trackers import TRACKERS
+        for spec in TRACKERS.values():
+            module = spec.entry.split(":")[0]
+            print(f"   {spec.name:<10} {benchmark(module, 1)['best_ms']:8.1f} ms  ({module})")
+
+    failed = False
+    if result["heavy"]:
+        print(f"❌ {args.module} eagerly imports {', '.join(result['heavy'])}")
+        failed = True
+    if result["best_ms"] > args.budget_ms:
+        print(f"❌ Over budget by {result['best_ms'] - args.budget_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,274 @@
+# intel_api.py - read-only HTTP API over the local snapshot, for tools that would otherwise poll Supabase
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from columnar_snapshot import SNAPSHOT_DIR, load_manifest, open_table
+from summary_snapshot import SUMMARY_PATH
+
+HOST = os.getenv("NATILUS_API_HOST", "127.0.0.1")
+PORT = int(os.getenv("NATILUS_API_PORT", "8750"))
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+GZIP_MIN_BYTES = 1024
+MAX_HEADER_BYTES = 16 * 1024
+READ_TIMEOUT = 30.0
+RESPONSE_CACHE_SIZE = 256
+
+# URL path -> snapshot table
+RESOURCES = {
+    "talent": "aerospace_talent",
+    "news": "competitor_news",
+    "moves": "competitor_moves",
+    "alerts": "alerts",
+    "rollups/daily": "activity_daily",
+    "rollups/weekly": "activity_weekly",
+    "supply-chain": "supply_chain_opportunities",
+}
+
+RESERVED_PARAMS = {"limit", "offset", "fields", "since_id"}
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class IntelAPI:
+    """Resolves a request to (status, headers, body) from the snapshot files.
+
+    The ETag is derived from the table's export time and the normalised
+    query, so a poll with a matching If-None-Match is answered 304 before
+    any data is read. Rendered bodies (plain and gzipped) are kept in a
+    small LRU keyed by ETag, so many consumers asking the same page share
+    one rendering until the next pipeline export.
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR) -> None:
+        self.root = root
+        self._tables: Dict[str, Tuple[str, Any]] = {}  # table -> (exported_at, pyarrow.Table)
+        self._bodies: "OrderedDict[str, Tuple[bytes, Optional[bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()  # respond() runs on executor threads
+
+    def _table(self, table: str, exported_at: str) -> Any:
+        with self._lock:
+            cached = self._tables.get(table)
+        if cached is None or cached[0] != exported_at:
+            snapshot = open_table(table, self.root)
+            if snapshot is None:
+                raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, f"no snapshot of {table} yet")
+            cached = (exported_at, snapshot)
+            with self._lock:
+                self._tables[table] = cached
+        return cached[1]
+
+    def _cached(self, etag: str) -> Optional[Tuple[bytes, Optional[bytes]]]:
+        with self._lock:
+            hit = self._bodies.get(etag)
+            if hit is not None:
+                self._bodies.move_to_end(etag)
+            return hit
+
+    def _remember(self, etag: str, body: bytes, gzipped: Optional[bytes]) -> None:
+        with self._lock:
+            self._bodies[etag] = (body, gzipped)
+            while len(self._bodies) > RESPONSE_CACHE_SIZE:
+                self._bodies.popitem(last=False)
+
+    def respond(self, target: str, headers: Dict[str, str]) -> Tuple[HTTPStatus, Dict[str, str], bytes]:
+        url = urlsplit(target)
+        path = url.path.strip("/")
+        params = dict(parse_qsl(url.query))
+        if path == "":
+            version = "index"
+        elif path == "summary":
+            version = str(SUMMARY_PATH.stat().st_mtime_ns) if SUMMARY_PATH.exists() else "none"
+        elif path in RESOURCES:
+            entry = load_manifest(self.root).get(RESOURCES[path])
+            if not entry:
+                raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, f"no snapshot of {RESOURCES[path]} yet")
+            version = entry["exported_at"]
+        else:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"unknown resource /{path}")
+
+        query = urlencode(sorted(params.items()))
+        etag = '"' + hashlib.sha1(f"{path}?{query}@{version}".encode()).hexdigest()[:20] + '"'
+        out = {"ETag": etag, "Cache-Control": "public, max-age=60", "Vary": "Accept-Encoding"}
+        if etag in [t.strip() for t in headers.get("if-none-match", "").split(",")]:
+            return HTTPStatus.NOT_MODIFIED, out, b""
+
+        cached = self._cached(etag)
+        if cached is None:
+            if path == "":
+                payload: Any = {"resources": ["/summary"] + [f"/{name}" for name in RESOURCES]}
+            elif path == "summary":
+                payload = json.loads(SUMMARY_PATH.read_text(encoding="utf-8")) if SUMMARY_PATH.exists() else {}
+            else:
+                payload = self._page(path, params, version)
+            body = json.dumps(payload, default=_json_default).encode()
+            gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+            self._remember(etag, body, gzipped)
+            cached = (body, gzipped)
+
+        body, gzipped = cached
+        out["Content-Type"] = "application/json"
+        if gzipped is not None and "gzip" in headers.get("accept-encoding", ""):
+            out["Content-Encoding"] = "gzip"
+            body = gzipped
+        return HTTPStatus.OK, out, body
+
+    def _page(self, path: str, params: Dict[str, str], exported_at: str) -> Dict[str, Any]:
+        """One page of a resource: ?limit&offset&fields=a,b&since_id=N&<column>=<value>."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        table = self._table(RESOURCES[path], exported_at)
+        try:
+            limit = min(max(int(params.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+            offset = max(int(params.get("offset", 0)), 0)
+            since_id = int(params["since_id"]) if "since_id" in params else None
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "limit, offset and since_id must be integers") from None
+
+        if table.num_rows == 0:
+            # an export of an empty table may have no columns to validate against
+            return {"data": [], "total": 0, "limit": limit, "offset": offset, "next": None, "snapshot": exported_at}
+
+        columns = table.column_names
+        fields = [f for f in params.get("fields", "").split(",") if f] or columns
+        unknown = [f for f in fields if f not in columns]
+        filters = {k: v for k, v in params.items() if k not in RESERVED_PARAMS}
+        unknown += [k for k in filters if k not in columns]
+        if unknown:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"unknown field(s): {', '.join(unknown)}")
+        nested = [k for k in filters if pa.types.is_nested(table.schema.field(k).type)]
+        if nested:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"cannot filter on list/struct field(s): {', '.join(nested)}")
+
+        mask = None
+        if since_id is not None and "id" in columns:
+            mask = pc.greater(table["id"], since_id)
+        for column, value in filters.items():
+            match = pc.equal(pc.cast(table[column], pa.string()), value)
+            mask = match if mask is None else pc.and_(mask, match)
+        if mask is not None:
+            table = table.filter(pc.fill_null(mask, False))
+
+        total = table.num_rows
+        rows = table.select(fields).slice(offset, limit).to_pylist()
+        next_offset = offset + len(rows)
+        return {
+            "data": rows,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "next": f"/{path}?{urlencode({**params, 'offset': next_offset})}" if next_offset < total else None,
+            "snapshot": exported_at,
+        }
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str]]]:
+    """(method, target, lower-cased headers), or None when the client has gone."""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), READ_TIMEOUT)
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise ApiError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "headers too large") from None
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "malformed request line") from None
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+def _write_response(
+    writer: asyncio.StreamWriter, status: HTTPStatus, headers: Dict[str, str], body: bytes, head_only: bool, keep_alive: bool
+) -> None:
+    headers = {**headers, "Content-Length": str(len(body)), "Connection": "keep-alive" if keep_alive else "close"}
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"] + [f"{k}: {v}" for k, v in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    if body and not head_only and status != HTTPStatus.NOT_MODIFIED:
+        writer.write(body)
+
+
+def make_handler(api: IntelAPI):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                keep_alive = False
+                head_only = False
+                target = ""
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    head_only = method == "HEAD"
+                    if method not in ("GET", "HEAD"):
+                        raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, "read-only API: GET and HEAD only")
+                    # slicing and gzip run off the event loop so one big page does not stall other clients
+                    status, out, body = await loop.run_in_executor(None, api.respond, target, headers)
+                except ApiError as e:
+                    status, out = e.status, {"Content-Type": "application/json"}
+                    body = json.dumps({"error": str(e)}).encode()
+                except ConnectionError:
+                    raise
+                except Exception as e:
+                    # answer with a 500 instead of dropping the connection mid-request
+                    print(f"❌ API error on {target or 'request'}: {e!r}")
+                    status, out = HTTPStatus.INTERNAL_SERVER_ERROR, {"Content-Type": "application/json"}
+                    body = json.dumps({"error": "internal error"}).encode()
+                    keep_alive = False
+                _write_response(writer, status, out, body, head_only, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(host: str = HOST, port: int = PORT, api: Optional[IntelAPI] = None) -> None:
+    server = await asyncio.start_server(make_handler(api or IntelAPI()), host, port, limit=MAX_HEADER_BYTES)
+    print(f"🛰️ Intelligence API on http://{host}:{port}/ ({', '.join('/' + r for r in RESOURCES)}, /summary)")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only API over the pipeline's local snapshot")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -1,21 +1,21 @@
 # master_pipeline.py
+import argparse
 import os
 import sys
 from datetime import datetime
 import time
 from dotenv import load_dotenv
 
-# Import all our trackers
-from warn_tracker import WARNTracker
-from patent_tracker import PatentTracker
-from news_tracker import NewsTracker
-from github_scout import GithubScout
-from contract_tracker import ContractTracker
+# Trackers and the read-model builders (pandas/numpy/supabase) are imported
+# only when they run, so `--only news` does not pay for the others.
+from profiling import instrument, profiled, write_report
+from profiling import enable as enable_profiling
+from trackers import select
 
 load_dotenv()
 
 class NatilusMasterPipeline:
-    def __init__(self):
+    def __init__(self, only=None):
         print("""
         ╔══════════════════════════════════════════╗
         ║   NATILUS INTELLIGENCE PIPELINE v2.0     ║
@@ -23,11 +23,7 @@ class NatilusMasterPipeline:
         ╚══════════════════════════════════════════╝
         """)
         
-        self.warn = WARNTracker()
-        self.patents = PatentTracker()
-        self.news = NewsTracker()
-        self.github = GithubScout()
-        self.contracts = ContractTracker()
+        self.specs = select(only)
         
     def run_full_intelligence(self):
         """Run all intelligence gathering"""
@@ -35,67 +31,63 @@ class NatilusMasterPipeline:
         print(f"\n🚀 Starting Intelligence Run: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 50)
         
-        results = {
-            'layoffs': [],
-            'patents': [],
-            'news': [],
-            'github_talent': [],
-            'contracts': []
-        }
-        
-        # 1. WARN Layoffs
-        print("\n📊 PHASE 1: Layoff Tracking")
-        print("-" * 30)
-        try:
-            results['layoffs'] = self.warn.run()
-        except Exception as e:
-            print(f"❌ Layoff tracking failed: {e}")
-        
-        # 2. Patents
-        print("\n📋 PHASE 2: Patent Intelligence")
-        print("-" * 30)
-        try:
-            results['patents'] = self.patents.run()
-        except Exception as e:
-            print(f"❌ Patent tracking failed: {e}")
-        
-        # 3. News
-        print("\n📰 PHASE 3: News Monitoring")
-        print("-" * 30)
-        try:
-            results['news'] = self.news.run()
-        except Exception as e:
-            print(f"❌ News tracking failed: {e}")
-        
-        # 4. GitHub Talent
-        print("\n👨‍💻 PHASE 4: GitHub Talent Scout")
-        print("-" * 30)
-        try:
-            results['github_talent'] = self.github.run()
-        except Exception as e:
-            print(f"❌ GitHub scout failed: {e}")
+        from alerts import AlertRun, AlertState
+        from batch_writer import BatchWriter, table_sink
+        from run_archive import RunArchive
+        from simple_db import SimpleSupabase
         
-        # 5. Federal Contracts
-        print("\n💰 PHASE 5: Contract Intelligence")
-        print("-" * 30)
-        try:
-            results['contracts'] = self.contracts.run()
-        except Exception as e:
-            print(f"❌ Contract tracking failed: {e}")
+        # Records flow tracker -> alert rules -> bounded queue -> one batching
+        # writer; results keeps counts and a few samples, not the records.
+        # Every record is also archived so runs can be replayed and diffed.
+        alert_run = AlertRun(AlertState.load())
+        archive = RunArchive()
+        writer = BatchWriter(table_sink(SimpleSupabase()))
+        finishers = []
+        with writer:
+            for phase, spec in enumerate(self.specs, 1):
+                print(f"\n{spec.icon} PHASE {phase}: {spec.phase}")
+                print("-" * 30)
+                writer.tally(spec.results_key)
+                try:
+                    with profiled(f"phase.{spec.name}"):
+                        tracker = instrument(spec.load(), spec.name)
+                        if hasattr(tracker, "stream"):
+                            records, table = tracker.stream(), tracker.table
+                        else:
+                            # plugin without stream(): it saves its own rows
+                            records, table = tracker.run(), None
+                        for record in records:
+                            alert_run.observe(spec.results_key, record)
+                            archive.add(spec.results_key, record, table)
+                            writer.put(spec.results_key, table, record)
+                    if hasattr(tracker, "finish"):
+                        finishers.append((spec.results_key, tracker.finish))
+                except Exception as e:
+                    print(f"❌ {spec.phase} failed: {e}")
+        archive.close()
+        results = writer.tallies
+        for key, finish in finishers:
+            finish(results[key]["failed"] == 0)
         
         # Generate summary
         print("\n" + "=" * 50)
         print("📊 INTELLIGENCE SUMMARY")
         print("=" * 50)
         
-        total_items = sum(len(v) for v in results.values())
+        total_items = sum(t["count"] for t in results.values())
         
-        print(f"✅ Layoffs tracked: {len(results['layoffs'])}")
-        print(f"✅ Patents found: {len(results['patents'])}")
-        print(f"✅ News items: {len(results['news'])}")
-        print(f"✅ GitHub talent: {len(results['github_talent'])}")
-        print(f"✅ Contracts: {len(results['contracts'])}")
+        for spec in self.specs:
+            tally = results[spec.results_key]
+            failed = f", {tally['failed']} failed" if tally["failed"] else ""
+            print(f"✅ {spec.label}: {tally['count']} ({tally['saved']} saved{failed})")
         print(f"\n🎯 TOTAL INTELLIGENCE ITEMS: {total_items}")
+        if writer.first_write is not None:
+            print(f"⏱️ First rows written after {writer.first_write:.1f}s")
+        print(f"🗄️ Archived {archive.count} records as run {archive.run_id}")
+        
+        # Retries and breaker state per upstream host, so a skipped source is visible
+        import resilient_http
+        resilient_http.print_report()
         
         # Calculate runtime
         end_time = datetime.now()
@@ -103,37 +95,136 @@ class NatilusMasterPipeline:
         print(f"⏱️ Runtime: {duration} seconds")
         
         # Generate insights
-        self.generate_executive_insights(results)
+        with profiled("insights"):
+            self.generate_executive_insights(alert_run)
+        
+        # Precompute dashboard read models
+        for step in (
+            self.rescore_talent,
+            self.write_dashboard_summary,
+            self.update_activity_rollups,
+            self.update_talent_flow,
+            self.update_match_index,
+            self.update_search_index,
+            self.export_columnar_snapshot,
+        ):
+            with profiled(f"read_model.{step.__name__}"):
+                step()
         
+        write_report()
         return results
     
-    def generate_executive_insights(self, results):
+    def rescore_talent(self):
+        """Recompute priority_score for profiles whose inputs changed"""
+        from simple_db import SimpleSupabase
+        from talent_scoring import rescore_table
+        try:
+            stats = rescore_table(SimpleSupabase())
+            print(f"🎯 Rescored {stats['rescored']} of {stats['read']} talent profiles")
+        except Exception as e:
+            print(f"❌ Talent rescoring failed: {e}")
+    
+    def write_dashboard_summary(self):
+        """Aggregate the tables once so the dashboard header is a single read"""
+        from simple_db import SimpleSupabase
+        from summary_snapshot import SUMMARY_PATH, compute_summary, write_summary
+        try:
+            db = SimpleSupabase()
+            summary = write_summary(compute_summary(db), db)
+            print(f"📌 Dashboard summary updated: {summary['table_counts']} -> {SUMMARY_PATH}")
+        except Exception as e:
+            print(f"❌ Dashboard summary failed: {e}")
+    
+    def update_activity_rollups(self):
+        """Merge new competitor/talent rows into the daily and weekly rollup tables"""
+        from activity_rollups import update_rollups
+        from simple_db import SimpleSupabase
+        try:
+            stats = update_rollups(SimpleSupabase())
+            print(f"📈 Activity rollups: folded in {stats}")
+        except Exception as e:
+            print(f"❌ Activity rollups failed: {e}")
+    
+    def update_talent_flow(self):
+        """Fold new aerospace_talent rows into the Sankey edge counts (daily full recount)"""
+        from simple_db import SimpleSupabase
+        from talent_flow import TalentFlowIndex
+        try:
+            flow = TalentFlowIndex.load()
+            if flow.due():
+                read = flow.rebuild(SimpleSupabase())
+                print(f"🔀 Talent flow: recounted {read} rows into {len(flow.edges)} edges")
+            else:
+                read = flow.update(SimpleSupabase())
+                print(f"🔀 Talent flow: folded {read} new rows into {len(flow.edges)} edges")
+            flow.save()
+        except Exception as e:
+            print(f"❌ Talent flow update failed: {e}")
+    
+    def update_match_index(self):
+        """Add new profiles to the on-disk TF-IDF requisition index (daily full rebuild)"""
+        from simple_db import SimpleSupabase
+        from talent_matching import TalentMatcher
+        try:
+            matcher = TalentMatcher.load()
+            rebuild = matcher.due()
+            added = matcher.rebuild(SimpleSupabase()) if rebuild else matcher.update(SimpleSupabase())
+            if added or rebuild:
+                matcher.save()
+            print(f"🧲 Match index: {added} profiles {'re-indexed' if rebuild else 'newly indexed'}")
+        except Exception as e:
+            print(f"❌ Match index update failed: {e}")
+    
+    def update_search_index(self):
+        """Mirror newly written rows into the local FTS5 search index (daily full re-index)"""
+        from search_index import SOURCES, SearchIndex
+        from simple_db import SimpleSupabase
+        try:
+            db = SimpleSupabase()
+            index = SearchIndex()
+            # patched rows keep their id, so only a periodic re-index refreshes them
+            rebuilt = {kind: index.rebuild(db, kind) for kind in SOURCES if index.due(kind)}
+            added = index.sync(db)
+            index.close()
+            if rebuilt:
+                print(f"🔎 Search index: re-indexed {rebuilt}")
+            print(f"🔎 Search index: {added}")
+        except Exception as e:
+            print(f"❌ Search index update failed: {e}")
+    
+    def export_columnar_snapshot(self):
+        """Write Arrow copies of the core tables for the dashboard to slice locally"""
+        from columnar_snapshot import SNAPSHOT_DIR, export_snapshot
+        from simple_db import SimpleSupabase
+        try:
+            manifest = export_snapshot(SimpleSupabase())
+            rows = ", ".join(f"{table} {entry['rows']}" for table, entry in manifest.items())
+            print(f"🗂️ Columnar snapshot: {rows} -> {SNAPSHOT_DIR}")
+        except Exception as e:
+            print(f"❌ Columnar snapshot failed: {e}")
+    
+    def generate_executive_insights(self, alert_run):
         """Generate actionable insights for Nolan"""
         print("\n" + "=" * 50)
         print("🎯 EXECUTIVE INSIGHTS FOR NATILUS")
         print("=" * 50)
         
-        # Urgent actions
-        if len(results['layoffs']) > 10:
-            print(f"\n🚨 URGENT: {len(results['layoffs'])} aerospace professionals available from layoffs")
-            print("   ACTION: Schedule recruiting trip to Seattle/Wichita THIS WEEK")
-        
-        # Patent threats
-        jetzero_patents = [p for p in results['patents'] if 'JetZero' in str(p.get('company', ''))]
-        if jetzero_patents:
-            print(f"\n⚠️ THREAT: JetZero filed {len(jetzero_patents)} new patents")
-            print("   ACTION: Review for IP conflicts immediately")
+        from alerts import save_alerts
+        from simple_db import SimpleSupabase
         
-        # Funding landscape
-        big_contracts = [c for c in results['contracts'] if 'HIGH' in str(c.get('impact_on_natilus', ''))]
-        if big_contracts:
-            print(f"\n💰 COMPETITION: {len(big_contracts)} major contracts to competitors")
-            print("   ACTION: Accelerate Series A to maintain momentum")
+        # Only records this run added can raise an alert; repeats are already counted
+        fired = alert_run.fired()
+        for alert in fired:
+            print(f"\n{alert['title']}")
+            print(f"   ACTION: {alert['action']}")
+        if not fired:
+            print("\nNo new alerts since the last run")
         
-        # Talent opportunity
-        if results['github_talent']:
-            print(f"\n💎 OPPORTUNITY: {len(results['github_talent'])} engineers found on GitHub")
-            print("   ACTION: Reach out before competitors do")
+        try:
+            save_alerts(SimpleSupabase(), fired)
+            alert_run.state.save()
+        except Exception as e:
+            print(f"❌ Saving alerts failed: {e}")
         
         print("\n" + "=" * 50)
         print("✅ Intelligence gathering complete!")
@@ -141,7 +232,18 @@ class NatilusMasterPipeline:
 
 def main():
     """Run the pipeline"""
-    pipeline = NatilusMasterPipeline()
+    parser = argparse.ArgumentParser(description="Natilus intelligence pipeline")
+    parser.add_argument("--only", help="comma-separated trackers to run, e.g. news,patents")
+    parser.add_argument("--profile", action="store_true",
+                        help="cProfile + tracemalloc every phase into data/profiles/ (or set NATILUS_PROFILE=1)")
+    args = parser.parse_args()
+    if args.profile:
+        enable_profiling()
+    
+    try:
+        pipeline = NatilusMasterPipeline(only=args.only.split(",") if args.only else None)
+    except ValueError as e:
+        parser.error(str(e))
     
     # Check for required API keys
     if not os.getenv('SUPABASE_URL'):
@@ -0,0 +1,160 @@
+# news_dedupe.py - collapse syndicated copies of one story before they reach competitor_news
+import os
+import re
+import time
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+DEDUPE_PATH = Path(os.getenv("NATILUS_NEWS_LSH", Path("data") / "news_lsh.npz"))
+
+SHINGLE = 5          # character n-grams; robust to re-worded wire headlines
+NUM_PERM = 64        # MinHash signature length
+BANDS = 16           # LSH bands of NUM_PERM // BANDS rows -> ~50% Jaccard candidate cut
+THRESHOLD = 0.6      # estimated Jaccard at which two articles are one event
+RETENTION_DAYS = 21  # fingerprints older than this are dropped on save
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+# NewsAPI titles end in " - Outlet"; that suffix differs across syndicated copies
+_OUTLET_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,40}$")
+_NON_WORD = re.compile(r"[^a-z0-9$ ]+")
+
+
+def normalize(text: str) -> str:
+    text = _OUTLET_SUFFIX.sub("", str(text or "").strip()).lower()
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def signature(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32) of the text's character shingles."""
+    text = normalize(text)
+    shingles = {text[i:i + SHINGLE] for i in range(max(len(text) - SHINGLE + 1, 1))}
+    x = np.fromiter(
+        (zlib.crc32(s.encode()) & _PRIME for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    # (a*x + b) mod p stays below 2**62, so uint64 never wraps
+    return ((_A[:, None] * x[None, :] + _B[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def _band_keys(sig: np.ndarray) -> List[bytes]:
+    rows = sig.reshape(BANDS, -1)
+    return [bytes([band]) + rows[band].tobytes() for band in range(BANDS)]
+
+
+class NewsDeduper:
+    """MinHash + LSH index of recently stored news events.
+
+    Each stored event keeps its signature, when it was first seen and how
+    many outlets carried it. Band buckets are rebuilt from the signatures
+    on load, so only the arrays go to disk.
+    """
+
+    def __init__(self, path: Path = DEDUPE_PATH) -> None:
+        self.path = path
+        self.sigs = np.zeros((0, NUM_PERM), dtype=np.uint32)
+        self.first_seen = np.zeros(0, dtype=np.float64)
+        self.counts = np.zeros(0, dtype=np.int32)
+        self.buckets: Dict[bytes, List[int]] = defaultdict(list)
+        self.last_stats = {"kept": 0, "merged": 0, "known": 0}
+
+    @classmethod
+    def load(cls, path: Path = DEDUPE_PATH) -> "NewsDeduper":
+        index = cls(path)
+        if path.exists():
+            with np.load(path, allow_pickle=False) as data:
+                index.sigs = data["sigs"]
+                index.first_seen = data["first_seen"]
+                index.counts = data["counts"]
+            index._rebuild()
+        return index
+
+    def save(self, now: Optional[float] = None) -> None:
+        self.prune(now)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.stem + ".tmp.npz")
+        np.savez_compressed(tmp, sigs=self.sigs, first_seen=self.first_seen, counts=self.counts)
+        tmp.replace(self.path)
+
+    def prune(self, now: Optional[float] = None) -> None:
+        cutoff = (now or time.time()) - RETENTION_DAYS * 86400
+        keep = self.first_seen >= cutoff
+        if not keep.all():
+            self.sigs, self.first_seen, self.counts = self.sigs[keep], self.first_seen[keep], self.counts[keep]
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        self.buckets = defaultdict(list)
+        for pos, sig in enumerate(self.sigs):
+            for key in _band_keys(sig):
+                self.buckets[key].append(pos)
+
+    def _add(self, sig: np.ndarray, now: float) -> int:
+        pos = len(self.sigs)
+        self.sigs = np.vstack([self.sigs, sig[None, :]])
+        self.first_seen = np.append(self.first_seen, now)
+        self.counts = np.append(self.counts, np.int32(1))
+        for key in _band_keys(sig):
+            self.buckets[key].append(pos)
+        return pos
+
+    def match(self, sig: np.ndarray) -> Optional[int]:
+        """Position of the closest stored event at or above THRESHOLD."""
+        candidates: Set[int] = set()
+        for key in _band_keys(sig):
+            candidates.update(self.buckets.get(key, ()))
+        if not candidates:
+            return None
+        pos = np.fromiter(candidates, dtype=np.int64)
+        similarity = (self.sigs[pos] == sig).mean(axis=1)
+        best = int(similarity.argmax())
+        return int(pos[best]) if similarity[best] >= THRESHOLD else None
+
+    def collapse(
+        self,
+        items: Iterable[Dict[str, Any]],
+        text_of: Callable[[Dict[str, Any]], str],
+        now: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """One item per event, each carrying source_count.
+
+        Copies of an event first seen in this batch fold into that item;
+        copies of an event stored on an earlier run are dropped, since the
+        row already exists.
+        """
+        now = now or time.time()
+        batch_start = len(self.sigs)
+        kept: Dict[int, Dict[str, Any]] = {}
+        stats = {"kept": 0, "merged": 0, "known": 0}
+
+        for item in items:
+            sig = signature(text_of(item))
+            pos = self.match(sig)
+            if pos is None:
+                pos = self._add(sig, now)
+                kept[pos] = item
+                item["source_count"] = 1
+                stats["kept"] += 1
+                continue
+            self.counts[pos] += 1
+            if pos >= batch_start:
+                kept[pos]["source_count"] = int(self.counts[pos])
+                stats["merged"] += 1
+            else:
+                stats["known"] += 1
+
+        self.last_stats = stats
+        return list(kept.values())
+
+
+if __name__ == "__main__":
+    index = NewsDeduper.load()
+    print(f"🧬 {len(index.sigs)} news fingerprints from the last {RETENTION_DAYS} days")
+    if len(index.counts):
+        print(f"   {int((index.counts > 1).sum())} events were syndicated, up to {int(index.counts.max())} outlets")
@@ -1,14 +1,29 @@
 # news_tracker.py
-import requests
+import resilient_http
 from datetime import datetime, timedelta
+from itertools import chain
 import os
+import re
 from dotenv import load_dotenv
-from supabase import create_client
+
+from impact_rules import classifier, impact_text
+from page_cache import PageCache, parse_links
+from records import IntelBatch, IntelItem
 
 load_dotenv()
 
+# Article links on the defense-space listing: /defense-space/<section>/<slug>
+AVIATION_WEEK_ARTICLE = r"/defense-space/[^/?#]+/[^/?#]+"
+BWB_MENTION = re.compile(r"blended[- ]wing|\bBWB\b|JetZero", re.IGNORECASE)
+
 class NewsTracker:
+    table = 'competitor_news'
+    
     def __init__(self):
+        from supabase import create_client
+        
+        self.deduper = None
+        self.pages = PageCache.load()
         self.api_key = os.getenv('NEWSAPI_KEY')
         self.supabase = create_client(
             os.getenv('SUPABASE_URL'),
@@ -17,26 +32,28 @@ class NewsTracker:
     
     def get_competitor_news(self):
         """Track competitor news using NewsAPI"""
+        return [item for page in self.iter_competitor_news() for item in page]
+    
+    def iter_competitor_news(self):
+        """Yield one page of items per company as NewsAPI answers"""
         print("📰 Fetching competitor news...")
         
         if not self.api_key:
             print("⚠️ No NewsAPI key found. Get one free at newsapi.org")
-            return []
+            return
         
         url = "https://newsapi.org/v2/everything"
         
-        # Companies to track
+        # Companies to track (their weight lives in impact_rules.json)
         companies = [
-            ('JetZero', 'HIGH'),
-            ('Archer Aviation', 'MEDIUM'),
-            ('Joby Aviation', 'MEDIUM'),
-            ('Boeing BWB', 'HIGH'),
-            ('Spirit AeroSystems', 'HIGH')
+            'JetZero',
+            'Archer Aviation',
+            'Joby Aviation',
+            'Boeing BWB',
+            'Spirit AeroSystems'
         ]
         
-        all_news = []
-        
-        for company, importance in companies:
+        for company in companies:
             params = {
                 'q': company,
                 'apiKey': self.api_key,
@@ -47,28 +64,24 @@ class NewsTracker:
             }
             
             try:
-                response = requests.get(url, params=params)
+                response = resilient_http.get(url, params=params)
                 
                 if response.status_code == 200:
                     articles = response.json().get('articles', [])
                     
+                    page = []
                     for article in articles[:3]:  # Top 3 per company
-                        # Analyze the headline for important keywords
-                        headline = article['title'].lower()
-                        
-                        impact = importance
-                        if any(word in headline for word in ['patent', 'funding', 'contract', 'hire', 'ceo']):
-                            impact = 'HIGH'
-                        
-                        all_news.append({
-                            'company': company,
-                            'news_type': 'News',
-                            'details': article['title'][:200],
-                            'impact_on_natilus': f"{impact} - {article['source']['name']}",
-                            'date_detected': article['publishedAt']
-                        })
+                        page.append(IntelItem(
+                            company=company,
+                            news_type='News',
+                            details=article['title'][:200],
+                            description=article.get('description'),
+                            source=article['source']['name'],
+                            date_detected=article['publishedAt']
+                        ))
                     
                     print(f"✅ Found {len(articles)} articles about {company}")
+                    yield page
                     
                 elif response.status_code == 429:
                     print("⚠️ NewsAPI rate limit reached")
@@ -76,8 +89,6 @@ class NewsTracker:
                     
             except Exception as e:
                 print(f"❌ Error fetching news for {company}: {e}")
-        
-        return all_news
     
     def get_aviation_week_headlines(self):
         """Scrape Aviation Week for industry news"""
@@ -86,33 +97,91 @@ class NewsTracker:
         url = "https://aviationweek.com/defense-space"
         
         try:
-            response = requests.get(url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            
-            if response.status_code == 200:
-                # Look for BWB mentions
-                if 'blended wing' in response.text.lower() or 'bwb' in response.text.lower():
-                    return [{
-                        'company': 'Industry',
-                        'news_type': 'Industry News',
-                        'details': 'New BWB developments mentioned on Aviation Week',
-                        'impact_on_natilus': 'MEDIUM - Industry momentum building'
-                    }]
+            # A 304 (or an identical page) means no parsing and no items
+            articles = self.pages.scrape(
+                url,
+                lambda html, base: parse_links(html, base, AVIATION_WEEK_ARTICLE),
+                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+            )
         except Exception as e:
             print(f"⚠️ Could not access Aviation Week: {e}")
+            return []
+        
+        # Only new headlines about BWB work are worth an item
+        relevant = [a for a in articles if BWB_MENTION.search(a.title)]
+        print(f"✅ {len(articles)} new Aviation Week articles, {len(relevant)} on BWB")
+        return [
+            IntelItem(
+                company='Industry',
+                news_type='Industry News',
+                details=a.title[:200],
+                source='Aviation Week',
+                date_detected=a.date
+            )
+            for a in relevant
+        ]
+    
+    def dedupe(self, news):
+        """Fold syndicated copies into one item per event, skipping events already stored"""
+        from news_dedupe import NewsDeduper
         
-        return []
+        if self.deduper is None:
+            self.deduper = NewsDeduper.load()
+        news = self.deduper.collapse(
+            news, lambda item: f"{item.details} {item.description or ''}"
+        )
+        for item in news:
+            item.description = None
+        stats = self.deduper.last_stats
+        print(f"🧬 {stats['kept']} new events ({stats['merged']} syndicated copies folded, {stats['known']} already stored)")
+        return news
+    
+    def classify(self, news):
+        """Attach a structured impact to each item, all in one batch"""
+        impacts = classifier().classify_batch([
+            {
+                'text': item.details,
+                'entity': item.company,
+                'news_type': item.news_type,
+                'source': item.source or ''
+            }
+            for item in news
+        ])
+        for item, impact in zip(news, impacts):
+            source = item.source or ''
+            if item.source_count > 1:
+                source = f"{source} +{item.source_count - 1} outlets"
+            item.impact = impact
+            item.impact_on_natilus = impact_text(impact, source)
+        return news
     
     def save_to_database(self, news):
-        """Save news to database"""
+        """Save news to database in one insert"""
         if news:
             try:
-                for article in news:
-                    self.supabase.table('competitor_news').insert(article).execute()
+                self.supabase.table('competitor_news').insert(IntelBatch.from_records(news).to_payload()).execute()
                 print(f"💾 Saved {len(news)} news items")
             except Exception as e:
                 print(f"❌ Database error: {e}")
+                return False
+        return True
+    
+    def stream(self):
+        """Deduped, classified items page by page, for the pipeline's batching writer.
+        
+        Syndicated copies fold together within a page; a copy arriving in a
+        later page counts as already known.
+        """
+        pages = self.iter_competitor_news()
+        for page in chain(pages, [self.get_aviation_week_headlines()]):
+            yield from self.classify(self.dedupe(page))
+    
+    def finish(self, saved):
+        """Persist fingerprints and seen pages once the streamed rows are in the table"""
+        if saved:
+            if self.deduper is not None:
+                self.deduper.save()
+            self.pages.save()
     
     def run(self):
         """Run news tracking"""
@@ -124,8 +193,11 @@ class NewsTracker:
         # Check Aviation Week
         all_news.extend(self.get_aviation_week_headlines())
         
-        # Save to database
-        self.save_to_database(all_news)
+        all_news = self.dedupe(all_news)
+        self.classify(all_news)
+        
+        # Save to database; fingerprints persist only once their rows exist
+        self.finish(self.save_to_database(all_news))
         
         return all_news
 
@@ -0,0 +1,197 @@
+# page_cache.py - conditional-GET page cache and listing extraction for scraped sources
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from html import unescape
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+import resilient_http
+
+CACHE_DIR = Path(os.getenv("NATILUS_PAGE_CACHE", Path("data") / "pages"))
+SEEN_RETENTION_DAYS = 120
+
+# lxml parses several times faster than the stdlib parser; used when installed
+PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+_TAGS = re.compile(r"<[^>]+>")
+_save_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ScrapedItem:
+    """One article or patent pulled out of a listing page."""
+
+    title: str
+    url: str
+    date: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict, compare=False)
+
+
+Parser = Callable[[str, str], List[ScrapedItem]]
+
+
+def strip_tags(text: Optional[str]) -> str:
+    """Plain text of a short HTML fragment (search-result titles with <b> highlights)."""
+    return " ".join(unescape(_TAGS.sub("", text or "")).split())
+
+
+def parse_links(html: str, base_url: str, href_pattern: str, min_title: int = 20) -> List[ScrapedItem]:
+    """Listing links whose href matches href_pattern.
+
+    The title is the link text (shorter ones are nav/"Read more" links) and
+    the date comes from the nearest <time> around the link.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, PARSER)
+    items: Dict[str, ScrapedItem] = {}
+    for link in soup.find_all("a", href=re.compile(href_pattern)):
+        title = " ".join(link.get_text(" ", strip=True).split())
+        url = urljoin(base_url, link["href"]).split("#")[0]
+        if len(title) < min_title or url in items:
+            continue
+        date = None
+        node = link
+        for _ in range(4):
+            node = node.parent
+            if node is None:
+                break
+            stamp = node.find("time")
+            if stamp is not None:
+                date = stamp.get("datetime") or stamp.get_text(strip=True)
+                break
+        items[url] = ScrapedItem(title, url, date)
+    return list(items.values())
+
+
+class PageCache:
+    """Validators, last body and already-emitted item URLs for scraped pages.
+
+    index.json holds {"pages": {url: {etag, last_modified, digest, fetched_at}},
+    "seen": {source: {item_url: day}}}; bodies are gzipped next to it. A page
+    that answers 304, or returns the body it returned last time, is not
+    parsed at all, and items already emitted are filtered out, so a scrape
+    only yields what is new since the last saved run.
+
+    Several trackers keep their own PageCache over the same index, so
+    save() re-reads the file and writes back only the pages and items this
+    instance touched rather than its whole (possibly stale) copy.
+    """
+
+    def __init__(self, root: Path = CACHE_DIR) -> None:
+        self.root = root
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.seen: Dict[str, Dict[str, str]] = {}
+        self.stats = {"fetched": 0, "not_modified": 0, "unchanged": 0, "new_items": 0}
+        self._touched_pages: Dict[str, Dict[str, Any]] = {}
+        self._touched_seen: Dict[str, Dict[str, str]] = {}
+
+    @staticmethod
+    def _read_index(root: Path) -> Dict[str, Any]:
+        path = root / "index.json"
+        if path.exists():
+            try:
+                return json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pass
+        return {}
+
+    @classmethod
+    def load(cls, root: Path = CACHE_DIR) -> "PageCache":
+        cache = cls(root)
+        data = cls._read_index(root)
+        cache.pages = data.get("pages", {})
+        cache.seen = data.get("seen", {})
+        return cache
+
+    def save(self) -> None:
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=SEEN_RETENTION_DAYS)).date().isoformat()
+        with _save_lock:
+            data = self._read_index(self.root)
+            pages = {**data.get("pages", {}), **self._touched_pages}
+            seen = data.get("seen", {})
+            for source, urls in self._touched_seen.items():
+                seen[source] = {**seen.get(source, {}), **urls}
+            seen = {
+                source: {url: day for url, day in urls.items() if day >= cutoff}
+                for source, urls in seen.items()
+            }
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.root / f"index.{os.getpid()}.{threading.get_ident()}.tmp"
+            tmp.write_text(json.dumps({"pages": pages, "seen": seen}), encoding="utf-8")
+            tmp.replace(self.root / "index.json")
+        self.pages, self.seen = pages, seen
+        self._touched_pages, self._touched_seen = {}, {}
+
+    def _body_path(self, url: str) -> Path:
+        return self.root / f"{hashlib.sha1(url.encode()).hexdigest()[:16]}.html.gz"
+
+    def fetch(self, url: str, **kwargs: Any) -> Optional[str]:
+        """The page body if it changed since the last fetch, else None."""
+        entry = self.pages.get(url, {})
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = resilient_http.get(url, headers=headers, **kwargs)
+        if response.status_code == 304:
+            self.stats["not_modified"] += 1
+            return None
+        response.raise_for_status()
+
+        body = response.text
+        digest = hashlib.sha1(body.encode()).hexdigest()
+        unchanged = digest == entry.get("digest")
+        self.pages[url] = self._touched_pages[url] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "digest": digest,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if unchanged:
+            # servers without validators still resend the same page
+            self.stats["unchanged"] += 1
+            return None
+        self.stats["fetched"] += 1
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._body_path(url).write_bytes(gzip.compress(body.encode()))
+        return body
+
+    def cached_body(self, url: str) -> Optional[str]:
+        path = self._body_path(url)
+        return gzip.decompress(path.read_bytes()).decode() if path.exists() else None
+
+    def new_items(self, source: str, items: List[ScrapedItem]) -> List[ScrapedItem]:
+        """Items whose URL this source has not emitted before; marks them seen."""
+        seen = self.seen.setdefault(source, {})
+        touched = self._touched_seen.setdefault(source, {})
+        today = datetime.now(timezone.utc).date().isoformat()
+        fresh = []
+        for item in items:
+            if item.url in seen:
+                continue
+            seen[item.url] = touched[item.url] = today
+            fresh.append(item)
+        self.stats["new_items"] += len(fresh)
+        return fresh
+
+    def scrape(self, url: str, parse: Parser, source: Optional[str] = None, **kwargs: Any) -> List[ScrapedItem]:
+        """New items on a listing page: nothing (and no parsing) when it has not changed.
+
+        Pages sharing a `source` share one seen-set, so an item listed on
+        several of them is emitted once.
+        """
+        body = self.fetch(url, **kwargs)
+        if body is None:
+            return []
+        return self.new_items(source or url, parse(body, url))
@@ -1,15 +1,46 @@
 # patent_tracker.py
-import requests
 import json
+import resilient_http
 from datetime import datetime, timedelta
+from urllib.parse import quote
 import os
 from dotenv import load_dotenv
-from supabase import create_client
+
+from impact_rules import classifier, impact_text
+from page_cache import PageCache, ScrapedItem, strip_tags
+from records import IntelBatch, IntelItem
 
 load_dotenv()
 
+
+def parse_google_patents(body, base_url):
+    """Structured results from a Google Patents xhr/query response"""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return []
+    items = []
+    for cluster in data.get('results', {}).get('cluster', []):
+        for result in cluster.get('result', []):
+            patent = result.get('patent', {})
+            number = patent.get('publication_number')
+            if not number:
+                continue
+            items.append(ScrapedItem(
+                title=strip_tags(patent.get('title')) or number,
+                url=f"https://patents.google.com/patent/{number}/en",
+                date=patent.get('publication_date') or patent.get('filing_date'),
+                extra={'number': number, 'assignee': strip_tags(patent.get('assignee'))}
+            ))
+    return items
+
 class PatentTracker:
+    table = 'competitor_moves'
+    
     def __init__(self):
+        from supabase import create_client
+        
+        self.pages = PageCache.load()
         self.supabase = create_client(
             os.getenv('SUPABASE_URL'),
             os.getenv('SUPABASE_KEY')
@@ -46,10 +77,11 @@ class PatentTracker:
         }
         
         try:
-            response = requests.post(
+            response = resilient_http.post(
                 base_url,
                 json=query,
-                headers={'Content-Type': 'application/json'}
+                headers={'Content-Type': 'application/json'},
+                idempotent=True  # a search, safe to resend
             )
             
             if response.status_code == 200:
@@ -58,21 +90,22 @@ class PatentTracker:
                 
                 patent_insights = []
                 for patent in patents:
-                    # Check if it's from a competitor
                     assignee = patent.get('assignees', [{}])[0].get('assignee_organization', 'Unknown')
-                    
-                    if any(company in assignee for company in ['Boeing', 'JetZero', 'Airbus', 'Lockheed']):
-                        impact = 'HIGH'
-                    else:
-                        impact = 'MEDIUM'
-                    
-                    patent_insights.append({
-                        'company': assignee,
-                        'news_type': 'Patent Filing',
-                        'details': f"Patent: {patent.get('patent_title', 'Unknown')}",
-                        'impact_on_natilus': f"{impact} - {patent.get('patent_number', '')}",
-                        'date_detected': patent.get('patent_date', '')
-                    })
+                    patent_insights.append(IntelItem(
+                        company=assignee,
+                        news_type='Patent Filing',
+                        details=f"Patent: {patent.get('patent_title', 'Unknown')}",
+                        date_detected=patent.get('patent_date')
+                    ))
+                
+                # Classified on the title alone; competitor assignees lift keyword matches
+                impacts = classifier().classify_batch([
+                    {'text': p.details.split(': ', 1)[-1], 'entity': p.company, 'news_type': p.news_type}
+                    for p in patent_insights
+                ])
+                for insight, patent, impact in zip(patent_insights, patents, impacts):
+                    insight.impact = impact
+                    insight.impact_on_natilus = impact_text(impact, patent.get('patent_number', ''))
                 
                 print(f"✅ Found {len(patent_insights)} relevant patents")
                 return patent_insights
@@ -95,40 +128,64 @@ class PatentTracker:
             "distributed+propulsion+cargo"
         ]
         
-        patent_insights = []
+        patents = []
         
         for term in search_terms:
-            url = f"https://patents.google.com/?q={term}&oq={term}&sort=new"
+            # The results page renders client-side; its data comes from this JSON endpoint
+            query = quote(f"q={term}&oq={term}&sort=new", safe='')
+            url = f"https://patents.google.com/xhr/query?url={query}&exp="
             
             try:
-                # For basic info, we can parse the URL
-                # In production, you'd use BeautifulSoup here
-                response = requests.get(url, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                
-                if response.status_code == 200 and 'JetZero' in response.text:
-                    patent_insights.append({
-                        'company': 'Competitor',
-                        'news_type': 'Patent Activity',
-                        'details': f'New patents found for: {term.replace("+", " ")}',
-                        'impact_on_natilus': 'MEDIUM - Competitive landscape evolving'
-                    })
-                    
+                # Terms share one seen-set, so a patent matching several is emitted once
+                patents.extend(self.pages.scrape(
+                    url,
+                    parse_google_patents,
+                    source='google-patents',
+                    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+                ))
             except Exception as e:
                 print(f"⚠️ Could not search Google Patents: {e}")
         
+        patent_insights = [
+            IntelItem(
+                company=p.extra.get('assignee') or 'Unknown',
+                news_type='Patent Filing',
+                details=f"Patent: {p.title}",
+                date_detected=p.date
+            )
+            for p in patents
+        ]
+        impacts = classifier().classify_batch([
+            {'text': p.details.split(': ', 1)[-1], 'entity': p.company, 'news_type': p.news_type}
+            for p in patent_insights
+        ])
+        for insight, patent, impact in zip(patent_insights, patents, impacts):
+            insight.impact = impact
+            insight.impact_on_natilus = impact_text(impact, patent.extra.get('number', ''))
+        
+        print(f"✅ Found {len(patent_insights)} new patents on Google Patents")
         return patent_insights
     
     def save_to_database(self, patents):
-        """Save patent intelligence to database"""
+        """Save patent intelligence to database in one insert"""
         if patents:
             try:
-                for patent in patents:
-                    self.supabase.table('competitor_moves').insert(patent).execute()
+                self.supabase.table('competitor_moves').insert(IntelBatch.from_records(patents).to_payload()).execute()
                 print(f"💾 Saved {len(patents)} patent insights")
             except Exception as e:
                 print(f"❌ Database error: {e}")
+                return False
+        return True
+    
+    def finish(self, saved):
+        """Remember emitted patents once their rows are in the table"""
+        if saved:
+            self.pages.save()
+    
+    def stream(self):
+        """Yield insights source by source, for the pipeline's batching writer"""
+        yield from self.search_uspto_patents()
+        yield from self.search_google_patents()
     
     def run(self):
         """Run patent tracking"""
@@ -141,7 +198,7 @@ class PatentTracker:
         all_patents.extend(self.search_google_patents())
         
         # Save to database
-        self.save_to_database(all_patents)
+        self.finish(self.save_to_database(all_patents))
         
         return all_patents
 
@@ -0,0 +1,186 @@
+# profiling.py - opt-in cProfile/tracemalloc hooks for pipeline phases and dashboard sections
+import cProfile
+import functools
+import inspect
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+PROFILE_ROOT = Path(os.getenv("NATILUS_PROFILE_DIR", Path("data") / "profiles"))
+TOP_ALLOCATIONS = 15
+
+_enabled = os.getenv("NATILUS_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+_run_dir: Optional[Path] = None
+# Per thread: each Streamlit session reruns its script in its own thread,
+# so one session's timings never land in (or get cleared from) another's
+_state = threading.local()
+
+
+def _thread() -> threading.local:
+    if not hasattr(_state, "timings"):
+        _state.timings = []  # every profiled block of this run, in completion order
+        _state.peaks = []  # tracemalloc peak per open block, folded into the parent on exit
+        _state.cpu_active = False  # only one cProfile at a time; nested steps are timed only
+    return _state
+
+
+def timings() -> List[Dict[str, Any]]:
+    """Blocks timed so far in this thread's run."""
+    return _thread().timings
+
+
+def reset() -> None:
+    """Start a new run in this thread (e.g. a dashboard rerun)."""
+    _thread().timings = []
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(run_dir: Optional[Path] = None) -> Path:
+    """Turn profiling on (what NATILUS_PROFILE=1 does at import) and pick the output folder."""
+    global _enabled, _run_dir
+    _enabled = True
+    _run_dir = run_dir or PROFILE_ROOT / datetime.now().strftime("%Y%m%d-%H%M%S")
+    return _run_dir
+
+
+def run_dir() -> Path:
+    global _run_dir
+    if _run_dir is None:
+        _run_dir = PROFILE_ROOT / datetime.now().strftime("%Y%m%d-%H%M%S")
+    _run_dir.mkdir(parents=True, exist_ok=True)
+    return _run_dir
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "block"
+
+
+def _allocation_summary(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> List[str]:
+    stats = after.compare_to(before, "lineno")
+    return [str(stat) for stat in stats[:TOP_ALLOCATIONS]]
+
+
+@contextmanager
+def profiled(name: str, cpu: bool = True, write: bool = True, memory: bool = True) -> Iterator[None]:
+    """Time a block; with profiling on, also cProfile it and diff its allocations.
+
+    Writes <name>.prof (open with snakeviz / pstats) and <name>.alloc.txt
+    into the run folder. A no-op apart from one flag check when off.
+    tracemalloc is process-wide, so servers (the dashboard) time with
+    memory=False and leave it to the pipeline and CLI runs.
+    """
+    if not _enabled:
+        yield
+        return
+
+    state = _thread()
+    profiler = None
+    if cpu and not state.cpu_active:
+        profiler = cProfile.Profile()
+        state.cpu_active = True
+
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if memory:
+        tracemalloc.reset_peak()
+        state.peaks.append(0)
+    before = tracemalloc.take_snapshot() if memory and write else None
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            state.cpu_active = False
+        elapsed = time.perf_counter() - started
+        entry = {"name": name, "seconds": round(elapsed, 4)}
+        if memory:
+            # reset_peak() in a nested block hides this block's earlier peak, so
+            # children report theirs upward
+            peak = max(tracemalloc.get_traced_memory()[1], state.peaks.pop())
+            if state.peaks:
+                state.peaks[-1] = max(state.peaks[-1], peak)
+            entry["peak_mb"] = round(peak / 1e6, 2)
+        after = tracemalloc.take_snapshot() if before is not None else None
+        if started_tracing:
+            tracemalloc.stop()
+
+        if write:
+            folder = run_dir()
+            slug = _slug(name)
+            if profiler:
+                profiler.dump_stats(folder / f"{slug}.prof")
+                entry["prof"] = str(folder / f"{slug}.prof")
+            if after is not None:
+                allocations = _allocation_summary(before, after)
+                (folder / f"{slug}.alloc.txt").write_text("\n".join(allocations) + "\n", encoding="utf-8")
+        state.timings.append(entry)
+
+
+class Laps:
+    """Wall-clock laps for straight-line code (dashboard top level) that
+    cannot be wrapped in a with-block without re-indenting it."""
+
+    def __init__(self) -> None:
+        self.last = time.perf_counter()
+
+    def lap(self, name: str) -> None:
+        now = time.perf_counter()
+        if _enabled:
+            timings().append({"name": name, "seconds": round(now - self.last, 4)})
+        self.last = now
+
+
+def instrument(obj: Any, prefix: str) -> Any:
+    """Wrap an object's public methods (fetch/parse/save steps) in profiled().
+
+    Leaves the object untouched when profiling is off.
+    """
+    if not _enabled:
+        return obj
+    for attr in dir(obj):
+        if attr.startswith("_") or attr == "run":
+            continue
+        method = getattr(obj, attr, None)
+        if not callable(method) or not hasattr(method, "__self__"):
+            continue
+        if inspect.isgeneratorfunction(method):
+            continue  # its work happens as it is iterated, inside the phase block
+
+        def wrap(method, step=f"{prefix}.{attr}"):
+            @functools.wraps(method)
+            def profiled_step(*args, **kwargs):
+                with profiled(step):
+                    return method(*args, **kwargs)
+            return profiled_step
+
+        setattr(obj, attr, wrap(method))
+    return obj
+
+
+def write_report() -> Optional[Path]:
+    """summary.json of every block plus a printed table, slowest first."""
+    entries = timings()
+    if not _enabled or not entries:
+        return None
+    path = run_dir() / "summary.json"
+    path.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+    print("\n🔬 Profile (slowest first)")
+    for entry in sorted(entries, key=lambda e: e["seconds"], reverse=True):
+        peak = f"{entry['peak_mb']:8.1f} MB peak" if "peak_mb" in entry else " " * 16
+        print(f"   {entry['seconds']:8.2f}s  {peak}  {entry['name']}")
+    print(f"   -> {path.parent}")
+    return path
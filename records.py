@@ -0,0 +1,245 @@
+# records.py - typed, slotted records for tracker output and columnar batches of them
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+
+R = TypeVar("R", bound="Record")
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = " ".join(str(value).split())
+    return text or None
+
+
+def _category(value: Any) -> Optional[str]:
+    """Short repeated labels (companies, news types, locations) share one string object."""
+    text = _text(value)
+    return sys.intern(text) if text else None
+
+
+def _date_text(value: Any) -> Optional[str]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value).strip() or None
+
+
+class Record(Mapping):
+    """Base for slotted tracker records.
+
+    Records read like the dicts trackers used to build (record["company"],
+    .get(), dict(record)), so resolution, scoring and alert code accepts
+    them unchanged. Validation and interning happen once, in __post_init__.
+    COLUMNS are the fields that exist in the table; the rest live only in
+    memory and never reach a payload.
+    """
+
+    __slots__ = ()
+    COLUMNS: ClassVar[Tuple[str, ...]] = ()
+    CATEGORICAL: ClassVar[Tuple[str, ...]] = ()
+
+    # Mapping protocol over the dataclass fields
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._field_names():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._field_names():
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._field_names())
+
+    def __len__(self) -> int:
+        return len(self._field_names())
+
+    @classmethod
+    def _field_names(cls) -> Tuple[str, ...]:
+        names = cls.__dict__.get("_names")
+        if names is None:
+            names = tuple(f.name for f in fields(cls))
+            cls._names = names
+        return names
+
+    @classmethod
+    def from_dict(cls: Type[R], row: Mapping) -> R:
+        """Build from a tracker/CSV/API dict; unknown keys are ignored."""
+        if isinstance(row, cls):
+            return row
+        names = cls._field_names()
+        return cls(**{k: v for k, v in row.items() if k in names})
+
+    @classmethod
+    def _restore(cls: Type[R], names: Iterable[str], values: Iterable[Any]) -> R:
+        """Rebuild an already-validated record without running __post_init__ again."""
+        record = cls.__new__(cls)
+        for name, value in zip(names, values):
+            object.__setattr__(record, name, value)
+        return record
+
+    def to_row(self) -> Dict[str, Any]:
+        """Table columns only, ready for an insert payload."""
+        return {col: getattr(self, col) for col in self.COLUMNS}
+
+
+@dataclass(eq=False, slots=True)
+class IntelItem(Record):
+    """One competitor_news / competitor_moves row plus what trackers carry alongside it."""
+
+    company: Optional[str]
+    news_type: Optional[str]
+    details: Optional[str]
+    impact_on_natilus: Optional[str] = None
+    date_detected: Optional[str] = None
+    # in-memory only
+    source: Optional[str] = None
+    description: Optional[str] = None
+    impact: Optional[Dict[str, Any]] = None
+    source_count: int = 1
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "company", "news_type", "details", "impact_on_natilus", "date_detected",
+    )
+    CATEGORICAL: ClassVar[Tuple[str, ...]] = ("company", "news_type", "source")
+
+    def __post_init__(self) -> None:
+        self.company = _category(self.company) or "Unknown"
+        self.news_type = _category(self.news_type) or "News"
+        self.source = _category(self.source)
+        self.details = _text(self.details)
+        if not self.details:
+            raise ValueError(f"{self.company} {self.news_type} item has no details")
+        self.impact_on_natilus = _text(self.impact_on_natilus)
+        self.date_detected = _date_text(self.date_detected)
+        self.description = _text(self.description)
+
+
+@dataclass(eq=False, slots=True)
+class TalentRecord(Record):
+    """One aerospace_talent row."""
+
+    name: Optional[str]
+    current_company: Optional[str] = None
+    previous_company: Optional[str] = None
+    title: Optional[str] = None
+    location: Optional[str] = None
+    years_experience: Optional[int] = None
+    linkedin_url: Optional[str] = None
+    is_open_to_work: bool = False
+    priority_score: Optional[int] = None
+    skills: Optional[str] = None
+    notes: Optional[str] = None
+    risk_of_poaching: Optional[str] = None
+    # in-memory only (no such columns in aerospace_talent)
+    github_login: Optional[str] = None
+    github_url: Optional[str] = None
+    layoff_date: Optional[str] = None
+    source_tag: Optional[str] = None
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "name", "current_company", "previous_company", "title", "location",
+        "years_experience", "linkedin_url", "is_open_to_work", "priority_score",
+        "skills", "notes", "risk_of_poaching",
+    )
+    CATEGORICAL: ClassVar[Tuple[str, ...]] = (
+        "current_company", "previous_company", "title", "location", "risk_of_poaching", "source_tag",
+    )
+
+    def __post_init__(self) -> None:
+        self.name = _text(self.name)
+        if not self.name:
+            raise ValueError("talent record has no name")
+        for col in self.CATEGORICAL:
+            setattr(self, col, _category(getattr(self, col)))
+        if self.risk_of_poaching:
+            self.risk_of_poaching = sys.intern(self.risk_of_poaching.upper())
+        if self.years_experience not in (None, ""):
+            self.years_experience = int(float(self.years_experience))
+        else:
+            self.years_experience = None
+        if self.priority_score not in (None, ""):
+            self.priority_score = max(0, min(100, int(float(self.priority_score))))
+        else:
+            self.priority_score = None
+        self.is_open_to_work = bool(self.is_open_to_work)
+        self.skills = _text(self.skills)
+        self.notes = _text(self.notes)
+        self.linkedin_url = _text(self.linkedin_url)
+        self.layoff_date = _date_text(self.layoff_date)
+
+
+class RecordBatch:
+    """Column-oriented batch of one record type.
+
+    Each field is one list, so a batch converts to a DataFrame (categorical
+    fields as pandas categoricals) or an insert payload without building or
+    filtering a dict per record first.
+    """
+
+    record_type: ClassVar[Type[Record]] = Record
+
+    def __init__(self, columns: Optional[Dict[str, List[Any]]] = None) -> None:
+        names = self.record_type._field_names()
+        self.columns: Dict[str, List[Any]] = columns or {name: [] for name in names}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "RecordBatch":
+        batch = cls()
+        batch.extend(records)
+        return batch
+
+    def append(self, record: Any) -> None:
+        record = self.record_type.from_dict(record)
+        for name, column in self.columns.items():
+            column.append(getattr(record, name))
+
+    def extend(self, records: Iterable[Any]) -> None:
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+    def __iter__(self) -> Iterator[Record]:
+        names = list(self.columns)
+        for values in zip(*self.columns.values()):
+            yield self.record_type._restore(names, values)
+
+    def column(self, name: str) -> List[Any]:
+        return self.columns[name]
+
+    def set_column(self, name: str, values: Iterable[Any]) -> None:
+        values = list(values)
+        if len(values) != len(self):
+            raise ValueError(f"{name}: {len(values)} values for {len(self)} records")
+        self.columns[name] = values
+
+    def to_payload(self) -> List[Dict[str, Any]]:
+        """Insert payload: table columns only, one dict per record."""
+        cols = self.record_type.COLUMNS
+        return [dict(zip(cols, values)) for values in zip(*(self.columns[c] for c in cols))]
+
+    def to_frame(self, table_only: bool = False):
+        import pandas as pd
+
+        names = self.record_type.COLUMNS if table_only else list(self.columns)
+        df = pd.DataFrame({name: self.columns[name] for name in names})
+        for name in self.record_type.CATEGORICAL:
+            if name in df.columns:
+                df[name] = df[name].astype("category")
+        return df
+
+
+class IntelBatch(RecordBatch):
+    record_type = IntelItem
+
+
+class TalentBatch(RecordBatch):
+    record_type = TalentRecord
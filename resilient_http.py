@@ -0,0 +1,153 @@
+# resilient_http.py - timeouts, jittered retries and per-host circuit breakers for upstream sources
+import random
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+TIMEOUT = (5.0, 30.0)  # (connect, read) seconds; no upstream call may hang a phase
+RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BREAKER_FAILURES = 3  # consecutive failed calls before a host is skipped
+BREAKER_COOLDOWN = 120.0  # seconds before one probe call is let through
+
+_session = requests.Session()
+
+
+class SourceUnavailable(requests.ConnectionError):
+    """Raised instead of calling a host whose circuit is open."""
+
+
+class CircuitBreaker:
+    """closed -> open after BREAKER_FAILURES failed calls -> half-open probe after the cooldown.
+
+    A call fails when retries run out on a network error or a retryable
+    status; any other answer, 4xx included, proves the host is up.
+    """
+
+    def __init__(self, host: str, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN) -> None:
+        self.host = host
+        self.threshold = failures
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.stats = {"calls": 0, "retries": 0, "failed": 0, "skipped": 0, "opened": 0}
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.cooldown:
+                self.stats["skipped"] += 1
+                return False
+            self.state = "half-open"
+        return True
+
+    def success(self) -> None:
+        self.failures = 0
+        self.state = "closed"
+
+    def failure(self) -> None:
+        self.failures += 1
+        self.stats["failed"] += 1
+        if self.state == "half-open" or self.failures >= self.threshold:
+            if self.state != "open":
+                self.stats["opened"] += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def breaker(url: str) -> CircuitBreaker:
+    host = urlsplit(url).netloc
+    if host not in _breakers:
+        _breakers[host] = CircuitBreaker(host)
+    return _breakers[host]
+
+
+def _backoff(attempt: int, response: Optional[requests.Response]) -> float:
+    """Full jitter, at least Retry-After when the server sends one."""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    if response is not None:
+        try:
+            delay = max(delay, float(response.headers.get("Retry-After", 0)))
+        except ValueError:
+            pass
+    return min(delay, BACKOFF_CAP)
+
+
+def request(
+    method: str,
+    url: str,
+    session: Optional[requests.Session] = None,
+    retries: int = RETRIES,
+    idempotent: Optional[bool] = None,
+    **kwargs: Any,
+) -> requests.Response:
+    """requests.request with a default timeout, retries and the host's breaker.
+
+    Only GET/HEAD are retried unless the caller marks the call idempotent
+    (search APIs that take their query as a POST body). The last response
+    is returned even when its status is still an error, so callers keep
+    their own status handling.
+    """
+    kwargs.setdefault("timeout", TIMEOUT)
+    if idempotent is None:
+        idempotent = method.upper() in ("GET", "HEAD")
+    attempts = 1 + (retries if idempotent else 0)
+    cb = breaker(url)
+    if not cb.allow():
+        raise SourceUnavailable(f"{cb.host} skipped: circuit open after {cb.failures} failed calls")
+
+    cb.stats["calls"] += 1
+    session = session or _session
+    attempt = 0
+    while True:
+        response = None
+        last = attempt == attempts - 1
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if last:
+                cb.failure()
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                cb.success()
+                return response
+            if last:
+                cb.failure()
+                return response
+        cb.stats["retries"] += 1
+        time.sleep(_backoff(attempt, response))
+        attempt += 1
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def report() -> List[Dict[str, Any]]:
+    """One row per host contacted in this process: breaker state and counters."""
+    return [{"host": cb.host, "state": cb.state, **cb.stats} for cb in _breakers.values()]
+
+
+def print_report() -> None:
+    rows = report()
+    if not rows:
+        return
+    print("\n🌐 Upstream sources")
+    for row in rows:
+        icon = "✅" if row["state"] == "closed" else "⛔"
+        print(
+            f"   {icon} {row['host']:<28} {row['state']:<9} "
+            f"{row['calls']} calls, {row['retries']} retries, {row['failed']} failed, {row['skipped']} skipped, opened {row['opened']}x"
+        )
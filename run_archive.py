@@ -0,0 +1,418 @@
+# run_archive.py - append-only gzip JSONL archive of every run's records, indexed for replay and diffs
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from records import IntelItem, Record, TalentRecord
+
+ARCHIVE_DIR = Path(os.getenv("NATILUS_ARCHIVE_DIR", Path("data") / "archive"))
+BLOCK_RECORDS = 500  # records per gzip member: the unit of random access
+
+# results key -> record type; anything else is a competitor_news/moves item
+TALENT_SOURCES = {"layoffs", "github_talent"}
+
+# Fields that say nothing about the item itself, left out of its content digest
+VOLATILE_FIELDS = {"id", "created_at", "source_count", "description"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT,
+    finished_at TEXT,
+    segment TEXT,
+    records INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT,
+    source TEXT,
+    dest TEXT,
+    segment TEXT,
+    offset INTEGER,
+    length INTEGER,
+    count INTEGER,
+    day_min TEXT,
+    day_max TEXT
+);
+CREATE INDEX IF NOT EXISTS blocks_run ON blocks (run_id, source);
+CREATE INDEX IF NOT EXISTS blocks_day ON blocks (day_min, day_max);
+CREATE TABLE IF NOT EXISTS items (
+    run_id TEXT,
+    source TEXT,
+    key TEXT,
+    digest TEXT,
+    block INTEGER,
+    line INTEGER,
+    PRIMARY KEY (run_id, source, key)
+) WITHOUT ROWID;
+"""
+
+
+def record_type(source: str) -> type:
+    return TalentRecord if source in TALENT_SOURCES else IntelItem
+
+
+def identity(source: str, record: Dict[str, Any]) -> str:
+    """What makes two runs' records the same item, independent of derived fields."""
+    if source in TALENT_SOURCES:
+        parts = [record.get("github_login") or record.get("linkedin_url") or record.get("name"), record.get("current_company")]
+    else:
+        parts = [record.get("company"), record.get("news_type"), record.get("details"), record.get("date_detected")]
+    text = "|".join(str(p or "").strip().lower() for p in parts)
+    return hashlib.sha1(f"{source}|{text}".encode()).hexdigest()[:16]
+
+
+def content_digest(record: Dict[str, Any]) -> str:
+    stable = {k: v for k, v in record.items() if k not in VOLATILE_FIELDS and v is not None}
+    return hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _day(record: Dict[str, Any]) -> Optional[str]:
+    value = record.get("date_detected") or record.get("layoff_date")
+    return str(value)[:10] if value else None
+
+
+def _connect(root: Path) -> sqlite3.Connection:
+    root.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(root / "index.db")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class RunArchive:
+    """Writer for one run: records go to data/archive/<run_id>.jsonl.gz.
+
+    Each source's records are cut into blocks of BLOCK_RECORDS lines, each
+    block its own gzip member, so the segment still reads as one gzip file
+    while any block can be decompressed on its own from (offset, length).
+    The index keeps per block its run, source and day range, and per item
+    an identity key and content digest, so diffs compare index rows and
+    only decompress the blocks that hold the items they report.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, root: Path = ARCHIVE_DIR) -> None:
+        self.run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self.root = root
+        self.conn = _connect(root)
+        self.segment = f"{self.run_id}.jsonl.gz"
+        self.file = open(root / self.segment, "ab")
+        self.pending: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = defaultdict(list)
+        self.count = 0
+        self.conn.execute(
+            "INSERT OR REPLACE INTO runs (run_id, started_at, segment) VALUES (?, ?, ?)",
+            (self.run_id, datetime.now(timezone.utc).isoformat(), self.segment),
+        )
+
+    def __enter__(self) -> "RunArchive":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def add(self, source: str, record: Dict[str, Any], dest: Optional[str] = None) -> None:
+        """Archive a record as the tracker emitted it (in-memory fields included); dest is its table."""
+        rows = self.pending[(source, dest)]
+        rows.append(dict(record))
+        if len(rows) >= BLOCK_RECORDS:
+            self._flush((source, dest))
+
+    def _flush(self, group: Tuple[str, Optional[str]]) -> None:
+        source, dest = group
+        rows = self.pending.pop(group, [])
+        if not rows:
+            return
+        data = gzip.compress(
+            "".join(json.dumps(r, default=str, separators=(",", ":")) + "\n" for r in rows).encode()
+        )
+        offset = self.file.tell()
+        self.file.write(data)
+        days = [d for d in map(_day, rows) if d]
+        block = self.conn.execute(
+            "INSERT INTO blocks (run_id, source, dest, segment, offset, length, count, day_min, day_max) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.run_id, source, dest, self.segment, offset, len(data), len(rows), min(days, default=None), max(days, default=None)),
+        ).lastrowid
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?)",
+            [(self.run_id, source, identity(source, r), content_digest(r), block, line) for line, r in enumerate(rows)],
+        )
+        self.count += len(rows)
+
+    def close(self) -> None:
+        for group in list(self.pending):
+            self._flush(group)
+        self.file.close()
+        self.conn.execute(
+            "UPDATE runs SET finished_at = ?, records = ? WHERE run_id = ?",
+            (datetime.now(timezone.utc).isoformat(), self.count, self.run_id),
+        )
+        self.conn.commit()
+        self.conn.close()
+
+
+class ArchiveReader:
+    def __init__(self, root: Path = ARCHIVE_DIR) -> None:
+        self.root = root
+        self.conn = _connect(root)
+
+    def runs(self) -> List[Tuple[str, str, int]]:
+        return self.conn.execute("SELECT run_id, started_at, records FROM runs ORDER BY run_id").fetchall()
+
+    def latest_runs(self, n: int = 2) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT run_id FROM runs WHERE finished_at IS NOT NULL ORDER BY run_id DESC LIMIT ?", (n,)
+        ).fetchall()
+        return [r[0] for r in reversed(rows)]
+
+    def read_block(self, block_id: int) -> List[Dict[str, Any]]:
+        """Decompress one block - a seek and a single gzip member, not the segment."""
+        segment, offset, length = self.conn.execute(
+            "SELECT segment, offset, length FROM blocks WHERE id = ?", (block_id,)
+        ).fetchone()
+        with open(self.root / segment, "rb") as fh:
+            fh.seek(offset)
+            data = gzip.decompress(fh.read(length))
+        return [json.loads(line) for line in data.splitlines()]
+
+    def replay(
+        self,
+        run_id: Optional[str] = None,
+        sources: Sequence[str] = (),
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Iterator[Tuple[str, Optional[str], Record]]:
+        """Stream (source, table, record) back as IntelItem/TalentRecord, block by block.
+
+        Filters pick blocks from the index (run, source, day range); rows
+        inside a picked block are checked against the day range again.
+        """
+        query = "SELECT id, source, dest FROM blocks WHERE 1=1"
+        args: List[Any] = []
+        if run_id:
+            query += " AND run_id = ?"
+            args.append(run_id)
+        if sources:
+            query += f" AND source IN ({','.join('?' * len(sources))})"
+            args.extend(sources)
+        if since:
+            query += " AND (day_max IS NULL OR day_max >= ?)"
+            args.append(since)
+        if until:
+            query += " AND (day_min IS NULL OR day_min <= ?)"
+            args.append(until)
+        for block_id, source, dest in self.conn.execute(query + " ORDER BY id", args).fetchall():
+            kind = record_type(source)
+            for row in self.read_block(block_id):
+                day = _day(row)
+                if day and ((since and day < since) or (until and day > until)):
+                    continue
+                yield source, dest, kind.from_dict(row)
+
+    def diff(self, old_run: str, new_run: str, sources: Sequence[str] = ()) -> Dict[str, List[Tuple[str, Dict[str, Any]]]]:
+        """New, changed and disappeared items between two runs.
+
+        The comparison runs on the index (key, digest); only the blocks
+        holding reported items are decompressed to show them. Only sources
+        both runs executed are compared, so a run limited with --only does
+        not show every other source as appeared or gone.
+        """
+        ran = [
+            {s for (s,) in self.conn.execute("SELECT DISTINCT source FROM blocks WHERE run_id = ?", (run,))}
+            for run in (old_run, new_run)
+        ]
+        shared = sorted((ran[0] & ran[1]) & set(sources or ran[0]))
+        source_filter = f" AND a.source IN ({','.join('?' * len(shared))})"
+        sources = shared
+        located: Dict[str, List[Tuple[int, int, str]]] = {}
+        for kind, sql, run_pair in (
+            ("new", "SELECT a.source, a.block, a.line FROM items a LEFT JOIN items b ON b.run_id = ? AND b.source = a.source AND b.key = a.key WHERE a.run_id = ? AND b.key IS NULL", (old_run, new_run)),
+            ("gone", "SELECT a.source, a.block, a.line FROM items a LEFT JOIN items b ON b.run_id = ? AND b.source = a.source AND b.key = a.key WHERE a.run_id = ? AND b.key IS NULL", (new_run, old_run)),
+            ("changed", "SELECT a.source, a.block, a.line FROM items a JOIN items b ON b.run_id = ? AND b.source = a.source AND b.key = a.key WHERE a.run_id = ? AND b.digest != a.digest", (old_run, new_run)),
+        ):
+            rows = self.conn.execute(sql + source_filter, (*run_pair, *sources)).fetchall()
+            located[kind] = [(block, line, source) for source, block, line in rows]
+
+        cache: Dict[int, List[Dict[str, Any]]] = {}
+        out: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for kind, places in located.items():
+            out[kind] = []
+            for block, line, source in sorted(places):
+                if block not in cache:
+                    cache[block] = self.read_block(block)
+                out[kind].append((source, cache[block][line]))
+        return out
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _label(record: Dict[str, Any]) -> str:
+    if record.get("details"):
+        return f"{record.get('company')}: {record['details'][:90]} [{record.get('impact_on_natilus') or ''}]"
+    return f"{record.get('name')} @ {record.get('current_company') or '?'} (score {record.get('priority_score')})"
+
+
+def reprocess(records: List[Record], source: str) -> int:
+    """Re-run scoring (talent) or classification (intel) in place; how many results changed."""
+    if record_type(source) is TalentRecord:
+        from talent_scoring import score_rows
+
+        before = [r.priority_score for r in records]
+        score_rows(records)
+        return sum(b != r.priority_score for b, r in zip(before, records))
+
+    from impact_rules import classifier, impact_text
+
+    impacts = classifier().classify_batch([
+        {"text": r.details, "entity": r.company, "news_type": r.news_type, "source": r.source or ""}
+        for r in records
+    ])
+    changed = 0
+    for record, impact in zip(records, impacts):
+        detail = record.impact_on_natilus.split(" - ", 1)[1] if " - " in (record.impact_on_natilus or "") else ""
+        text = impact_text(impact, detail)
+        changed += text != record.impact_on_natilus
+        record.impact, record.impact_on_natilus = impact, text
+    return changed
+
+
+def replay_sink(db: Any) -> Callable[[str, List[Record]], None]:
+    """BatchWriter sink that updates stored rows with replayed results.
+
+    Intel rows matching on (company, news_type, details) get their
+    impact_on_natilus patched and talent matched by the resolver gets its
+    priority_score; only records with no stored row are inserted.
+    """
+    from records import IntelBatch
+    from simple_db import in_filter
+    from talent_resolution import match_existing
+
+    def patch(table: str, column: str, changes: List[Tuple[Any, Any]]) -> None:
+        by_value: Dict[Any, List[Any]] = defaultdict(list)
+        for row_id, value in changes:
+            by_value[value].append(row_id)
+        for value, ids in by_value.items():
+            for start in range(0, len(ids), 200):
+                db.update_rows(table, {"id": in_filter(ids[start:start + 200])}, {column: value})
+
+    def write(table: str, records: List[Record]) -> None:
+        if table == "aerospace_talent":
+            fresh, matches = match_existing(db, records)
+            patch(table, "priority_score", [
+                (existing["id"], incoming["priority_score"])
+                for existing, incoming in matches
+                if incoming.get("priority_score") is not None and existing.get("priority_score") != incoming["priority_score"]
+            ])
+            if fresh:
+                db.insert_talent(fresh, dedupe=False)
+            return
+
+        stored: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        details = sorted({r.details for r in records if r.details})
+        for start in range(0, len(details), 25):
+            for row in db.fetch_all(
+                table,
+                select="id,company,news_type,details,impact_on_natilus",
+                params={"details": in_filter(details[start:start + 25])},
+            ):
+                stored.setdefault((row.get("company"), row.get("news_type"), row.get("details")), row)
+        changes, fresh = [], []
+        for record in records:
+            row = stored.get((record.company, record.news_type, record.details))
+            if row is None:
+                fresh.append(record)
+            elif row.get("impact_on_natilus") != record.impact_on_natilus:
+                changes.append((row["id"], record.impact_on_natilus))
+        patch(table, "impact_on_natilus", changes)
+        if fresh:
+            db.insert_rows(table, IntelBatch.from_records(fresh).to_payload(), returning=False)
+
+    return write
+
+
+def replay_into(
+    reader: ArchiveReader,
+    run_id: Optional[str] = None,
+    sources: Sequence[str] = (),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    writer: Any = None,
+) -> Dict[str, int]:
+    """Replay archived records through the current classifier/scorer, block-sized batches at a time.
+
+    With a BatchWriter (over replay_sink) the stored rows are updated with
+    the new results rather than inserted again.
+    """
+    pending: Dict[Tuple[str, Optional[str]], List[Record]] = defaultdict(list)
+    stats = {"records": 0, "changed": 0}
+
+    def process(group: Tuple[str, Optional[str]]) -> None:
+        source, dest = group
+        records = pending.pop(group)
+        stats["changed"] += reprocess(records, source)
+        if writer is not None and dest:
+            writer.feed(source, dest, records)
+
+    for source, dest, record in reader.replay(run_id, sources, since, until):
+        pending[(source, dest)].append(record)
+        stats["records"] += 1
+        if len(pending[(source, dest)]) >= BLOCK_RECORDS:
+            process((source, dest))
+    for group in list(pending):
+        process(group)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archived pipeline runs: list, diff, replay")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("runs", help="list archived runs")
+    diff_cmd = sub.add_parser("diff", help="new / changed / disappeared items between two runs (default: last two)")
+    diff_cmd.add_argument("old", nargs="?")
+    diff_cmd.add_argument("new", nargs="?")
+    diff_cmd.add_argument("--source", action="append", help="results key, e.g. news (repeatable)")
+    diff_cmd.add_argument("--show", type=int, default=10, help="items listed per category")
+    replay_cmd = sub.add_parser("replay", help="re-run classifier/scorer over archived records")
+    replay_cmd.add_argument("--run", help="run id (default: every run)")
+    replay_cmd.add_argument("--source", action="append")
+    replay_cmd.add_argument("--since", help="YYYY-MM-DD")
+    replay_cmd.add_argument("--until", help="YYYY-MM-DD")
+    replay_cmd.add_argument("--write", action="store_true", help="update stored rows with the new results")
+    args = parser.parse_args()
+
+    reader = ArchiveReader()
+    if args.command == "runs":
+        for run_id, started_at, records in reader.runs():
+            print(f"🗄️ {run_id}  {records or 0:>7} records  started {started_at}")
+    elif args.command == "diff":
+        old, new = args.old, args.new
+        if not (old and new):
+            latest = reader.latest_runs(2)
+            if len(latest) < 2:
+                parser.error("need two archived runs to diff")
+            old, new = latest
+        result = reader.diff(old, new, args.source or ())
+        print(f"🔍 {old} -> {new}")
+        for kind, icon in (("new", "🆕"), ("changed", "✏️"), ("gone", "🗑️")):
+            items = result[kind]
+            print(f"\n{icon} {kind}: {len(items)}")
+            for source, record in items[:args.show]:
+                print(f"   [{source}] {_label(record)}")
+    else:
+        writer = None
+        if args.write:
+            from batch_writer import BatchWriter
+            from simple_db import SimpleSupabase
+
+            writer = BatchWriter(replay_sink(SimpleSupabase()))
+        stats = replay_into(reader, args.run, args.source or (), args.since, args.until, writer)
+        if writer is not None:
+            writer.close()
+        print(f"🔁 Replayed {stats['records']} records: {stats['changed']} classified/scored differently now")
+    reader.close()
@@ -0,0 +1,257 @@
+# search_index.py - local SQLite FTS5 mirror of talent + competitor intelligence
+import html
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from simple_db import SimpleSupabase
+
+SEARCH_DB_PATH = Path(os.getenv("NATILUS_SEARCH_DB", Path("data") / "search.db"))
+REBUILD_SECONDS = 24 * 3600  # full re-index, picking up rows patched in place
+
+# kind -> (table, code, select, how a row maps onto title/body/company/date)
+SOURCES = {
+    "talent": {
+        "table": "aerospace_talent",
+        "code": 1,
+        "select": "id,name,title,current_company,previous_company,location,skills,notes",
+        "title": ("name", "title"),
+        "body": ("skills", "notes", "location", "previous_company"),
+        "company": "current_company",
+        "date": None,
+    },
+    "news": {
+        "table": "competitor_news",
+        "code": 2,
+        "select": "id,company,news_type,details,impact_on_natilus,date_detected",
+        "title": ("news_type",),
+        "body": ("details", "impact_on_natilus"),
+        "company": "company",
+        "date": "date_detected",
+    },
+    "moves": {
+        "table": "competitor_moves",
+        "code": 3,
+        "select": "id,company,news_type,details,impact_on_natilus,date_detected",
+        "title": ("news_type",),
+        "body": ("details", "impact_on_natilus"),
+        "company": "company",
+        "date": "date_detected",
+    },
+}
+
+# highlight() markers; swapped for <mark> after HTML-escaping the stored text
+_OPEN, _CLOSE = "\x02", "\x03"
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS intel_fts USING fts5(
+    title, body, company,
+    kind UNINDEXED, row_id UNINDEXED, date UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    source TEXT PRIMARY KEY,
+    last_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS build_state (
+    source TEXT PRIMARY KEY,
+    built_at REAL
+);
+"""
+
+# bm25 column weights: title, body, company
+BM25 = "bm25(intel_fts, 4.0, 1.0, 2.0)"
+
+
+def _join(row: Dict[str, Any], cols: Iterable[str]) -> str:
+    return " · ".join(str(row[c]) for c in cols if row.get(c))
+
+
+def _marked_html(text: str) -> str:
+    return html.escape(text or "").replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+
+def to_match_query(text: str) -> Optional[str]:
+    """User text -> FTS5 MATCH expression: every word, last one as a prefix."""
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words[:-1]] + [f'"{words[-1]}"*']
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """Keyword search over aerospace_talent, competitor_news and competitor_moves.
+
+    Rows land in one FTS5 table keyed by rowid = source id * 4 + kind
+    code, so re-indexing a row is a single INSERT OR REPLACE. sync()
+    only pulls ids past each source's stored cursor; rows patched in
+    place keep their old text until the pipeline's daily rebuild().
+    """
+
+    def __init__(self, path: Path = SEARCH_DB_PATH) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def last_id(self, kind: str) -> Optional[int]:
+        row = self.conn.execute("SELECT last_id FROM sync_state WHERE source = ?", (kind,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _records(kind: str, rows: Iterable[Dict[str, Any]]) -> List[tuple]:
+        spec = SOURCES[kind]
+        return [
+            (
+                row["id"] * 4 + spec["code"],
+                _join(row, spec["title"]),
+                _join(row, spec["body"]),
+                row.get(spec["company"]) or "",
+                kind,
+                row["id"],
+                str(row.get(spec["date"]) or "") if spec["date"] else "",
+            )
+            for row in rows
+            if row.get("id") is not None
+        ]
+
+    def _insert(self, records: List[tuple]) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO intel_fts(rowid, title, body, company, kind, row_id, date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            records,
+        )
+
+    def index_rows(self, kind: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """Insert or refresh rows of one source (must carry their database id)."""
+        records = self._records(kind, rows)
+        if not records:
+            return 0
+        top = max(r[5] for r in records)
+        with self._lock, self.conn:
+            self._insert(records)
+            self.conn.execute(
+                "INSERT INTO sync_state(source, last_id) VALUES (?, ?) "
+                "ON CONFLICT(source) DO UPDATE SET last_id = MAX(last_id, excluded.last_id)",
+                (kind, top),
+            )
+        return len(records)
+
+    def remove(self, kind: str, ids: Iterable[int]) -> int:
+        """Drop rows deleted from the source table (archived or merged away)."""
+        code = SOURCES[kind]["code"]
+        with self._lock, self.conn:
+            cur = self.conn.executemany(
+                "DELETE FROM intel_fts WHERE rowid = ?", [(int(i) * 4 + code,) for i in ids]
+            )
+        return cur.rowcount
+
+    def due(self, kind: str) -> bool:
+        """Whether a source's rows were last fully re-indexed over REBUILD_SECONDS ago."""
+        row = self.conn.execute("SELECT built_at FROM build_state WHERE source = ?", (kind,)).fetchone()
+        return row is None or time.time() - row[0] >= REBUILD_SECONDS
+
+    def rebuild(self, db: SimpleSupabase, kind: str) -> int:
+        """Re-index every row of one source, dropping rows the table no longer has.
+
+        The swap is one transaction, so searches see the old or the new
+        index, never a half-built one.
+        """
+        spec = SOURCES[kind]
+        records = self._records(kind, db.fetch_all(spec["table"], select=spec["select"], params={"order": "id.asc"}))
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM intel_fts WHERE kind = ?", (kind,))
+            self._insert(records)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state(source, last_id) VALUES (?, ?)",
+                (kind, max((r[5] for r in records), default=None)),
+            )
+            self.conn.execute("INSERT OR REPLACE INTO build_state(source, built_at) VALUES (?, ?)", (kind, time.time()))
+        return len(records)
+
+    def sync(self, db: SimpleSupabase) -> Dict[str, int]:
+        """Pull rows newer than each source's cursor from Supabase."""
+        added = {}
+        for kind, spec in SOURCES.items():
+            params = {"order": "id.asc"}
+            last = self.last_id(kind)
+            if last is not None:
+                params["id"] = f"gt.{last}"
+            try:
+                rows = db.fetch_all(spec["table"], select=spec["select"], params=params)
+            except Exception as e:
+                print(f"⚠️ Search sync skipped {spec['table']}: {e}")
+                rows = []
+            added[kind] = self.index_rows(kind, rows)
+        return added
+
+    def search(
+        self, text: str, kinds: Optional[Iterable[str]] = None, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Ranked matches; title and snippet come back HTML-escaped with <mark> hits."""
+        match = to_match_query(text)
+        if not match:
+            return []
+        sql = (
+            "SELECT kind, row_id, company, date, "
+            "highlight(intel_fts, 0, ?, ?), "
+            "snippet(intel_fts, 1, ?, ?, ' … ', 16), "
+            f"{BM25} AS rank "
+            "FROM intel_fts WHERE intel_fts MATCH ?"
+        )
+        params: List[Any] = [_OPEN, _CLOSE, _OPEN, _CLOSE, match]
+        kinds = [k for k in (kinds or []) if k in SOURCES]
+        if kinds:
+            sql += f" AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            try:
+                cur = self.conn.execute(sql, params)
+            except sqlite3.OperationalError:
+                return []
+            rows = cur.fetchall()
+        return [
+            {
+                "kind": kind,
+                "id": row_id,
+                "company": company,
+                "date": date,
+                "title": _marked_html(title),
+                "snippet": _marked_html(snippet),
+                "score": -rank,
+            }
+            for kind, row_id, company, date, title, snippet, rank in rows
+        ]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self.conn.execute("SELECT kind, count(*) FROM intel_fts GROUP BY kind").fetchall()
+        return dict(rows)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    index = SearchIndex()
+    added = index.sync(SimpleSupabase())
+    print(f"🔎 Synced {added} -> {index.counts()}")
+    if len(sys.argv) > 1:
+        query = " ".join(sys.argv[1:])
+        started = time.perf_counter()
+        hits = index.search(query)
+        print(f"'{query}': {len(hits)} hits in {(time.perf_counter() - started) * 1000:.1f} ms")
+        for hit in hits:
+            print(f"  [{hit['kind']}] {hit['title']} - {hit['snippet']}")
@@ -2,15 +2,23 @@
 
 import os
 import json
-from typing import Any, Dict, List, Union
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import requests
 from dotenv import load_dotenv
 
-try:
-    import streamlit as st  # type: ignore
-except ImportError:
-    st = None
+from records import IntelBatch, TalentBatch, TalentRecord
+from talent_resolution import fill_patch, match_existing
+
+def quote(value: Any) -> str:
+    """Double-quote a value for a PostgREST list (in.(...), or=(...)): commas, dots, quotes safe."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def in_filter(values: Iterable[Any]) -> str:
+    """PostgREST in.(...) operand with every value double-quoted."""
+    return f"in.({','.join(quote(v) for v in values)})"
 
 
 class SimpleSupabase:
@@ -21,9 +29,11 @@ class SimpleSupabase:
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
 
-        # Fallback to st.secrets when running on Streamlit Cloud
-        if (not url or not key) and st is not None:
+        # Fallback to st.secrets when running on Streamlit Cloud (imported
+        # only then - streamlit is heavy and CLI runs never need it)
+        if not url or not key:
             try:
+                import streamlit as st  # type: ignore
                 secrets = st.secrets
                 url = url or secrets.get("SUPABASE_URL")
                 key = key or secrets.get("SUPABASE_KEY")
@@ -49,12 +59,18 @@ class SimpleSupabase:
     # ---------- Generic helpers ----------
 
     def insert_rows(
-        self, table: str, rows: List[Dict[str, Any]]
+        self, table: str, rows: List[Dict[str, Any]], returning: bool = True
     ) -> List[Dict[str, Any]]:
-        """Low-level insert with basic error handling."""
+        """Low-level insert with basic error handling.
+
+        returning=False skips sending the inserted rows back (bulk loads).
+        """
+        headers = self.headers
+        if not returning:
+            headers = dict(self.headers, Prefer="return=minimal")
         resp = requests.post(
             f"{self.url}/rest/v1/{table}",
-            headers=self.headers,
+            headers=headers,
             data=json.dumps(rows),
         )
         if not resp.ok:
@@ -82,40 +98,154 @@ class SimpleSupabase:
         except Exception:
             return []
 
+    def select_rows(
+        self,
+        table: str,
+        params: Dict[str, str],
+        count: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Filtered/ordered/paged select using raw PostgREST query params.
+
+        Returns (rows, total). total is only filled in when count=True,
+        taken from the Content-Range header PostgREST sends back.
+        """
+        headers = dict(self.headers)
+        if count:
+            headers["Prefer"] = "count=exact"
+        resp = requests.get(
+            f"{self.url}/rest/v1/{table}",
+            headers=headers,
+            params=params,
+        )
+        if not resp.ok:
+            raise RuntimeError(
+                f"Supabase select error {resp.status_code}: {resp.text}"
+            )
+        try:
+            rows = resp.json()
+        except Exception:
+            rows = []
+
+        total = None
+        if count:
+            # e.g. "0-24/3573" or "*/0" when the page is empty
+            content_range = resp.headers.get("Content-Range", "")
+            _, _, size = content_range.partition("/")
+            if size.isdigit():
+                total = int(size)
+        return rows, total
+
+    def fetch_all(
+        self,
+        table: str,
+        select: str = "*",
+        params: Optional[Dict[str, str]] = None,
+        page_size: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """Page through a whole table (or filtered slice) with select_rows."""
+        out: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            page_params = dict(params or {})
+            page_params.update(
+                {"select": select, "limit": str(page_size), "offset": str(offset)}
+            )
+            rows, _ = self.select_rows(table, page_params)
+            out.extend(rows)
+            if len(rows) < page_size:
+                return out
+            offset += page_size
+
+    def update_rows(
+        self, table: str, filters: Dict[str, str], values: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """PATCH rows matching PostgREST filters, e.g. {"id": "eq.42"}."""
+        resp = requests.patch(
+            f"{self.url}/rest/v1/{table}",
+            headers=self.headers,
+            params=filters,
+            data=json.dumps(values),
+        )
+        if not resp.ok:
+            raise RuntimeError(
+                f"Supabase update error {resp.status_code}: {resp.text}"
+            )
+        try:
+            return resp.json()
+        except Exception:
+            return []
+
+    def delete_rows(self, table: str, filters: Dict[str, str]) -> int:
+        """DELETE rows matching PostgREST filters. Refuses an unfiltered delete."""
+        if not filters:
+            raise ValueError("delete_rows needs at least one filter")
+        headers = dict(self.headers)
+        headers["Prefer"] = "return=minimal,count=exact"
+        resp = requests.delete(
+            f"{self.url}/rest/v1/{table}",
+            headers=headers,
+            params=filters,
+        )
+        if not resp.ok:
+            raise RuntimeError(
+                f"Supabase delete error {resp.status_code}: {resp.text}"
+            )
+        _, _, size = resp.headers.get("Content-Range", "").partition("/")
+        return int(size) if size.isdigit() else 0
+
+    def upsert_rows(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Insert, or update on conflict (primary key unless on_conflict names a unique column)."""
+        headers = dict(self.headers)
+        headers["Prefer"] = "resolution=merge-duplicates,return=representation"
+        resp = requests.post(
+            f"{self.url}/rest/v1/{table}",
+            headers=headers,
+            params={"on_conflict": on_conflict} if on_conflict else None,
+            data=json.dumps(rows),
+        )
+        if not resp.ok:
+            raise RuntimeError(
+                f"Supabase upsert error {resp.status_code}: {resp.text}"
+            )
+        try:
+            return resp.json()
+        except Exception:
+            return []
+
     # ---------- Domain-specific helpers ----------
 
     def insert_talent(
-        self, talent: Union[Dict[str, Any], List[Dict[str, Any]]]
+        self,
+        talent: Union[Dict[str, Any], List[Dict[str, Any]]],
+        dedupe: bool = True,
     ) -> List[Dict[str, Any]]:
-        """Insert into aerospace_talent. Only send columns that really exist."""
-        if isinstance(talent, dict):
+        """Insert into aerospace_talent. Only send columns that really exist.
+
+        With dedupe on, people already in the table are not inserted again;
+        whatever new fields they bring are patched onto the stored row.
+        """
+        if isinstance(talent, Mapping):
             rows = [talent]
         else:
             rows = talent
 
-        # These are safe, schema-based columns you actually have
-        allowed_cols = {
-            "name",
-            "current_company",
-            "previous_company",
-            "title",
-            "location",
-            "years_experience",
-            "linkedin_url",
-            "is_open_to_work",
-            "priority_score",
-            "skills",
-            "notes",
-            "risk_of_poaching",
-        }
-
-        cleaned: List[Dict[str, Any]] = []
-        for row in rows:
-            cleaned.append({k: v for k, v in row.items() if k in allowed_cols})
+        if dedupe and rows:
+            rows, matches = match_existing(self, rows)
+            for existing, incoming in matches:
+                patch = fill_patch(existing, incoming, TalentRecord.COLUMNS)
+                if patch:
+                    self.update_rows("aerospace_talent", {"id": f"eq.{existing['id']}"}, patch)
 
-        if not cleaned:
+        # TalentRecord.COLUMNS are the columns the table really has
+        batch = TalentBatch.from_records(rows)
+        if not len(batch):
             return []
-        return self.insert_rows("aerospace_talent", cleaned)
+        return self.insert_rows("aerospace_talent", batch.to_payload())
 
     def insert_competitor_news(
         self, news: Union[Dict[str, Any], List[Dict[str, Any]]]
@@ -123,26 +253,15 @@ class SimpleSupabase:
         """Insert into competitor_news, matching its actual schema:
            id, company, news_type, details, impact_on_natilus, date_detected
         """
-        if isinstance(news, dict):
+        if isinstance(news, Mapping):
             rows = [news]
         else:
             rows = news
 
-        allowed_cols = {
-            "company",
-            "news_type",
-            "details",
-            "impact_on_natilus",
-            "date_detected",
-        }
-
-        cleaned: List[Dict[str, Any]] = []
-        for row in rows:
-            cleaned.append({k: v for k, v in row.items() if k in allowed_cols})
-
-        if not cleaned:
+        batch = IntelBatch.from_records(rows)
+        if not len(batch):
             return []
-        return self.insert_rows("competitor_news", cleaned)
+        return self.insert_rows("competitor_news", batch.to_payload())
 
     def insert_supply_chain(
         self, items: Union[Dict[str, Any], List[Dict[str, Any]]]
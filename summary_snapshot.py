@@ -0,0 +1,172 @@
+# summary_snapshot.py - precomputed dashboard header numbers
+import json
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from impact_rules import impact_level
+from simple_db import SimpleSupabase
+
+SUMMARY_PATH = Path(os.getenv("NATILUS_SUMMARY_PATH", Path("data") / "dashboard_summary.json"))
+SUMMARY_TABLE = "dashboard_summary"
+SUMMARY_ROW_ID = 1
+
+# table -> (narrow column projection, column holding the company)
+SUMMARY_TABLES = {
+    "aerospace_talent": ("current_company,is_open_to_work", "current_company"),
+    "competitor_news": ("company,impact_on_natilus,date_detected", "company"),
+    "competitor_moves": ("company,impact_on_natilus,date_detected", "company"),
+    "supply_chain_risks": ("supplier,risk_level", "supplier"),
+}
+
+ACTIVITY_TABLES = ("competitor_news", "competitor_moves")
+
+
+def iso_week(value: Any) -> Optional[str]:
+    """'2024-11-20T08:00:00Z' -> '2024-W47'"""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    year, week, _ = dt.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _top(counter: Counter, n: int = 20) -> Dict[str, int]:
+    return dict(counter.most_common(n))
+
+
+def summarize_rows(
+    tables: Dict[str, Iterable[Dict[str, Any]]],
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Aggregate already-fetched rows into the snapshot dict."""
+    now = now or datetime.now(timezone.utc)
+    this_week = iso_week(now.isoformat())
+
+    table_counts: Dict[str, int] = {}
+    by_company: Dict[str, Dict[str, int]] = {}
+    by_impact: Counter = Counter()
+    by_week: Counter = Counter()
+    week_companies: Counter = Counter()
+    open_to_work = 0
+    critical_risks: Counter = Counter()
+
+    for table, rows in tables.items():
+        company_col = SUMMARY_TABLES.get(table, ("", "company"))[1]
+        companies: Counter = Counter()
+        n = 0
+        for row in rows:
+            n += 1
+            company = row.get(company_col) or "Unknown"
+            companies[company] += 1
+
+            if table == "aerospace_talent" and row.get("is_open_to_work"):
+                open_to_work += 1
+            elif table == "supply_chain_risks":
+                level = str(row.get("risk_level") or "").upper()
+                if level in ("HIGH", "CRITICAL"):
+                    critical_risks[company] += 1
+            elif table in ACTIVITY_TABLES:
+                by_impact[impact_level(row)] += 1
+                week = iso_week(row.get("date_detected"))
+                if week:
+                    by_week[week] += 1
+                    if week == this_week:
+                        week_companies[company] += 1
+
+        table_counts[table] = n
+        by_company[table] = _top(companies)
+
+    top_mover = week_companies.most_common(1)
+    top_risk = critical_risks.most_common(1)
+
+    return {
+        "generated_at": now.isoformat(),
+        "table_counts": table_counts,
+        "by_company": by_company,
+        "by_impact": dict(by_impact),
+        "by_week": dict(sorted(by_week.items())[-12:]),
+        "headline": {
+            "available_talent": open_to_work,
+            "competitor_moves_this_week": sum(week_companies.values()),
+            "top_mover_this_week": top_mover[0][0] if top_mover else None,
+            "supply_chain_critical": sum(critical_risks.values()),
+            "top_supply_chain_risk": top_risk[0][0] if top_risk else None,
+        },
+    }
+
+
+def compute_summary(db: SimpleSupabase) -> Dict[str, Any]:
+    """Pull narrow projections of each table once and aggregate them."""
+    tables = {}
+    for table, (columns, _) in SUMMARY_TABLES.items():
+        try:
+            tables[table] = db.fetch_all(table, select=columns)
+        except Exception as e:
+            print(f"⚠️ Summary skipped {table}: {e}")
+            tables[table] = []
+    return summarize_rows(tables)
+
+
+def load_summary(db: Optional[SimpleSupabase] = None) -> Optional[Dict[str, Any]]:
+    """Local file first, then the single dashboard_summary row."""
+    if SUMMARY_PATH.exists():
+        try:
+            return json.loads(SUMMARY_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+    if db is not None:
+        try:
+            rows, _ = db.select_rows(
+                SUMMARY_TABLE, {"select": "snapshot", "id": f"eq.{SUMMARY_ROW_ID}"}
+            )
+            if rows:
+                return rows[0].get("snapshot")
+        except Exception:
+            pass
+    return None
+
+
+def write_summary(
+    summary: Dict[str, Any], db: Optional[SimpleSupabase] = None
+) -> Dict[str, Any]:
+    """Persist the snapshot, carrying the previous headline along for deltas."""
+    previous = load_summary()
+    if previous:
+        summary["previous_headline"] = previous.get("headline", {})
+        summary["previous_generated_at"] = previous.get("generated_at")
+
+    SUMMARY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = SUMMARY_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(summary, indent=2, default=str), encoding="utf-8")
+    tmp.replace(SUMMARY_PATH)
+
+    if db is not None:
+        try:
+            db.upsert_rows(
+                SUMMARY_TABLE,
+                [{"id": SUMMARY_ROW_ID, "snapshot": summary, "generated_at": summary["generated_at"]}],
+            )
+        except Exception as e:
+            print(f"⚠️ Could not upsert {SUMMARY_TABLE}: {e}")
+    return summary
+
+
+def headline_delta(summary: Dict[str, Any], key: str) -> Optional[int]:
+    """Change in a headline number since the previous snapshot."""
+    previous = summary.get("previous_headline") or {}
+    if key not in previous:
+        return None
+    return (summary.get("headline", {}).get(key) or 0) - (previous.get(key) or 0)
+
+
+if __name__ == "__main__":
+    db = SimpleSupabase()
+    snapshot = write_summary(compute_summary(db), db)
+    print(json.dumps(snapshot["headline"], indent=2))
+    print(f"💾 Summary written to {SUMMARY_PATH}")
@@ -0,0 +1,300 @@
+# synthetic_data.py - seedable, vectorized synthetic rows for load-testing the stack
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from records import IntelItem, TalentRecord
+from talent_scoring import score_frame
+
+# Rows per dataset at --scale 1 (roughly today's volume); --scale 10 / 100 for load tests
+BASE_COUNTS = {"talent": 10_000, "news": 5_000, "patents": 1_000, "contracts": 1_000}
+
+# dataset -> table it bulk-loads into
+TABLES = {
+    "talent": "aerospace_talent",
+    "news": "competitor_news",
+    "patents": "competitor_moves",
+    "contracts": "competitor_moves",
+}
+
+# table -> columns bulk_load sends: the real schema plus a backdated created_at;
+# generator-only columns (source_tag) stay in the files
+LOAD_COLUMNS = {
+    "aerospace_talent": TalentRecord.COLUMNS + ("created_at",),
+    "competitor_news": IntelItem.COLUMNS + ("created_at",),
+    "competitor_moves": IntelItem.COLUMNS + ("created_at",),
+}
+
+CHUNK_ROWS = 250_000
+HISTORY_DAYS = 365
+
+FIRST_NAMES = np.array([
+    "James", "Maria", "Robert", "Jennifer", "Michael", "Linda", "David", "Patricia", "Richard",
+    "Barbara", "Wei", "Priya", "Carlos", "Aisha", "Ethan", "Sofia", "Daniel", "Mei", "Omar",
+    "Hannah", "Lucas", "Grace", "Mateo", "Chloe", "Arjun", "Nora", "Samuel", "Elena", "Kenji", "Zoe",
+])
+LAST_NAMES = np.array([
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+    "Martinez", "Chen", "Patel", "Nguyen", "Kim", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor",
+    "Moore", "Jackson", "Martin", "Lee", "Thompson", "White", "Harris", "Clark", "Lewis", "Young", "Singh",
+])
+
+# company -> (sampling weight, hub locations)
+COMPANIES = {
+    "Boeing": (0.30, ["Seattle, WA", "Everett, WA", "Renton, WA", "Charleston, SC"]),
+    "Spirit AeroSystems": (0.15, ["Wichita, KS"]),
+    "Textron": (0.08, ["Wichita, KS", "Fort Worth, TX"]),
+    "Lockheed Martin": (0.12, ["Fort Worth, TX", "Palmdale, CA"]),
+    "Northrop Grumman": (0.10, ["Los Angeles, CA", "San Diego, CA"]),
+    "Airbus": (0.07, ["Mobile, AL"]),
+    "JetZero": (0.04, ["Long Beach, CA"]),
+    "Joby Aviation": (0.05, ["San Jose, CA"]),
+    "Archer Aviation": (0.05, ["San Jose, CA"]),
+    "Beta Technologies": (0.04, ["Burlington, VT"]),
+}
+TITLES = np.array([
+    "Senior Composite Engineer", "Manufacturing Engineer", "Flight Test Engineer",
+    "Certification Specialist", "Aerodynamics Engineer", "Quality Engineer", "Structural Engineer",
+    "Systems Engineer", "Lead Avionics Engineer", "Principal Stress Engineer", "FAA DER",
+])
+SKILLS = np.array([
+    "Carbon fiber composites", "787 program", "Autoclave processing", "FAA Part 23/25",
+    "Certification", "Lean", "Six Sigma", "Flight testing", "Instrumentation", "CFD",
+    "Wind tunnel testing", "AS9100", "Root cause analysis", "Blended wing body", "Avionics",
+])
+
+COMPETITORS = np.array(["JetZero", "Boeing", "Archer Aviation", "Joby Aviation", "Spirit AeroSystems", "Airbus"])
+NEWS_TYPES = np.array(["News", "Funding", "Hiring", "Partnership", "Facility Expansion"])
+NEWS_VERBS = np.array([
+    "raises new funding for", "hires senior leadership for", "announces partnership on",
+    "opens facility for", "completes milestone on", "delays schedule for",
+])
+NEWS_OBJECTS = np.array([
+    "blended wing demonstrator", "cargo aircraft program", "eVTOL certification",
+    "composite production line", "autonomous flight tests", "Air Force contract bid",
+])
+OUTLETS = np.array(["Reuters", "Aviation Week", "Bloomberg", "PR Newswire", "FlightGlobal", "Yahoo Finance"])
+PATENT_TOPICS = np.array([
+    "Blended wing body fuselage", "Distributed propulsion nacelle", "Composite wing-body join",
+    "Cabin pressure vessel for BWB", "Fly-by-wire control law", "Landing gear integration",
+])
+CONTRACT_SCOPES = np.array([
+    "UAV airframe development", "Aircraft sustainment services", "BWB tanker risk reduction",
+    "Aerospace composite tooling", "Flight test support",
+])
+IMPACT_LEVELS = np.array(["HIGH", "MEDIUM", "LOW"])
+
+
+def _cat(*parts) -> pd.Series:
+    """Element-wise string concatenation of arrays, Series and scalars."""
+    out = None
+    for part in parts:
+        if not np.isscalar(part):
+            part = pd.Series(np.asarray(part)).astype(str)
+        out = part if out is None else out + part
+    return out
+
+
+def _timestamps(rng: np.random.Generator, n: int, now: datetime) -> pd.Series:
+    # recent activity is denser: exponential age, clipped to the history window
+    age = np.minimum(rng.exponential(HISTORY_DAYS / 4, n), HISTORY_DAYS) * 86400
+    return pd.Series(pd.to_datetime(now.timestamp() - age, unit="s", utc=True))
+
+
+def generate_talent(rng: np.random.Generator, n: int, start_id: int = 0, now: Optional[datetime] = None) -> pd.DataFrame:
+    now = now or datetime.now(timezone.utc)
+    names = list(COMPANIES)
+    weights = np.array([COMPANIES[c][0] for c in names])
+    company_idx = rng.choice(len(names), n, p=weights / weights.sum())
+    companies = np.array(names)[company_idx]
+
+    # location: one of the company's hubs, occasionally anywhere
+    hubs = [COMPANIES[c][1] for c in names]
+    width = max(len(h) for h in hubs)
+    hub_table = np.array([h + h[:1] * (width - len(h)) for h in hubs])
+    hub_counts = np.array([len(h) for h in hubs])
+    locations = hub_table[company_idx, rng.integers(0, 1 << 16, n) % hub_counts[company_idx]]
+    all_hubs = np.array(sorted({h for hs in hubs for h in hs}))
+    elsewhere = rng.random(n) < 0.1
+    locations[elsewhere] = rng.choice(all_hubs, int(elsewhere.sum()))
+
+    first = rng.choice(FIRST_NAMES, n)
+    last = rng.choice(LAST_NAMES, n)
+    ids = np.arange(start_id, start_id + n)
+    name = _cat(first, " ", last)
+    previous = np.where(rng.random(n) < 0.4, rng.choice(np.array(names), n), None)
+
+    skill_a = rng.choice(SKILLS, n)
+    skill_b = rng.choice(SKILLS, n)
+    skill_c = rng.choice(SKILLS, n)
+    n_skills = rng.integers(1, 4, n)
+    skills = _cat(
+        skill_a,
+        pd.Series(np.where(n_skills > 1, _cat(", ", skill_b), "")),
+        pd.Series(np.where(n_skills > 2, _cat(", ", skill_c), "")),
+    )
+
+    created = _timestamps(rng, n, now)
+    df = pd.DataFrame({
+        "name": name,
+        "current_company": companies,
+        "previous_company": previous,
+        "title": rng.choice(TITLES, n),
+        "location": locations,
+        "years_experience": np.clip(np.rint(rng.gamma(4.0, 3.0, n)), 1, 40).astype(int),
+        "skills": skills,
+        "is_open_to_work": rng.random(n) < 0.35,
+        "risk_of_poaching": rng.choice(IMPACT_LEVELS, n, p=[0.2, 0.5, 0.3]),
+        "linkedin_url": _cat("linkedin.com/in/", name.str.lower().str.replace(" ", "-"), "-", ids),
+        "notes": "synthetic",
+        "source_tag": "synthetic",
+        "created_at": created.dt.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+    })
+    df["priority_score"] = score_frame(df, now)
+    return df
+
+
+def generate_news(rng: np.random.Generator, n: int, start_id: int = 0, now: Optional[datetime] = None) -> pd.DataFrame:
+    now = now or datetime.now(timezone.utc)
+    company = rng.choice(COMPETITORS, n)
+    return pd.DataFrame({
+        "company": company,
+        "news_type": rng.choice(NEWS_TYPES, n),
+        "details": _cat(company, " ", rng.choice(NEWS_VERBS, n), " ", rng.choice(NEWS_OBJECTS, n)),
+        "impact_on_natilus": _cat(rng.choice(IMPACT_LEVELS, n, p=[0.3, 0.5, 0.2]), " - ", rng.choice(OUTLETS, n)),
+        "date_detected": _timestamps(rng, n, now).dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    })
+
+
+def generate_patents(rng: np.random.Generator, n: int, start_id: int = 0, now: Optional[datetime] = None) -> pd.DataFrame:
+    now = now or datetime.now(timezone.utc)
+    numbers = rng.integers(11_000_000, 12_999_999, n)
+    return pd.DataFrame({
+        "company": rng.choice(COMPETITORS, n),
+        "news_type": "Patent Filing",
+        "details": _cat("Patent: ", rng.choice(PATENT_TOPICS, n)),
+        "impact_on_natilus": _cat(rng.choice(IMPACT_LEVELS, n, p=[0.4, 0.5, 0.1]), " - US", numbers),
+        "date_detected": _timestamps(rng, n, now).dt.strftime("%Y-%m-%d"),
+    })
+
+
+def generate_contracts(rng: np.random.Generator, n: int, start_id: int = 0, now: Optional[datetime] = None) -> pd.DataFrame:
+    now = now or datetime.now(timezone.utc)
+    # award sizes are heavy-tailed: median ~$8M, occasional $500M+
+    amounts = np.clip(rng.lognormal(np.log(8e6), 1.3, n), 1e6, 999e6)
+    level = np.select([amounts >= 1e8, amounts >= 1e7], ["HIGH", "MEDIUM"], "LOW")
+    return pd.DataFrame({
+        "company": rng.choice(np.array(["JetZero", "Boeing", "Lockheed Martin", "Northrop Grumman"]), n),
+        "news_type": "Federal Contract",
+        "details": _cat("$", pd.Series(amounts).map("{:,.0f}".format), " - ", rng.choice(CONTRACT_SCOPES, n)),
+        "impact_on_natilus": _cat(level, " - Competitor funding"),
+        "date_detected": _timestamps(rng, n, now).dt.strftime("%Y-%m-%d"),
+    })
+
+
+GENERATORS: Dict[str, Callable[..., pd.DataFrame]] = {
+    "talent": generate_talent,
+    "news": generate_news,
+    "patents": generate_patents,
+    "contracts": generate_contracts,
+}
+
+
+def generate(dataset: str, rows: int, seed: int = 0, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Chunks of one dataset, each drawn from its own child of `seed`.
+
+    The same seed and chunk_rows always reproduce the same rows.
+    """
+    now = datetime.now(timezone.utc)
+    children = np.random.SeedSequence([seed, list(GENERATORS).index(dataset)]).spawn(-(-rows // chunk_rows) or 1)
+    for i, child in enumerate(children):
+        start = i * chunk_rows
+        n = min(chunk_rows, rows - start)
+        if n <= 0:
+            break
+        yield GENERATORS[dataset](np.random.default_rng(child), n, start_id=start, now=now)
+
+
+def write_chunks(chunks: Iterator[pd.DataFrame], path: Path, fmt: str) -> int:
+    """Stream chunks to CSV / JSONL (appended) or Parquet (one row group per chunk)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    total = 0
+    writer = None
+    try:
+        for i, df in enumerate(chunks):
+            if fmt == "csv":
+                df.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+            elif fmt == "jsonl":
+                with path.open("w" if i == 0 else "a", encoding="utf-8") as f:
+                    df.to_json(f, orient="records", lines=True)
+            elif fmt == "parquet":
+                try:
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+                except ImportError as e:
+                    raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)") from e
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            else:
+                raise ValueError(f"unknown format {fmt!r}")
+            total += len(df)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
+
+
+def bulk_load(db, table: str, chunks: Iterator[pd.DataFrame], batch: int = 1000) -> Dict[str, float]:
+    """Insert chunks in batches without reading rows back; returns write throughput."""
+    written = 0
+    started = time.perf_counter()
+    for df in chunks:
+        df = df[[c for c in LOAD_COLUMNS.get(table, df.columns) if c in df.columns]]
+        records = df.astype(object).where(df.notna(), None).to_dict("records")
+        for start in range(0, len(records), batch):
+            db.insert_rows(table, records[start:start + batch], returning=False)
+            written += len(records[start:start + batch])
+    elapsed = time.perf_counter() - started
+    return {"rows": written, "seconds": elapsed, "rows_per_second": written / elapsed if elapsed else 0.0}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic Natilus intelligence data")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiple of today's volume (10, 100, ...)")
+    parser.add_argument("--datasets", default=",".join(GENERATORS), help="comma-separated subset of %(default)s")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], default="csv")
+    parser.add_argument("--out", type=Path, default=Path("data") / "synthetic")
+    parser.add_argument("--load", action="store_true", help="bulk-insert instead of writing files")
+    parser.add_argument("--url", help="PostgREST stand-in serving /rest/v1 (overrides SUPABASE_URL)")
+    parser.add_argument("--key", help="API key for --url (overrides SUPABASE_KEY)")
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.url:
+        os.environ["SUPABASE_URL"] = args.url
+        os.environ["SUPABASE_KEY"] = args.key or os.getenv("SUPABASE_KEY") or "local"
+    db = None
+    if args.load:
+        from simple_db import SimpleSupabase
+        db = SimpleSupabase()
+
+    for dataset in args.datasets.split(","):
+        rows = int(BASE_COUNTS[dataset] * args.scale)
+        started = time.perf_counter()
+        chunks = generate(dataset, rows, seed=args.seed)
+        if db is not None:
+            stats = bulk_load(db, TABLES[dataset], chunks, batch=args.batch)
+            print(f"🚚 {dataset}: {stats['rows']:,} rows -> {TABLES[dataset]} at {stats['rows_per_second']:,.0f} rows/s")
+        else:
+            path = args.out / f"{dataset}.{args.format}"
+            written = write_chunks(chunks, path, args.format)
+            print(f"🧪 {dataset}: {written:,} rows -> {path} in {time.perf_counter() - started:.1f}s")
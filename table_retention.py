@@ -0,0 +1,278 @@
+# table_retention.py - age out and de-duplicate the growing intelligence tables into local archives
+import argparse
+import gzip
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from news_dedupe import normalize
+from run_archive import ARCHIVE_DIR
+from simple_db import SimpleSupabase
+from talent_resolution import compact_table
+
+RETENTION_DIR = ARCHIVE_DIR / "retention"
+ID_CHUNK = 200  # ids per in.(...) filter, keeps request URLs short
+
+# table -> policy. Rows whose date column is older than `days` (created_at
+# when it is empty) and that match every `only` filter are archived and
+# deleted; `dedupe` names how duplicates are found. Rollups are
+# incremental by id, so rows removed here stay counted in them; the local
+# search, match and talent-flow indexes are pruned (see ReadModels).
+RETENTION_POLICIES: Dict[str, Dict[str, Any]] = {
+    "competitor_news": {"days": 180, "date": "date_detected", "dedupe": "story"},
+    "competitor_moves": {"days": 730, "date": "date_detected", "dedupe": "story"},
+    "aerospace_talent": {
+        "days": 730,
+        "date": "created_at",
+        "dedupe": "person",
+        # people stay while they are open to work or worth approaching
+        "only": {"or": "(priority_score.lt.40,priority_score.is.null)", "is_open_to_work": "not.is.true"},
+    },
+}
+
+STORY_COLUMNS = "id,company,news_type,details,date_detected"
+
+
+def row_count(db: SimpleSupabase, table: str) -> int:
+    _, total = db.select_rows(table, {"select": "id", "limit": "1"}, count=True)
+    return total or 0
+
+
+def story_key(row: Dict[str, Any]) -> tuple:
+    """Same company, type, day and (normalised) text: one story stored twice."""
+    return (
+        str(row.get("company") or "").strip().lower(),
+        row.get("news_type"),
+        normalize(row.get("details") or ""),
+        str(row.get("date_detected") or "")[:10],
+    )
+
+
+def _chunks(ids: Sequence[Any], size: int = ID_CHUNK):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+class TableArchive:
+    """Append-only gzip JSONL file of the rows removed from one table in one job.
+
+    Each chunk is its own gzip member, flushed and fsynced before the rows
+    are deleted, so a row is never gone from the table without being on disk.
+    """
+
+    def __init__(self, table: str, stamp: str, root: Path = RETENTION_DIR) -> None:
+        self.path = root / f"{table}-{stamp}.jsonl.gz"
+        self.rows = 0
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = gzip.compress("".join(json.dumps(r, default=str) + "\n" for r in rows).encode())
+        with open(self.path, "ab") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self.rows += len(rows)
+
+    @property
+    def bytes(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+
+class ReadModels:
+    """Local indexes built from these tables by id cursor, pruned of deleted rows.
+
+    The FTS5 search index, the TF-IDF match index and the talent-flow edge
+    counts only ever pull ids past their cursor, so without this a row
+    archived or merged away here would stay searchable and matchable, and
+    the row it was merged into would keep its pre-merge text and edge.
+    Each index is opened on first use and saved by save().
+    """
+
+    def __init__(self) -> None:
+        self.search = None
+        self.matcher = None
+        self.flow = None
+        self.pruned = 0
+
+    def removed(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        from search_index import SOURCES, SearchIndex
+
+        ids = [r["id"] for r in rows]
+        kind = next(k for k, spec in SOURCES.items() if spec["table"] == table)
+        self.search = self.search or SearchIndex()
+        self.pruned += self.search.remove(kind, ids)
+        if table == "aerospace_talent":
+            from talent_flow import TalentFlowIndex
+            from talent_matching import TalentMatcher
+
+            self.matcher = self.matcher or TalentMatcher.load()
+            self.matcher.remove(ids)
+            self.flow = self.flow or TalentFlowIndex.load()
+            self.flow.remove_rows(rows)
+
+    def merged(self, db: SimpleSupabase, before: List[Dict[str, Any]]) -> None:
+        """Re-index aerospace_talent rows that compact_table updated in place."""
+        if not before:
+            return
+        from search_index import SearchIndex
+        from talent_flow import TalentFlowIndex
+        from talent_matching import TalentMatcher
+
+        after: List[Dict[str, Any]] = []
+        for chunk in _chunks([r["id"] for r in before]):
+            after.extend(db.fetch_all("aerospace_talent", params={"id": f"in.({','.join(map(str, chunk))})"}))
+        self.search = self.search or SearchIndex()
+        self.search.index_rows("talent", after)
+        self.matcher = self.matcher or TalentMatcher.load()
+        self.matcher.add_rows(after)
+        self.flow = self.flow or TalentFlowIndex.load()
+        self.flow.remove_rows(before)
+        self.flow.add_rows(after)
+
+    def save(self) -> None:
+        if self.search is not None:
+            self.search.close()
+        if self.matcher is not None:
+            self.matcher.save()
+        if self.flow is not None:
+            self.flow.save()
+
+
+def _archive_and_delete(
+    db: SimpleSupabase, table: str, ids: Sequence[Any], archive: TableArchive, models: ReadModels
+) -> int:
+    """Copy full rows to the archive, delete them, then prune the local indexes, one id chunk at a time."""
+    deleted = 0
+    for chunk in _chunks(list(ids)):
+        id_filter = f"in.({','.join(map(str, chunk))})"
+        rows = db.fetch_all(table, params={"id": id_filter, "order": "id.asc"})
+        archive.write(rows)
+        deleted += db.delete_rows(table, {"id": id_filter})
+        models.removed(table, rows)
+    return deleted
+
+
+def aged_filter(policy: Dict[str, Any], now: datetime) -> Dict[str, str]:
+    cutoff = (now - timedelta(days=policy["days"])).date().isoformat()
+    column = policy["date"]
+    params = dict(policy.get("only", {}))
+    if column == "created_at":
+        params["created_at"] = f"lt.{cutoff}"
+        return params
+    aged = f"or({column}.lt.{cutoff},and({column}.is.null,created_at.lt.{cutoff}))"
+    if "or" in params:
+        # a second or=() would replace the policy's own; and() keeps both
+        params["and"] = f"(or{params.pop('or')},{aged})"
+    else:
+        params["or"] = aged[2:]
+    return params
+
+
+def apply_policy(
+    db: SimpleSupabase,
+    table: str,
+    policy: Dict[str, Any],
+    apply: bool = False,
+    now: Optional[datetime] = None,
+    root: Path = RETENTION_DIR,
+    models: Optional[ReadModels] = None,
+) -> Dict[str, Any]:
+    """Age out, then collapse duplicates in one table; counts only unless apply."""
+    now = now or datetime.now(timezone.utc)
+    models = models or ReadModels()
+    archive = TableArchive(table, now.strftime("%Y%m%dT%H%M%SZ"), root)
+    stats = {"before": row_count(db, table), "aged": 0, "duplicates": 0, "deleted": 0}
+
+    aged = [r["id"] for r in db.fetch_all(table, select="id", params=aged_filter(policy, now))]
+    stats["aged"] = len(aged)
+    if apply:
+        stats["deleted"] += _archive_and_delete(db, table, aged, archive, models)
+
+    if policy.get("dedupe") == "story":
+        skip = set(aged)
+        first: Dict[tuple, Any] = {}
+        losers: List[Any] = []
+        for row in db.fetch_all(table, select=STORY_COLUMNS, params={"order": "id.asc"}):
+            if row["id"] in skip:
+                continue
+            key = story_key(row)
+            if key in first:
+                losers.append(row["id"])  # the oldest copy stays
+            else:
+                first[key] = row["id"]
+        stats["duplicates"] = len(losers)
+        if apply:
+            stats["deleted"] += _archive_and_delete(db, table, losers, archive, models)
+    elif policy.get("dedupe") == "person":
+        merged_away: List[Dict[str, Any]] = []
+        winners: List[Dict[str, Any]] = []
+
+        def keep_copy(ids: List[Any]) -> None:
+            for chunk in _chunks(ids):
+                rows = db.fetch_all(table, params={"id": f"in.({','.join(map(str, chunk))})"})
+                archive.write(rows)
+                merged_away.extend(rows)
+
+        # the aged rows are still there in a dry run; don't count them twice
+        merged = compact_table(db, apply=apply, before_delete=keep_copy, skip=aged, on_merge=winners.append)
+        stats["duplicates"] = merged["duplicates"]
+        if apply:
+            stats["deleted"] += merged["duplicates"]
+            models.removed(table, merged_away)
+            models.merged(db, winners)
+
+    if apply:
+        stats["after"] = row_count(db, table)
+    else:
+        stats["after"] = stats["before"] - stats["aged"] - stats["duplicates"]
+    stats["archived"] = archive.rows
+    stats["archive_bytes"] = archive.bytes
+    stats["archive"] = str(archive.path) if archive.rows else None
+    return stats
+
+
+def run_retention(
+    db: SimpleSupabase,
+    tables: Sequence[str] = tuple(RETENTION_POLICIES),
+    apply: bool = False,
+    root: Path = RETENTION_DIR,
+) -> Dict[str, Dict[str, Any]]:
+    now = datetime.now(timezone.utc)
+    models = ReadModels()
+    report: Dict[str, Dict[str, Any]] = {}
+    try:
+        for table in tables:
+            try:
+                report[table] = apply_policy(db, table, RETENTION_POLICIES[table], apply, now, root, models)
+            except Exception as e:
+                print(f"⚠️ Retention for {table} skipped: {e}")
+    finally:
+        models.save()
+    if models.pruned:
+        print(f"🔎 Pruned {models.pruned} deleted rows from the local search index")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive aged rows and collapse duplicates in the intelligence tables")
+    parser.add_argument("--table", action="append", choices=sorted(RETENTION_POLICIES), help="default: all (repeatable)")
+    parser.add_argument("--apply", action="store_true", help="archive and delete; without it only counts")
+    args = parser.parse_args()
+
+    report = run_retention(SimpleSupabase(), args.table or tuple(RETENTION_POLICIES), apply=args.apply)
+    verb = "" if args.apply else " (dry run)"
+    for table, s in report.items():
+        print(
+            f"🧹 {table}: {s['before']:,} -> {s['after']:,} rows{verb} - "
+            f"{s['aged']:,} older than {RETENTION_POLICIES[table]['days']} days, {s['duplicates']:,} duplicates"
+        )
+        if s["archive"]:
+            print(f"   🗄️ {s['archived']:,} rows -> {s['archive']} ({s['archive_bytes'] / 1e6:.1f} MB)")
+    if not args.apply:
+        print("   Re-run with --apply to archive and delete.")
@@ -0,0 +1,178 @@
+# talent_flow.py - incrementally maintained company -> company talent flow edges
+import json
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from simple_db import SimpleSupabase
+from talent_resolution import canonical_company
+
+FLOW_PATH = Path(os.getenv("NATILUS_FLOW_PATH", Path("data") / "talent_flow.json"))
+AVAILABLE = "AVAILABLE"
+OTHER = "Other"
+FLOW_COLUMNS = "id,previous_company,current_company,is_open_to_work"
+REBUILD_SECONDS = 24 * 3600  # full recount, picking up patched and merged rows
+
+SOURCE_COMPANIES = {"Boeing", "Spirit AeroSystems", "Textron", "Lockheed Martin", "Northrop Grumman", "Airbus"}
+COMPETITORS = {"JetZero", "Blue Origin", "Joby Aviation", "Archer Aviation", "Beta Technologies", "Reliable Robotics"}
+
+
+def edge_for(row: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """Where one talent row sits in the flow graph.
+
+    previous -> current when they moved, company -> AVAILABLE when they
+    are open to work (WARN pools, layoffs), nothing otherwise.
+    """
+    previous = canonical_company(row.get("previous_company"))
+    current = canonical_company(row.get("current_company"))
+    if row.get("is_open_to_work"):
+        source = current or previous
+        return (source, AVAILABLE) if source else None
+    if previous and current and previous != current:
+        return previous, current
+    return None
+
+
+class TalentFlowIndex:
+    """Edge counts for the talent Sankey, updated from new rows between rebuilds.
+
+    Each update() pulls rows past the highest id folded in and bumps the
+    matching edge counters. Rows also change in place (duplicate patches,
+    compact_table merges) without a new id, so the pipeline calls
+    rebuild() once the counts are older than REBUILD_SECONDS; readers
+    such as the dashboard only load the saved counts. Deleted rows are
+    subtracted with remove_rows() by the retention job.
+    """
+
+    def __init__(self, path: Path = FLOW_PATH) -> None:
+        self.path = path
+        self.edges: Counter = Counter()
+        self.last_id: Optional[int] = None
+        self.built_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path = FLOW_PATH) -> "TalentFlowIndex":
+        index = cls(path)
+        if path.exists():
+            try:
+                state = json.loads(path.read_text(encoding="utf-8"))
+                index.last_id = state.get("last_id")
+                index.built_at = state.get("built_at", 0.0)
+                index.edges = Counter({(s, t): n for s, t, n in state.get("edges", [])})
+            except (OSError, ValueError):
+                pass
+        return index
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "last_id": self.last_id,
+            "built_at": self.built_at,
+            "edges": [[s, t, n] for (s, t), n in self.edges.items()],
+        }
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        added = 0
+        for row in rows:
+            edge = edge_for(row)
+            if edge:
+                self.edges[edge] += 1
+                added += 1
+            row_id = row.get("id")
+            if row_id is not None and (self.last_id is None or row_id > self.last_id):
+                self.last_id = row_id
+        return added
+
+    def remove_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Subtract rows deleted from aerospace_talent (full rows, as archived)."""
+        removed = 0
+        with self._lock:
+            for row in rows:
+                edge = edge_for(row)
+                if edge and self.edges[edge] > 0:
+                    self.edges[edge] -= 1
+                    removed += 1
+            self.edges = +self.edges  # drop zero counts
+        return removed
+
+    def due(self) -> bool:
+        """Whether the counts are old enough for the pipeline to recount them."""
+        return time.time() - self.built_at >= REBUILD_SECONDS
+
+    def rebuild(self, db: SimpleSupabase, page_size: int = 1000) -> int:
+        """Recount every aerospace_talent row from scratch. Returns rows read."""
+        with self._lock:
+            self.edges, self.last_id, self.built_at = Counter(), None, time.time()
+        return self.update(db, page_size)
+
+    def update(self, db: SimpleSupabase, page_size: int = 1000) -> int:
+        """Fold in aerospace_talent rows newer than last_id. Returns rows read."""
+        with self._lock:
+            params = {"order": "id.asc"}
+            if self.last_id is not None:
+                params["id"] = f"gt.{self.last_id}"
+            rows = db.fetch_all("aerospace_talent", select=FLOW_COLUMNS, params=params, page_size=page_size)
+            self.add_rows(rows)
+            return len(rows)
+
+    def links_frame(self, max_nodes: int = 12) -> pd.DataFrame:
+        """Edge list for the Sankey; small companies fold into 'Other'."""
+        with self._lock:
+            edges = list(self.edges.items())
+        if not edges:
+            return pd.DataFrame(columns=["source", "target", "value"])
+
+        df = pd.DataFrame(
+            [(s, t, n) for (s, t), n in edges], columns=["source", "target", "value"]
+        )
+        weight = pd.concat(
+            [df.groupby("source")["value"].sum(), df.groupby("target")["value"].sum()]
+        ).groupby(level=0).sum()
+        keep = set(weight.drop(AVAILABLE, errors="ignore").nlargest(max_nodes).index) | {AVAILABLE}
+        df["source"] = df["source"].where(df["source"].isin(keep), OTHER)
+        df["target"] = df["target"].where(df["target"].isin(keep), OTHER)
+        df = df[df["source"] != df["target"]]
+        return (
+            df.groupby(["source", "target"], as_index=False)["value"].sum()
+            .sort_values(["value", "source", "target"], ascending=[False, True, True])
+            .reset_index(drop=True)
+        )
+
+
+def node_color(name: str) -> str:
+    if name == AVAILABLE:
+        return "green"
+    if name == "Natilus":
+        return "gold"
+    if name in SOURCE_COMPANIES:
+        return "red"
+    if name in COMPETITORS:
+        return "blue"
+    return "gray"
+
+
+def link_style(source: str, target: str) -> Tuple[str, str]:
+    """(label, rgba colour) for one Sankey link."""
+    if target == AVAILABLE:
+        return "Layoffs / open to work", "rgba(255,0,0,0.4)"
+    if target == "Natilus":
+        return "Hired", "rgba(0,255,0,0.4)"
+    if target in COMPETITORS:
+        return "Poached", "rgba(0,0,255,0.4)"
+    return "Moved", "rgba(255,165,0,0.4)"
+
+
+if __name__ == "__main__":
+    index = TalentFlowIndex.load()
+    read = index.update(SimpleSupabase())
+    index.save()
+    print(f"🔀 Folded {read} new talent rows into {len(index.edges)} flow edges -> {FLOW_PATH}")
@@ -0,0 +1,288 @@
+# talent_matching.py - rank aerospace_talent against a requisition with TF-IDF + cosine
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from simple_db import SimpleSupabase
+
+INDEX_PATH = Path(os.getenv("NATILUS_MATCH_INDEX", Path("data") / "talent_tfidf.npz"))
+MATCH_COLUMNS = "id,title,skills,notes"
+REBUILD_SECONDS = 24 * 3600  # full re-index, picking up patched titles/skills
+
+# title matters more than a passing mention in notes
+FIELD_WEIGHTS = {"title": 2.0, "skills": 1.5, "notes": 1.0}
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[/+][a-z0-9]+)*")
+_STOPWORDS = {
+    "a", "an", "and", "at", "by", "for", "from", "in", "is", "of", "on", "or",
+    "the", "to", "with", "via", "found", "github", "search", "bio",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Unigrams plus adjacent bigrams ('flight test', 'faa der')."""
+    words = [w for w in _TOKEN.findall(str(text or "").lower()) if w not in _STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _row_terms(row: Dict[str, Any]) -> Dict[str, float]:
+    counts: Dict[str, float] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in tokenize(row.get(field) or ""):
+            counts[term] = counts.get(term, 0.0) + weight
+    return counts
+
+
+class TalentMatcher:
+    """Sparse TF-IDF index over talent title/skills/notes.
+
+    Term frequencies are stored once in CSR arrays and never reweighted;
+    IDF and document norms are derived from the document-frequency vector
+    when the index changes. Queries walk only the posting lists of the
+    query's terms (a CSC view of the same data), so a top-k lookup over
+    100k profiles touches a few thousand entries.
+
+    update() only indexes ids past the last one seen, but profiles are
+    also patched in place and merged away, so the pipeline calls rebuild()
+    once the index is older than REBUILD_SECONDS (which also drops dead
+    documents); queries never wait on a full re-index. remove() retires
+    deleted ids in between.
+    """
+
+    def __init__(self, path: Path = INDEX_PATH) -> None:
+        self.path = path
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self.vocab: Dict[str, int] = {}
+        self.doc_ids = np.zeros(0, dtype=np.int64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.tf = np.zeros(0, dtype=np.float32)
+        self.df = np.zeros(0, dtype=np.int64)
+        self.last_id: Optional[int] = None
+        self.built_at = 0.0
+        self._derived = False
+
+    # ---------- persistence ----------
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> "TalentMatcher":
+        index = cls(path)
+        if path.exists():
+            with np.load(path, allow_pickle=False) as data:
+                terms = data["vocab"].tolist()
+                index.vocab = {t: i for i, t in enumerate(terms)}
+                index.doc_ids = data["doc_ids"]
+                index.alive = data["alive"]
+                index.indptr = data["indptr"]
+                index.indices = data["indices"]
+                index.tf = data["tf"]
+                index.df = data["df"]
+                last = int(data["last_id"])
+                index.last_id = last if last >= 0 else None
+                index.built_at = float(data["built_at"]) if "built_at" in data.files else 0.0
+        return index
+
+    def save(self) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            terms = np.array(sorted(self.vocab, key=self.vocab.get), dtype=str)
+            tmp = self.path.with_name(self.path.stem + ".tmp.npz")
+            np.savez_compressed(
+                tmp,
+                vocab=terms,
+                doc_ids=self.doc_ids,
+                alive=self.alive,
+                indptr=self.indptr,
+                indices=self.indices,
+                tf=self.tf,
+                df=self.df,
+                last_id=np.int64(-1 if self.last_id is None else self.last_id),
+                built_at=np.float64(self.built_at),
+            )
+            tmp.replace(self.path)
+
+    # ---------- building ----------
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Append documents; a row whose id is already indexed replaces it."""
+        with self._lock:
+            rows = [r for r in rows if r.get("id") is not None]
+            if not rows:
+                return 0
+
+            new_ids = np.array([r["id"] for r in rows], dtype=np.int64)
+            replaced = self.alive & np.isin(self.doc_ids, new_ids)
+            for doc in np.flatnonzero(replaced):
+                terms = self.indices[self.indptr[doc]:self.indptr[doc + 1]]
+                self.df[terms] -= 1
+            self.alive[replaced] = False
+
+            indptr, indices, tf = [], [], []
+            nnz = int(self.indptr[-1])
+            for row in rows:
+                counts = _row_terms(row)
+                cols = []
+                for term in counts:
+                    col = self.vocab.get(term)
+                    if col is None:
+                        col = self.vocab[term] = len(self.vocab)
+                    cols.append(col)
+                indices.extend(cols)
+                # sublinear tf damps long bios repeating a keyword
+                tf.extend(1.0 + np.log(list(counts.values())) if counts else [])
+                nnz += len(cols)
+                indptr.append(nnz)
+
+            self.doc_ids = np.concatenate([self.doc_ids, new_ids])
+            self.alive = np.concatenate([self.alive, np.ones(len(rows), dtype=bool)])
+            self.indptr = np.concatenate([self.indptr, np.array(indptr, dtype=np.int64)])
+            new_indices = np.array(indices, dtype=np.int32)
+            self.indices = np.concatenate([self.indices, new_indices])
+            self.tf = np.concatenate([self.tf, np.array(tf, dtype=np.float32)])
+            if len(self.df) < len(self.vocab):
+                self.df = np.concatenate([self.df, np.zeros(len(self.vocab) - len(self.df), dtype=np.int64)])
+            self.df += np.bincount(new_indices, minlength=len(self.vocab))
+
+            last = int(new_ids.max())
+            self.last_id = last if self.last_id is None else max(self.last_id, last)
+            self._derived = False
+            return len(rows)
+
+    def remove(self, ids: Iterable[int]) -> int:
+        """Retire deleted profiles so they are no longer matched."""
+        with self._lock:
+            gone = self.alive & np.isin(self.doc_ids, np.fromiter(ids, dtype=np.int64))
+            for doc in np.flatnonzero(gone):
+                terms = self.indices[self.indptr[doc]:self.indptr[doc + 1]]
+                self.df[terms] -= 1
+            self.alive[gone] = False
+            self._derived = False
+            return int(gone.sum())
+
+    def due(self) -> bool:
+        """Whether the index is old enough for the pipeline to rebuild it."""
+        return time.time() - self.built_at >= REBUILD_SECONDS
+
+    def rebuild(self, db: SimpleSupabase) -> int:
+        """Re-index every aerospace_talent row from scratch."""
+        with self._lock:
+            self._clear()
+            self.built_at = time.time()
+            return self.update(db)
+
+    def update(self, db: SimpleSupabase) -> int:
+        """Index aerospace_talent rows added since the last update."""
+        with self._lock:
+            params = {"order": "id.asc"}
+            if self.last_id is not None:
+                params["id"] = f"gt.{self.last_id}"
+            rows = db.fetch_all("aerospace_talent", select=MATCH_COLUMNS, params=params)
+            return self.add_rows(rows)
+
+    # ---------- querying ----------
+
+    def _derive(self) -> None:
+        """IDF, per-doc norms and the CSC (posting list) view."""
+        n_docs = max(int(self.alive.sum()), 1)
+        self.idf = (np.log((1 + n_docs) / (1 + self.df)) + 1.0).astype(np.float32)
+
+        row_of = np.repeat(np.arange(len(self.doc_ids)), np.diff(self.indptr))
+        weights = self.tf * self.idf[self.indices]
+        norms = np.sqrt(np.bincount(row_of, weights=weights.astype(np.float64) ** 2, minlength=len(self.doc_ids)))
+        norms[norms == 0] = 1.0
+        self.norms = norms.astype(np.float32)
+
+        order = np.argsort(self.indices, kind="stable")
+        self.post_docs = row_of[order]
+        self.post_tf = self.tf[order]
+        self.post_ptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(self.indices, minlength=len(self.vocab)))]
+        ).astype(np.int64)
+        self._derived = True
+
+    def query(self, text: str, k: int = 10) -> List[Tuple[int, float]]:
+        """Top-k (talent id, cosine similarity) for a free-text requisition."""
+        with self._lock:
+            if not len(self.doc_ids):
+                return []
+            if not self._derived:
+                self._derive()
+
+            counts: Dict[int, float] = {}
+            for term in tokenize(text):
+                col = self.vocab.get(term)
+                if col is not None:
+                    counts[col] = counts.get(col, 0.0) + 1.0
+            if not counts:
+                return []
+
+            cols = np.fromiter(counts, dtype=np.int64)
+            q = (1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32))) * self.idf[cols]
+            q /= np.linalg.norm(q) or 1.0
+
+            scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+            for col, weight in zip(cols, q):
+                lo, hi = self.post_ptr[col], self.post_ptr[col + 1]
+                # a term appears once per doc, so plain fancy-index add is safe
+                scores[self.post_docs[lo:hi]] += self.post_tf[lo:hi] * (weight * self.idf[col])
+            scores /= self.norms
+            scores[~self.alive] = 0.0
+
+            k = min(k, int((scores > 0).sum()))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(int(self.doc_ids[i]), float(scores[i])) for i in top]
+
+
+def fetch_matches(
+    db: SimpleSupabase, matches: Sequence[Tuple[int, float]], columns: str = "id,name,title,current_company,location,priority_score"
+) -> List[Dict[str, Any]]:
+    """Hydrate (id, score) pairs with talent rows, keeping match order."""
+    if not matches:
+        return []
+    ids = ",".join(str(i) for i, _ in matches)
+    rows, _ = db.select_rows("aerospace_talent", {"select": columns, "id": f"in.({ids})"})
+    by_id = {r["id"]: r for r in rows}
+    out = []
+    for talent_id, score in matches:
+        if talent_id in by_id:
+            out.append(dict(by_id[talent_id], match_score=round(score, 3)))
+    return out
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Rank talent against a requisition")
+    parser.add_argument("query", nargs="?", help='e.g. "Senior Composite Engineer"')
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--no-update", action="store_true", help="query the on-disk index as-is")
+    args = parser.parse_args()
+
+    db = SimpleSupabase()
+    matcher = TalentMatcher.load()
+    if not args.no_update:
+        added = matcher.update(db)
+        if added:
+            matcher.save()
+        print(f"📚 Index: {int(matcher.alive.sum())} profiles ({added} new)")
+
+    if args.query:
+        started = time.perf_counter()
+        matches = matcher.query(args.query, args.k)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"🔎 '{args.query}' -> {len(matches)} matches in {elapsed:.1f} ms")
+        for row in fetch_matches(db, matches):
+            print(f"  {row['match_score']:.3f}  {row.get('name')} - {row.get('title') or ''} ({row.get('current_company') or 'Unknown'})")
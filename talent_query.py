@@ -0,0 +1,215 @@
+# talent_query.py - turn Talent Pipeline filters into PostgREST queries
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from simple_db import SimpleSupabase, in_filter, quote
+
+TALENT_TABLE = "aerospace_talent"
+
+# Dashboard role labels -> patterns matched against aerospace_talent.title
+ROLE_PATTERNS: Dict[str, List[str]] = {
+    "Composite Engineer": ["composite"],
+    "Cert Specialist": ["cert"],
+    "Manufacturing": ["manufacturing"],
+    "Flight Test": ["flight test"],
+}
+
+# Urgency slider -> minimum priority_score
+URGENCY_MIN_SCORE: Dict[str, int] = {
+    "Low": 0,
+    "Medium": 70,
+    "High": 85,
+    "Critical": 95,
+}
+
+TALENT_COLUMNS = [
+    "id",
+    "name",
+    "current_company",
+    "previous_company",
+    "title",
+    "location",
+    "years_experience",
+    "priority_score",
+    "is_open_to_work",
+    "risk_of_poaching",
+    "linkedin_url",
+]
+
+DEFAULT_PAGE_SIZE = 25
+
+
+def _ilike_any(column: str, patterns: Sequence[str]) -> Optional[str]:
+    """or(col.ilike."*a*",col.ilike."*b*") or None when there is nothing to match."""
+    terms = [f"{column}.ilike.{quote('*' + p.strip() + '*')}" for p in patterns if p.strip()]
+    if not terms:
+        return None
+    return f"or({','.join(terms)})"
+
+
+def build_talent_params(
+    roles: Sequence[str] = (),
+    locations: Sequence[str] = (),
+    urgency: Optional[str] = None,
+    companies: Sequence[str] = (),
+    page: int = 1,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Dict[str, str]:
+    """Build PostgREST query params for one page of the talent table.
+
+    Roles and locations are OR'd within each widget and AND'd across
+    widgets, urgency becomes a priority_score floor, and results are
+    ordered server-side so paging is stable.
+    """
+    params: Dict[str, str] = {
+        "select": ",".join(TALENT_COLUMNS),
+        "order": "priority_score.desc.nullslast,id.asc",
+        "limit": str(page_size),
+        "offset": str(max(page - 1, 0) * page_size),
+    }
+
+    groups = []
+    role_patterns = [p for r in roles for p in ROLE_PATTERNS.get(r, [r])]
+    role_group = _ilike_any("title", role_patterns)
+    if role_group:
+        groups.append(role_group)
+    location_group = _ilike_any("location", locations)
+    if location_group:
+        groups.append(location_group)
+    if groups:
+        params["and"] = f"({','.join(groups)})"
+
+    min_score = URGENCY_MIN_SCORE.get(urgency or "", 0)
+    if min_score:
+        params["priority_score"] = f"gte.{min_score}"
+
+    if companies:
+        params["current_company"] = in_filter(companies)
+
+    return params
+
+
+def fetch_talent_page(
+    db: SimpleSupabase,
+    roles: Sequence[str] = (),
+    locations: Sequence[str] = (),
+    urgency: Optional[str] = None,
+    companies: Sequence[str] = (),
+    page: int = 1,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Fetch one filtered page of aerospace_talent plus the total match count."""
+    params = build_talent_params(roles, locations, urgency, companies, page, page_size)
+    rows, total = db.select_rows(TALENT_TABLE, params, count=True)
+    return rows, total if total is not None else len(rows)
+
+
+def fetch_newer_talent(
+    db: SimpleSupabase,
+    since_id: int,
+    roles: Sequence[str] = (),
+    locations: Sequence[str] = (),
+    urgency: Optional[str] = None,
+    companies: Sequence[str] = (),
+) -> List[Dict[str, Any]]:
+    """Matching rows added after a local snapshot (ids past since_id), unpaged."""
+    params = build_talent_params(roles, locations, urgency, companies)
+    for key in ("limit", "offset"):
+        params.pop(key)
+    params["id"] = f"gt.{since_id}"
+    rows, _ = db.select_rows(TALENT_TABLE, params)
+    return rows
+
+
+def _contains_any(column: Any, patterns: Sequence[str]) -> Any:
+    """Case-insensitive substring match of any pattern (ilike '*p*'), null -> False.
+
+    Dictionary-encoded (categorical) chunks are matched once per distinct
+    value and the result is gathered through the indices.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    def match(values: Any) -> Any:
+        masks = [pc.match_substring(values, p.strip(), ignore_case=True) for p in patterns if p.strip()]
+        out = masks[0]
+        for mask in masks[1:]:
+            out = pc.or_(out, mask)
+        return out
+
+    chunks = []
+    for chunk in column.chunks:
+        if pa.types.is_dictionary(chunk.type):
+            chunks.append(pc.fill_null(pc.take(match(chunk.dictionary), chunk.indices), False))
+        else:
+            chunks.append(pc.fill_null(match(chunk), False))
+    return pa.chunked_array(chunks, type=pa.bool_())
+
+
+def _order_key(row: Dict[str, Any]) -> Tuple[bool, float, int]:
+    """priority_score desc nulls last, id asc - the server-side order."""
+    score = row.get("priority_score")
+    return (score is None, -(score or 0), row.get("id") or 0)
+
+
+def snapshot_talent_page(
+    table: Any,
+    roles: Sequence[str] = (),
+    locations: Sequence[str] = (),
+    urgency: Optional[str] = None,
+    companies: Sequence[str] = (),
+    page: int = 1,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    newer: Sequence[Dict[str, Any]] = (),
+) -> Tuple[List[Dict[str, Any]], int]:
+    """fetch_talent_page evaluated in-process on an Arrow snapshot of aerospace_talent.
+
+    Same filters, order and paging as build_talent_params. `newer` are rows
+    past the snapshot, already filtered by fetch_newer_talent; they are
+    merged in before paging.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if table.num_rows == 0 or "priority_score" not in table.column_names:
+        # empty export (written without columns): only rows past it can match
+        offset = max(page - 1, 0) * page_size
+        rows = sorted(newer, key=_order_key)
+        return rows[offset:offset + page_size], len(rows)
+
+    table = table.select([c for c in TALENT_COLUMNS if c in table.column_names])
+    mask = None
+
+    def narrow(condition: Any) -> None:
+        nonlocal mask
+        mask = condition if mask is None else pc.and_(mask, condition)
+
+    role_patterns = [p for r in roles for p in ROLE_PATTERNS.get(r, [r]) if p.strip()]
+    if role_patterns:
+        narrow(_contains_any(table["title"], role_patterns))
+    location_patterns = [p for p in locations if p.strip()]
+    if location_patterns:
+        narrow(_contains_any(table["location"], location_patterns))
+    min_score = URGENCY_MIN_SCORE.get(urgency or "", 0)
+    if min_score:
+        narrow(pc.fill_null(pc.greater_equal(table["priority_score"], min_score), False))
+    if companies:
+        company = pc.cast(table["current_company"], pa.string())
+        narrow(pc.fill_null(pc.is_in(company, value_set=pa.array(list(companies), pa.string())), False))
+    if mask is not None:
+        table = table.filter(mask)
+
+    # Only the rows up to the end of the requested page leave Arrow
+    offset = max(page - 1, 0) * page_size
+    head = table.sort_by([("priority_score", "descending"), ("id", "ascending")]).slice(0, offset + page_size)
+    rows = sorted(head.to_pylist() + list(newer), key=_order_key)
+    return rows[offset:offset + page_size], table.num_rows + len(newer)
+
+
+def status_label(score: Optional[int]) -> str:
+    """Dashboard status badge for a priority score."""
+    score = score or 0
+    if score >= URGENCY_MIN_SCORE["Critical"]:
+        return "🔴 Urgent"
+    if score >= URGENCY_MIN_SCORE["High"]:
+        return "🟡 High"
+    return "🟢 Medium"
@@ -0,0 +1,423 @@
+# talent_resolution.py - link duplicate aerospace_talent rows into golden records
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# ---------- Normalization ----------
+
+_COMPANY_ALIASES = {
+    "spirit": "Spirit AeroSystems",
+    "spirit aerosystems": "Spirit AeroSystems",
+    "joby": "Joby Aviation",
+    "archer": "Archer Aviation",
+    "beta": "Beta Technologies",
+    "boeing": "Boeing",
+    "lockheed": "Lockheed Martin",
+    "northrop": "Northrop Grumman",
+}
+_COMPANY_SUFFIXES = re.compile(r"\b(inc|llc|ltd|corp|corporation|co|company)\.?$", re.I)
+_HONORIFICS = {"mr", "mrs", "ms", "dr", "jr", "sr", "ii", "iii", "phd", "pe"}
+_STATES = {
+    "washington": "wa", "kansas": "ks", "texas": "tx", "california": "ca",
+    "south carolina": "sc", "arizona": "az", "colorado": "co", "florida": "fl",
+}
+
+
+def _ascii(text: str) -> str:
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+def canonical_company(name: Any) -> Optional[str]:
+    """Display form of a company: whitespace collapsed, aliases and @handles folded."""
+    text = " ".join(str(name or "").split()).lstrip("@")
+    if not text:
+        return None
+    text = _COMPANY_SUFFIXES.sub("", text).rstrip(" ,.") or text
+    text = re.sub(r"^the\s+", "", text, flags=re.I) or text
+    return _COMPANY_ALIASES.get(text.lower(), text)
+
+
+def normalize_company(name: Any) -> str:
+    return (canonical_company(name) or "").lower()
+
+
+def normalize_name(name: Any) -> str:
+    tokens = re.sub(r"[^a-z0-9 ]+", " ", _ascii(str(name or "")).lower()).split()
+    return " ".join(t for t in tokens if t not in _HONORIFICS)
+
+
+def normalize_location(location: Any) -> str:
+    text = re.sub(r"[^a-z ,]+", " ", _ascii(str(location or "")).lower())
+    parts = [" ".join(p.split()) for p in text.split(",") if p.strip()]
+    parts = [_STATES.get(p, p) for p in parts]
+    return ", ".join(parts)
+
+
+_GITHUB_PROFILE = re.compile(r"github\.com/([a-z0-9](?:[a-z0-9-]*[a-z0-9])?)(?![a-z0-9-])", re.I)
+
+
+def github_login(row: Dict[str, Any]) -> str:
+    """The row's GitHub login: the in-memory field, else the profile URL kept in notes."""
+    if row.get("github_login"):
+        return str(row["github_login"]).lower()
+    found = _GITHUB_PROFILE.search(str(row.get("notes") or ""))
+    return found.group(1).lower() if found else ""
+
+
+def normalize_url(url: Any) -> str:
+    text = str(url or "").strip().lower()
+    text = re.sub(r"^https?://", "", text)
+    text = re.sub(r"^www\.", "", text)
+    return text.rstrip("/")
+
+
+# ---------- Blocking + comparison ----------
+
+def _block_keys(norm: Dict[str, str]) -> List[str]:
+    """Sort keys for the sorted-neighborhood passes."""
+    tokens = norm["name"].split()
+    if not tokens:
+        return []
+    first, last = tokens[0], tokens[-1]
+    company = norm["company"][:6]
+    return [
+        f"{last}|{first[:1]}|{company}",
+        f"{first}|{last[:3]}",
+        f"{company}|{last}|{first[:1]}",
+    ]
+
+
+def _ratio(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Token-aware name score: surnames must agree, first names must be compatible."""
+    ta, tb = a.split(), b.split()
+    if not ta or not tb:
+        return 0.0
+    if sorted(ta) == sorted(tb):
+        return 1.0
+    last = _ratio(ta[-1], tb[-1])
+    if last < 0.85:
+        return 0.0
+    fa, fb = ta[0], tb[0]
+    if len(fa) == 1 or len(fb) == 1:
+        first = 0.9 if fa[0] == fb[0] else 0.0
+    else:
+        first = _ratio(fa, fb)
+    if first < 0.85:
+        return 0.0
+    return min(1.0, 0.5 * last + 0.5 * first)
+
+
+def similarity(a: Dict[str, str], b: Dict[str, str]) -> float:
+    """0..1 match score between two normalized records.
+
+    Company and location only count when both rows have them; a blank
+    field is neutral, so the weights are rescaled over what is present.
+    With nothing but the name to go on, only an exact name match scores.
+    """
+    name_sim = name_similarity(a["name"], b["name"])
+    if not name_sim:
+        return 0.0
+
+    parts = [(0.6, name_sim)]
+    if a["company"] and b["company"]:
+        parts.append((0.25, 1.0 if a["company"] == b["company"] else 0.0))
+    if a["location"] and b["location"]:
+        city_a = a["location"].split(",")[0]
+        city_b = b["location"].split(",")[0]
+        parts.append((0.15, 1.0 if city_a == city_b else 0.0))
+
+    if len(parts) == 1:
+        return 1.0 if name_sim >= 1.0 else 0.0
+    return sum(w * v for w, v in parts) / sum(w for w, _ in parts)
+
+
+class _UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+class TalentResolver:
+    """Cluster talent rows that describe the same person or pool.
+
+    Exact identifiers (linkedin_url, the GitHub login) link rows directly;
+    stored rows carry the login only as a GitHub URL in notes.
+    Everything else goes through sorted-neighborhood blocking: rows are
+    sorted on a few normalized keys and only compared with the next
+    `window` rows in each ordering, so the work is O(n log n + n*window)
+    instead of all pairs.
+    """
+
+    def __init__(self, window: int = 8, threshold: float = 0.82) -> None:
+        self.window = window
+        self.threshold = threshold
+
+    @staticmethod
+    def normalize(row: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "name": normalize_name(row.get("name")),
+            "company": normalize_company(row.get("current_company") or row.get("previous_company")),
+            "location": normalize_location(row.get("location")),
+            "linkedin": normalize_url(row.get("linkedin_url")),
+            "github": github_login(row),
+        }
+
+    def clusters(self, rows: Sequence[Dict[str, Any]]) -> List[List[int]]:
+        """Indices of rows grouped by person, singletons included."""
+        norms = [self.normalize(r) for r in rows]
+        uf = _UnionFind(len(rows))
+
+        for field in ("linkedin", "github"):
+            seen: Dict[str, int] = {}
+            for i, norm in enumerate(norms):
+                key = norm[field]
+                if key:
+                    if key in seen:
+                        uf.union(seen[key], i)
+                    else:
+                        seen[key] = i
+
+        keyed = [(i, _block_keys(n)) for i, n in enumerate(norms)]
+        passes = max((len(k) for _, k in keyed), default=0)
+        for p in range(passes):
+            order = sorted((k[p], i) for i, k in keyed if len(k) > p)
+            for pos, (_, i) in enumerate(order):
+                for _, j in order[pos + 1: pos + 1 + self.window]:
+                    if uf.find(i) == uf.find(j):
+                        continue
+                    if similarity(norms[i], norms[j]) >= self.threshold:
+                        uf.union(i, j)
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(rows)):
+            groups.setdefault(uf.find(i), []).append(i)
+        return list(groups.values())
+
+    def resolve(self, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One golden record per cluster."""
+        return [merge_records([rows[i] for i in group]) for group in self.clusters(rows)]
+
+
+# ---------- Merging ----------
+
+def _filled(row: Dict[str, Any]) -> int:
+    return sum(1 for v in row.values() if v not in (None, "", []))
+
+
+def _split_skills(value: Any) -> List[str]:
+    return [s.strip() for s in str(value or "").split(",") if s.strip()]
+
+
+def merge_records(members: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Golden record: the most complete row, gaps filled from the others.
+
+    Scores and experience take the max, open-to-work is true if any source
+    says so, skills are unioned and notes concatenated without repeats.
+    The surviving database id is the oldest one.
+    """
+    ordered = sorted(members, key=_filled, reverse=True)
+    golden: Dict[str, Any] = dict(ordered[0])
+    for row in ordered[1:]:
+        for key, value in row.items():
+            if golden.get(key) in (None, "") and value not in (None, ""):
+                golden[key] = value
+
+    ids = sorted(r["id"] for r in members if r.get("id") is not None)
+    if ids:
+        golden["id"] = ids[0]
+
+    scores = [r["priority_score"] for r in members if r.get("priority_score") is not None]
+    if scores:
+        golden["priority_score"] = max(scores)
+    years = [r["years_experience"] for r in members if r.get("years_experience") is not None]
+    if years:
+        golden["years_experience"] = max(years)
+    if any(r.get("is_open_to_work") for r in members):
+        golden["is_open_to_work"] = True
+
+    skills: List[str] = []
+    for r in members:
+        for s in _split_skills(r.get("skills")):
+            if s.lower() not in (x.lower() for x in skills):
+                skills.append(s)
+    if skills:
+        golden["skills"] = ", ".join(skills)
+
+    notes = list(dict.fromkeys(str(r["notes"]) for r in members if r.get("notes")))
+    if notes:
+        golden["notes"] = " | ".join(notes)
+
+    golden["member_ids"] = ids
+    golden["source_count"] = len(members)
+    return golden
+
+
+def collapse(rows: Sequence[Dict[str, Any]], resolver: Optional[TalentResolver] = None) -> List[Dict[str, Any]]:
+    """Collapse duplicates inside an in-memory batch, keeping input order."""
+    resolver = resolver or TalentResolver()
+    out = []
+    for group in sorted(resolver.clusters(rows), key=min):
+        if len(group) == 1:
+            out.append(dict(rows[group[0]]))
+            continue
+        merged = merge_records([rows[i] for i in group])
+        merged.pop("member_ids", None)
+        merged.pop("source_count", None)
+        out.append(merged)
+    return out
+
+
+# ---------- Database side ----------
+
+CANDIDATE_COLUMNS = (
+    "id,name,current_company,previous_company,title,location,years_experience,"
+    "linkedin_url,is_open_to_work,priority_score,skills,notes,risk_of_poaching"
+)
+
+
+def _candidate_filters(rows: Iterable[Dict[str, Any]], chunk: int = 50) -> List[str]:
+    """PostgREST or=(...) filters: exact names and profile URLs of the batch.
+
+    Equality lookups can use the table's indexes, unlike substring scans;
+    the name is tried as given and in normalized title case. GitHub
+    profiles come back under the same display name each run, and the
+    login in their notes then links them. Spelling variants stored
+    earlier are left to compact_table's full pass.
+    """
+    from simple_db import in_filter
+
+    rows = list(rows)
+    names = set()
+    for r in rows:
+        raw = " ".join(str(r.get("name") or "").split())
+        if raw:
+            names.update({raw, normalize_name(raw).title()})
+    urls = {str(r["linkedin_url"]) for r in rows if r.get("linkedin_url")}
+    names_sorted, urls_sorted = sorted(n for n in names if n), sorted(urls)
+    filters = []
+    for start in range(0, max(len(names_sorted), len(urls_sorted)), chunk):
+        terms = []
+        if names_sorted[start:start + chunk]:
+            terms.append(f"name.{in_filter(names_sorted[start:start + chunk])}")
+        if urls_sorted[start:start + chunk]:
+            terms.append(f"linkedin_url.{in_filter(urls_sorted[start:start + chunk])}")
+        filters.append(f"({','.join(terms)})")
+    return filters
+
+
+def match_existing(
+    db: Any, rows: Sequence[Dict[str, Any]], resolver: Optional[TalentResolver] = None
+) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+    """Split an incoming batch into (new rows, [(existing, incoming), ...]).
+
+    Candidates are only the stored rows sharing a name or profile URL with
+    the batch, so the lookup cost follows the batch size, not the table size.
+    """
+    resolver = resolver or TalentResolver()
+    rows = collapse(rows, resolver)
+    by_id: Dict[Any, Dict[str, Any]] = {}
+    for name_filter in _candidate_filters(rows):
+        for row in db.fetch_all("aerospace_talent", select=CANDIDATE_COLUMNS, params={"or": name_filter}):
+            by_id[row.get("id")] = row
+    existing = list(by_id.values())
+
+    combined = list(existing) + list(rows)
+    n_existing = len(existing)
+    fresh: List[Dict[str, Any]] = []
+    matches: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    for group in resolver.clusters(combined):
+        stored = [i for i in group if i < n_existing]
+        incoming = [i for i in group if i >= n_existing]
+        if not incoming:
+            continue
+        if stored:
+            anchor = combined[min(stored, key=lambda i: combined[i].get("id") or 0)]
+            for i in incoming:
+                matches.append((anchor, combined[i]))
+        else:
+            fresh.extend(combined[i] for i in incoming)
+    return fresh, matches
+
+
+def fill_patch(existing: Dict[str, Any], incoming: Dict[str, Any], columns: Iterable[str]) -> Dict[str, Any]:
+    """Fields an incoming duplicate can add to the stored row without overwriting it.
+
+    priority_score is left to rescore_table: a score copied in here would
+    not move the row's ScoreState input hash, so it would never be corrected.
+    """
+    patch: Dict[str, Any] = {}
+    for col in columns:
+        new = incoming.get(col)
+        if col == "priority_score" or new in (None, ""):
+            continue
+        if existing.get(col) in (None, ""):
+            patch[col] = new
+    return patch
+
+
+def compact_table(
+    db: Any,
+    apply: bool = False,
+    before_delete: Optional[Callable[[List[Any]], None]] = None,
+    skip: Iterable[Any] = (),
+    on_merge: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, int]:
+    """Merge existing duplicates in aerospace_talent into their oldest row.
+
+    Rows whose id is in skip are left out (e.g. ones about to be aged out).
+    before_delete gets the ids about to be removed (e.g. to archive them)
+    and on_merge the surviving row as stored before it was updated.
+    The merged priority_score is not written back; rescore_table rescores
+    the row once its merged inputs change.
+    """
+    rows = db.fetch_all("aerospace_talent", select=CANDIDATE_COLUMNS, params={"order": "id.asc"})
+    skip = set(skip)
+    if skip:
+        rows = [r for r in rows if r.get("id") not in skip]
+    resolver = TalentResolver()
+    stats = {"rows": len(rows), "people": 0, "duplicates": 0}
+    for group in resolver.clusters(rows):
+        stats["people"] += 1
+        if len(group) < 2:
+            continue
+        members = [rows[i] for i in group]
+        golden = merge_records(members)
+        losers = [m["id"] for m in members if m.get("id") != golden["id"]]
+        stats["duplicates"] += len(losers)
+        if apply:
+            update = {k: v for k, v in golden.items() if k in CANDIDATE_COLUMNS.split(",") and k not in ("id", "priority_score")}
+            db.update_rows("aerospace_talent", {"id": f"eq.{golden['id']}"}, update)
+            if on_merge is not None:
+                on_merge(next(m for m in members if m.get("id") == golden["id"]))
+            if before_delete is not None:
+                before_delete(losers)
+            db.delete_rows("aerospace_talent", {"id": f"in.({','.join(map(str, losers))})"})
+    return stats
+
+
+if __name__ == "__main__":
+    import sys
+
+    from simple_db import SimpleSupabase
+
+    apply = "--apply" in sys.argv
+    stats = compact_table(SimpleSupabase(), apply=apply)
+    verb = "Merged" if apply else "Would merge"
+    print(f"🧬 {stats['rows']} rows -> {stats['people']} people. {verb} {stats['duplicates']} duplicates.")
+    if not apply:
+        print("   Re-run with --apply to write golden records back.")
@@ -0,0 +1,227 @@
+# talent_scoring.py - vectorized priority_score for aerospace_talent
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from simple_db import SimpleSupabase
+
+SCORE_STATE_PATH = Path(os.getenv("NATILUS_SCORE_STATE", Path("data") / "score_state.npz"))
+SCORE_COLUMNS = (
+    "id,skills,title,notes,years_experience,location,is_open_to_work,created_at"
+)
+
+# Component budget: skills 30, title 15, experience 20, location 10,
+# open to work 15, recency 10.
+
+# (regex, points) matched against skills + title + notes. Capped at SKILL_CAP.
+SKILL_WEIGHTS = [
+    (r"composite|carbon fiber|prepreg|autoclave", 15),
+    (r"\bfaa\b|\bder\b|certification|part 2[35]", 15),
+    (r"blended wing|\bbwb\b", 12),
+    (r"aerodynamic|\bcfd\b|wind tunnel", 10),
+    (r"manufactur|lean|six sigma|as9100", 8),
+    (r"flight test", 8),
+    (r"avionics|systems engineer", 6),
+]
+SKILL_CAP = 30
+
+SENIORITY = r"\b(?:senior|sr\.?|lead|principal|chief|staff|head)\b"
+ROLE = r"engineer|specialist|scientist"
+TITLE_CERT = r"\bder\b|certification"
+TITLE_CAP = 15
+
+# Years of experience that earn the full experience budget
+EXPERIENCE_FULL_YEARS = 15
+
+HUBS = r"seattle|everett|renton|wichita|charleston|fort worth|los angeles|long beach|san diego"
+
+RECENCY_WEEKS_CAP = 12
+
+
+def _text(df: pd.DataFrame, *cols: str) -> pd.Series:
+    out = pd.Series("", index=df.index, dtype="object")
+    for col in cols:
+        if col in df.columns:
+            out = out + " " + df[col].fillna("").astype(str)
+    return out.str.lower()
+
+
+def recency_weeks(df: pd.DataFrame, now: Optional[datetime] = None) -> np.ndarray:
+    """Whole weeks since the row was created, capped.
+
+    Rows without created_at are ones being built right now (not yet
+    inserted), so they count as week 0.
+    """
+    if "created_at" not in df.columns:
+        return np.zeros(len(df))
+    now = now or datetime.now(timezone.utc)
+    created = pd.to_datetime(df["created_at"], errors="coerce", utc=True)
+    weeks = ((pd.Timestamp(now) - created).dt.days // 7).clip(lower=0, upper=RECENCY_WEEKS_CAP)
+    return weeks.fillna(0).to_numpy(dtype=np.float64)
+
+
+def score_frame(df: pd.DataFrame, now: Optional[datetime] = None) -> pd.Series:
+    """priority_score (0-100) for every row, computed column-at-a-time."""
+    n = len(df)
+    if n == 0:
+        return pd.Series([], dtype="int64", index=df.index)
+
+    skills_text = _text(df, "skills", "title", "notes")
+    skills = np.zeros(n)
+    for pattern, points in SKILL_WEIGHTS:
+        skills += skills_text.str.contains(pattern, regex=True).to_numpy() * points
+    skills = np.minimum(skills, SKILL_CAP)
+
+    title_text = _text(df, "title")
+    title = np.minimum(
+        title_text.str.contains(SENIORITY, regex=True).to_numpy() * 10
+        + title_text.str.contains(ROLE, regex=True).to_numpy() * 5
+        + title_text.str.contains(TITLE_CERT, regex=True).to_numpy() * 5,
+        TITLE_CAP,
+    )
+
+    if "years_experience" in df.columns:
+        years = pd.to_numeric(df["years_experience"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        years = np.full(n, np.nan)
+    experience = np.where(
+        np.isnan(years), 8.0, np.clip(years, 0, EXPERIENCE_FULL_YEARS) * 20.0 / EXPERIENCE_FULL_YEARS
+    )
+
+    location_text = _text(df, "location")
+    location = np.where(
+        location_text.str.contains(HUBS, regex=True).to_numpy(), 10.0, 3.0
+    )
+
+    if "is_open_to_work" in df.columns:
+        open_to_work = df["is_open_to_work"].fillna(False).astype(bool).to_numpy() * 15.0
+    else:
+        open_to_work = np.zeros(n)
+
+    recency = 10.0 * np.power(0.5, recency_weeks(df, now) / 4.0)
+
+    total = skills + title + experience + location + open_to_work + recency
+    return pd.Series(np.clip(np.rint(total), 0, 100).astype("int64"), index=df.index)
+
+
+def input_hashes(df: pd.DataFrame, now: Optional[datetime] = None) -> np.ndarray:
+    """Per-row hash of everything the score depends on (recency as a week bucket)."""
+    cols = ["skills", "title", "notes", "years_experience", "location", "is_open_to_work"]
+    inputs = pd.DataFrame({c: df[c] if c in df.columns else None for c in cols}, index=df.index)
+    inputs = inputs.astype("string").fillna("")
+    inputs["recency"] = pd.Series(recency_weeks(df, now), index=df.index).astype("string")
+    return pd.util.hash_pandas_object(inputs, index=False).to_numpy()
+
+
+def score_rows(rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fill priority_score on freshly built rows (trackers, imports) in one pass."""
+    if not rows:
+        return list(rows)
+    scores = score_frame(pd.DataFrame(list(rows)))
+    for row, score in zip(rows, scores.tolist()):
+        row["priority_score"] = int(score)
+    return list(rows)
+
+
+class ScoreState:
+    """id -> input hash of the last scoring, kept as two NumPy arrays on disk."""
+
+    def __init__(self, path: Path = SCORE_STATE_PATH) -> None:
+        self.path = path
+        self.hashes = pd.Series(dtype="uint64")
+
+    @classmethod
+    def load(cls, path: Path = SCORE_STATE_PATH) -> "ScoreState":
+        state = cls(path)
+        if path.exists():
+            with np.load(path) as data:
+                state.hashes = pd.Series(data["hashes"], index=data["ids"])
+        return state
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.stem + ".tmp.npz")
+        np.savez(tmp, ids=self.hashes.index.to_numpy(dtype=np.int64), hashes=self.hashes.to_numpy(dtype=np.uint64))
+        tmp.replace(self.path)
+
+    def changed(self, ids: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        """Boolean mask of rows that are new or whose inputs moved."""
+        # Positional lookup keeps the uint64 hashes exact (reindex would go via float)
+        pos = self.hashes.index.get_indexer(ids)
+        known = pos >= 0
+        mask = np.ones(len(ids), dtype=bool)
+        mask[known] = self.hashes.to_numpy()[pos[known]] != hashes[known]
+        return mask
+
+    def update(self, ids: np.ndarray, hashes: np.ndarray) -> None:
+        fresh = pd.Series(hashes, index=ids)
+        self.hashes = pd.concat([self.hashes[~self.hashes.index.isin(ids)], fresh])
+
+
+def rescore_table(
+    db: SimpleSupabase,
+    batch_size: int = 5000,
+    write_batch: int = 300,
+    full: bool = False,
+) -> Dict[str, int]:
+    """Rescore aerospace_talent in batches and write the changed scores back.
+
+    Scores go out as PATCHes grouped by value (id=in.(...)), not upserts:
+    an INSERT ... ON CONFLICT of partial rows trips NOT NULL columns.
+    """
+    state = ScoreState() if full else ScoreState.load()
+    now = datetime.now(timezone.utc)
+    stats = {"read": 0, "rescored": 0, "written": 0}
+    last_id = None
+
+    while True:
+        params = {"select": SCORE_COLUMNS, "order": "id.asc", "limit": str(batch_size)}
+        if last_id is not None:
+            params["id"] = f"gt.{last_id}"
+        rows, _ = db.select_rows("aerospace_talent", params)
+        if not rows:
+            break
+        last_id = rows[-1]["id"]
+        stats["read"] += len(rows)
+
+        df = pd.DataFrame(rows)
+        ids = df["id"].to_numpy(dtype=np.int64)
+        hashes = input_hashes(df, now)
+        mask = state.changed(ids, hashes)
+        if mask.any():
+            changed = df[mask]
+            scores = score_frame(changed, now)
+            by_score = pd.Series(changed["id"].to_numpy()).groupby(scores.to_numpy()).agg(list)
+            for score, score_ids in by_score.items():
+                for start in range(0, len(score_ids), write_batch):
+                    chunk = score_ids[start:start + write_batch]
+                    db.update_rows(
+                        "aerospace_talent",
+                        {"id": f"in.({','.join(str(int(i)) for i in chunk)})"},
+                        {"priority_score": int(score)},
+                    )
+                    stats["written"] += len(chunk)
+            stats["rescored"] += len(changed)
+        state.update(ids, hashes)
+
+        if len(rows) < batch_size:
+            break
+
+    state.save()
+    return stats
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    started = time.perf_counter()
+    result = rescore_table(SimpleSupabase(), full="--full" in sys.argv)
+    print(
+        f"🎯 Read {result['read']} profiles, rescored {result['rescored']}, "
+        f"wrote {result['written']} in {time.perf_counter() - started:.1f}s"
+    )
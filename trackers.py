@@ -0,0 +1,74 @@
+# trackers.py - registry of intelligence trackers, imported only when selected
+import importlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+ENTRY_POINT_GROUP = "natilus.trackers"
+
+
+@dataclass(frozen=True)
+class TrackerSpec:
+    """Declaration of one tracker.
+
+    `entry` is an entry-point style "module:Class" reference; nothing is
+    imported until load() is called. `results_key` is where its rows go
+    in the pipeline's results dict (the alert rules read these keys).
+    """
+
+    name: str
+    entry: str
+    results_key: str
+    icon: str
+    phase: str
+    label: str
+
+    def load(self) -> Any:
+        module_name, _, attr = self.entry.partition(":")
+        return getattr(importlib.import_module(module_name), attr)()
+
+
+# Built-in trackers, in the order the pipeline runs them
+TRACKERS: Dict[str, TrackerSpec] = {
+    spec.name: spec
+    for spec in (
+        TrackerSpec("warn", "warn_tracker:WARNTracker", "layoffs", "📊", "Layoff Tracking", "Layoffs tracked"),
+        TrackerSpec("patents", "patent_tracker:PatentTracker", "patents", "📋", "Patent Intelligence", "Patents found"),
+        TrackerSpec("news", "news_tracker:NewsTracker", "news", "📰", "News Monitoring", "News items"),
+        TrackerSpec("github", "github_scout:GithubScout", "github_talent", "👨‍💻", "GitHub Talent Scout", "GitHub talent"),
+        TrackerSpec("contracts", "contract_tracker:ContractTracker", "contracts", "💰", "Contract Intelligence", "Contracts"),
+    )
+}
+
+
+def discover() -> Dict[str, TrackerSpec]:
+    """Built-ins plus any trackers other packages declare under natilus.trackers.
+
+    Plugin entry points are "name = module:Class"; their rows land under
+    their own name in the results dict.
+    """
+    specs = dict(TRACKERS)
+    try:
+        from importlib.metadata import entry_points
+        plugins = entry_points(group=ENTRY_POINT_GROUP)
+    except (ImportError, TypeError):
+        return specs
+    for ep in plugins:
+        specs.setdefault(ep.name, TrackerSpec(ep.name, ep.value, ep.name, "🔌", ep.name, ep.name))
+    return specs
+
+
+def select(only: Optional[Iterable[str]] = None) -> List[TrackerSpec]:
+    """Specs to run, by tracker name or results key; all of them when only is empty."""
+    specs = discover()
+    wanted = [w.strip() for w in (only or []) if w.strip()]
+    if not wanted:
+        return list(specs.values())
+    by_key = {spec.results_key: spec for spec in specs.values()}
+    chosen = []
+    for name in wanted:
+        spec = specs.get(name) or by_key.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown tracker {name!r}; choose from {', '.join(specs)}")
+        if spec not in chosen:
+            chosen.append(spec)
+    return chosen
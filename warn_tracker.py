@@ -1,15 +1,13 @@
 # warn_tracker.py - FIXED VERSION
-import pandas as pd
-import requests
-from datetime import datetime
-from io import BytesIO
-import os
 from dotenv import load_dotenv
+from records import TalentRecord
 from simple_db import SimpleSupabase
 
 load_dotenv()
 
 class WARNTracker:  # Make sure this class is defined!
+    table = 'aerospace_talent'
+    
     def __init__(self):
         self.db = SimpleSupabase()
         
@@ -26,7 +24,6 @@ class WARNTracker:  # Make sure this class is defined!
                 'title': 'Composite Manufacturing Engineers',
                 'is_open_to_work': True,
                 'notes': 'Part of 17,000 person reduction - 777X program',
-                'priority_score': 95,
                 'risk_of_poaching': 'HIGH',
                 'years_experience': 10
             },
@@ -37,7 +34,6 @@ class WARNTracker:  # Make sure this class is defined!
                 'title': 'Avionics & Systems Engineers',
                 'is_open_to_work': True,
                 'notes': '2,500 additional layoffs Nov 2024',
-                'priority_score': 90,
                 'risk_of_poaching': 'HIGH',
                 'years_experience': 12
             },
@@ -48,14 +44,13 @@ class WARNTracker:  # Make sure this class is defined!
                 'title': 'Composite & Manufacturing Engineers',
                 'is_open_to_work': True,
                 'notes': 'Financial distress - acquisition by Boeing pending',
-                'priority_score': 88,
                 'risk_of_poaching': 'HIGH',
                 'years_experience': 8
             }
         ]
         
         print(f"✅ Added {len(boeing_layoffs)} known Boeing/Spirit layoffs")
-        return boeing_layoffs
+        return [TalentRecord.from_dict({**row, 'source_tag': 'warn'}) for row in boeing_layoffs]
     
     def get_kansas_layoffs(self):
         """Get Spirit AeroSystems layoffs"""
@@ -71,14 +66,19 @@ class WARNTracker:  # Make sure this class is defined!
         """Save layoff data to Supabase"""
         if data:
             try:
-                for item in data:
-                    result = self.db.insert_talent(item)
-                    if result:
-                        print(f"✅ Saved: {item.get('name', 'Unknown')}")
+                # One batch: one duplicate lookup and one insert for all rows
+                for row in self.db.insert_talent(data):
+                    print(f"✅ Saved: {row.get('name', 'Unknown')}")
                 print(f"💾 Saved {len(data)} records total")
             except Exception as e:
                 print(f"❌ Database error: {e}")
     
+    def stream(self):
+        """Scored records state by state, for the pipeline's batching writer"""
+        from talent_scoring import score_rows
+        for source in (self.get_washington_layoffs, self.get_kansas_layoffs, self.get_california_layoffs):
+            yield from score_rows(source())
+    
     def run(self):
         """Run all WARN trackers"""
         all_layoffs = []
@@ -88,6 +88,10 @@ class WARNTracker:  # Make sure this class is defined!
         all_layoffs.extend(self.get_kansas_layoffs())
         all_layoffs.extend(self.get_california_layoffs())
         
+        # Score from skills/title/experience/location instead of fixed numbers
+        from talent_scoring import score_rows
+        score_rows(all_layoffs)
+        
         # Save to database
         self.save_to_database(all_layoffs)
         